@@ -45,19 +45,19 @@ class AddNodeCypher():
 
     def genDeleteDetach(self,  ):
 
-        return None
+        return None, None
 
     def genUpdateLabel(self, ):
 
-        return None     
+        return None, None
         
     def genUpdateProp(self, ):
 
-        return None
+        return False, None, None
         
     def genNewNode(self):
 
-        return None    
+        return None, None
         
     def genMatch(self, **kwargs):
         nodeTemplate = "No Template Selected"
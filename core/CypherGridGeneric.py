@@ -58,23 +58,26 @@ class CypherGridGeneric():
         '''
         this should be overridden to return a context specific delete cypher statement.
         this is called with the user clicks on the delete row button
+        return the cypher statement and the parameter dictionary to run it with
         '''
-        return "// no cypher generated"
+        return "// no cypher generated", None
        
     def genUpdateProp(self, updateIndex=None, dataGrid=None):
         '''
         this should be overridden to return a context specific match and property set cypher statement.
         this is called when an editable property column has changed in the grid
+        return a success flag, the cypher statement and the parameter dictionary to run it with
         '''
-        return "// no cypher generated"
+        return False, "// no cypher generated", None
 
 
     def genRemoveProp(self, updateIndex=None, dataGrid=None):
         '''
         this should be overridden to return a context specific match and remove property cypher statement.
         this is called when an editable property column has been changed to null by the set null button on the data grid
+        return the cypher statement and the parameter dictionary to run it with
         '''
-        return "// no cypher generated"
+        return "// no cypher generated", None
 
     def genMatch(self):
         '''
@@ -15,6 +15,8 @@ You should have received a copy of the GNU General Public License along with Nod
 import sys
 import os
 from operator import itemgetter
+import re
+import codecs
 import json
 from json import JSONDecodeError
 from PyQt5.QtCore import QSettings, Qt
@@ -36,12 +38,391 @@ CONTYPE, CONPROP, RELNAME = range(3)
 AUTOINDEX, IDXLBL, IDXPROPLIST = range(3)
 
 
+class TopLevelList(list):
+    '''
+    a list of top level object dictionaries that keeps a name -> position index so an object can be found by name without scanning the list.
+    indexOfKey keeps the same kind of index for any other key, for example neoID or displayName.
+    the list methods keep the indexes up to date.  an object changed in place must be stored back into the list or passed to rename or updateObject.
+    if two objects have the same value the first one is found, the same as a scan of the list.
+    if owner is set its objectAdded and objectRemoved methods are called as objects come and go so the owner can keep its own indexes.
+    '''
+    # None means the index has to be rebuilt before the next lookup
+    nameIndex = None
+    keyIndexes = None       # key -> {str(value): position}
+    owner = None
+    topLevel = None
+
+    def __init__(self, objects=()):
+        super(TopLevelList, self).__init__(objects)
+        self.invalidate()
+
+    def invalidate(self, ):
+        self.nameIndex = None
+        self.keyIndexes = None
+
+    def reindex(self, ):
+        self.nameIndex = {}
+        for index, listObject in enumerate(self):
+            self.nameIndex.setdefault(listObject.get("name", None), index)
+
+    def reindexKey(self, key):
+        if self.keyIndexes is None:
+            self.keyIndexes = {}
+        valueIndex = {}
+        for index, listObject in enumerate(self):
+            value = listObject.get(key, None)
+            if not value is None:
+                valueIndex.setdefault(str(value), index)
+        self.keyIndexes[key] = valueIndex
+
+    def indexOf(self, objectName):
+        '''
+        return the position of the object with this name or None
+        '''
+        if self.nameIndex is None:
+            self.reindex()
+        index = self.nameIndex.get(objectName, None)
+        if index is None:
+            return None
+        # an object renamed in place leaves a stale entry behind
+        if index >= len(self) or self[index].get("name", None) != objectName:
+            self.reindex()
+            index = self.nameIndex.get(objectName, None)
+        return index
+
+    def indexOfKey(self, key, value):
+        '''
+        return the position of the first object whose key has this value or None.  values are compared as strings
+        '''
+        if self.keyIndexes is None or not key in self.keyIndexes:
+            self.reindexKey(key)
+        index = self.keyIndexes[key].get(str(value), None)
+        if index is None:
+            return None
+        # an object changed in place leaves a stale entry behind
+        if not self.keyMatches(index, key, str(value)):
+            self.reindexKey(key)
+            index = self.keyIndexes[key].get(str(value), None)
+        return index
+
+    def keyMatches(self, index, key, value):
+        return index < len(self) and str(self[index].get(key, None)) == value
+
+    def addKeys(self, index):
+        '''
+        add the object at index to the key indexes
+        '''
+        if self.keyIndexes is None:
+            return
+        listObject = self[index]
+        for key, valueIndex in self.keyIndexes.items():
+            value = listObject.get(key, None)
+            if value is None:
+                continue
+            current = valueIndex.get(str(value), None)
+            if current is None or current > index or not self.keyMatches(current, key, str(value)):
+                valueIndex[str(value)] = index
+
+    def rename(self, index, oldName):
+        '''
+        update the index after the object at index has been renamed in place
+        '''
+        if self.nameIndex is None:
+            return
+        if self.nameIndex.get(oldName, None) == index:
+            del self.nameIndex[oldName]
+        self.nameIndex.setdefault(self[index].get("name", None), index)
+
+    def updateObject(self, listObject):
+        '''
+        update the key indexes after an object in the list has been changed in place
+        '''
+        index = self.indexOf(listObject.get("name", None))
+        if not index is None and self[index] is listObject:
+            self.addKeys(index)
+            self.notifyRemoved([listObject])
+            self.notifyAdded([listObject])
+
+    def notifyAdded(self, listObjects):
+        if self.owner is not None:
+            for listObject in listObjects:
+                self.owner.objectAdded(self.topLevel, listObject)
+
+    def notifyRemoved(self, listObjects):
+        if self.owner is not None:
+            for listObject in listObjects:
+                self.owner.objectRemoved(self.topLevel, listObject)
+
+    def append(self, listObject):
+        super(TopLevelList, self).append(listObject)
+        if self.nameIndex is not None:
+            self.nameIndex.setdefault(listObject.get("name", None), len(self) - 1)
+        self.addKeys(len(self) - 1)
+        self.notifyAdded([listObject])
+
+    def extend(self, listObjects):
+        for listObject in listObjects:
+            self.append(listObject)
+
+    def __iadd__(self, listObjects):
+        self.extend(listObjects)
+        return self
+
+    def __setitem__(self, index, listObject):
+        if isinstance(index, slice):
+            oldObjects = self[index]
+            super(TopLevelList, self).__setitem__(index, listObject)
+            self.invalidate()
+            self.notifyRemoved(oldObjects)
+            self.notifyAdded(self[index])
+            return
+        oldObject = self[index]
+        if oldObject.get("name", None) != listObject.get("name", None):
+            self.nameIndex = None
+        super(TopLevelList, self).__setitem__(index, listObject)
+        self.addKeys(index % len(self))
+        self.notifyRemoved([oldObject])
+        self.notifyAdded([listObject])
+
+    # anything that moves objects around invalidates the positions so the indexes are rebuilt on the next lookup
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            oldObjects = self[index]
+        else:
+            oldObjects = [self[index]]
+        super(TopLevelList, self).__delitem__(index)
+        self.invalidate()
+        self.notifyRemoved(oldObjects)
+
+    def insert(self, index, listObject):
+        super(TopLevelList, self).insert(index, listObject)
+        self.invalidate()
+        self.notifyAdded([listObject])
+
+    def remove(self, listObject):
+        super(TopLevelList, self).remove(listObject)
+        self.invalidate()
+        self.notifyRemoved([listObject])
+
+    def pop(self, index=-1):
+        listObject = super(TopLevelList, self).pop(index)
+        self.invalidate()
+        self.notifyRemoved([listObject])
+        return listObject
+
+    def clear(self, ):
+        oldObjects = list(self)
+        super(TopLevelList, self).clear()
+        self.invalidate()
+        self.notifyRemoved(oldObjects)
+
+    def sort(self, *args, **kwargs):
+        super(TopLevelList, self).sort(*args, **kwargs)
+        self.invalidate()
+
+    def reverse(self, ):
+        super(TopLevelList, self).reverse()
+        self.invalidate()
+
+class LazyObject(dict):
+    '''
+    a top level object read from the model file with only its stub keys filled in.  the rest of the object is read from the file the first time anything else is used.
+    the stub keys are taken from the whole object when the file is read, so a stub key that is missing is missing from the object too.
+    anything that changes the object reads it first.
+    '''
+    __slots__ = ("source", "topLevel", "fileName", "offset", "length", "stubKeys")
+
+    def __init__(self, stub, stubKeys, source, topLevel, fileName, offset, length):
+        super(LazyObject, self).__init__(stub)
+        self.stubKeys = stubKeys
+        self.source = source        # the JSONFile that reads the object, None once it has been read
+        self.topLevel = topLevel
+        self.fileName = fileName
+        self.offset = offset        # byte offset and length of the object in the file
+        self.length = length
+
+    def isLoaded(self, ):
+        return self.source is None
+
+    def load(self, ):
+        if self.source is None:
+            return
+        objectDict = self.source.readObject(self.topLevel, self.fileName, self.offset, self.length)
+        self.source = None
+        super(LazyObject, self).clear()
+        super(LazyObject, self).update(objectDict)
+
+    def __getitem__(self, key):
+        if not key in self.stubKeys:
+            self.load()
+        return super(LazyObject, self).__getitem__(key)
+
+    def get(self, key, default=None):
+        if not key in self.stubKeys:
+            self.load()
+        return super(LazyObject, self).get(key, default)
+
+    def __contains__(self, key):
+        if not key in self.stubKeys:
+            self.load()
+        return super(LazyObject, self).__contains__(key)
+
+    def __iter__(self, ):
+        self.load()
+        return super(LazyObject, self).__iter__()
+
+    def __len__(self, ):
+        self.load()
+        return super(LazyObject, self).__len__()
+
+    def keys(self, ):
+        self.load()
+        return super(LazyObject, self).keys()
+
+    def values(self, ):
+        self.load()
+        return super(LazyObject, self).values()
+
+    def items(self, ):
+        self.load()
+        return super(LazyObject, self).items()
+
+    def __setitem__(self, key, value):
+        self.load()
+        super(LazyObject, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.load()
+        super(LazyObject, self).__delitem__(key)
+
+    def pop(self, *args):
+        self.load()
+        return super(LazyObject, self).pop(*args)
+
+    def popitem(self, ):
+        self.load()
+        return super(LazyObject, self).popitem()
+
+    def setdefault(self, key, default=None):
+        self.load()
+        return super(LazyObject, self).setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self.load()
+        super(LazyObject, self).update(*args, **kwargs)
+
+    def clear(self, ):
+        self.source = None
+        super(LazyObject, self).clear()
+
+    def copy(self, ):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, LazyObject):
+            other.load()
+        self.load()
+        return super(LazyObject, self).__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self, ):
+        self.load()
+        return super(LazyObject, self).__repr__()
+
+    def __reduce_ex__(self, protocol):
+        # copies and pickles are plain dictionaries
+        return (dict, (dict(self.items()), ))
+
+class JSONReader():
+    '''
+    reads a json file a piece at a time.  values are decoded one at a time with the standard json decoder
+    and the byte offset and length of each one is returned so it can be read again without reading the whole file.
+    '''
+    whiteSpace = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, fileHandle, chunkSize=1048576):
+        self.fileHandle = fileHandle        # opened in binary mode
+        self.chunkSize = chunkSize
+        self.decoder = json.JSONDecoder()
+        self.textDecoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0            # position in the buffer
+        self.bytePos = 0        # byte offset in the file of the position in the buffer
+        self.eof = False
+
+    def fill(self, size):
+        '''
+        drop the part of the buffer already read and read size more bytes from the file
+        '''
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        data = self.fileHandle.read(size)
+        if len(data) == 0:
+            self.eof = True
+            self.buffer = self.buffer + self.textDecoder.decode(b"", final=True)
+        else:
+            self.buffer = self.buffer + self.textDecoder.decode(data)
+
+    def advance(self, newPos):
+        self.bytePos = self.bytePos + len(self.buffer[self.pos:newPos].encode("utf-8"))
+        self.pos = newPos
+
+    def peek(self, ):
+        '''
+        return the next character that isn't white space or "" at the end of the file
+        '''
+        while True:
+            self.advance(self.whiteSpace.match(self.buffer, self.pos).end())
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                return ""
+            self.fill(self.chunkSize)
+
+    def expect(self, chars):
+        '''
+        read the next character, it has to be one of chars
+        '''
+        char = self.peek()
+        if char == "" or not char in chars:
+            raise JSONDecodeError("Expecting one of {}".format(chars), self.buffer, self.pos)
+        self.advance(self.pos + 1)
+        return char
+
+    def decodeValue(self, ):
+        '''
+        decode the next value.  returns the value and its byte offset and length in the file
+        '''
+        self.peek()
+        size = self.chunkSize
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # a number at the end of the buffer might carry on in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    break
+            except JSONDecodeError:
+                if self.eof:
+                    raise
+            # the value carries on past the buffer so read more and try again
+            self.fill(size)
+            size = size * 2
+        offset = self.bytePos
+        self.advance(end)
+        return value, offset, self.bytePos - offset
+
 class JSONFile():
     def __init__(self, ):
         # the decoded json data from disk
         self.modelData = None    
         # the filename that contains the json data
         self.modelFileName = None    
+        # top level lists whose objects are read from the file when they are first used -> the stub keys read up front
+        self.lazyTopLevels = {}
     #
     # load the model file
     #
@@ -50,7 +431,8 @@ class JSONFile():
         rc = True
         msg = "Read File {} OK".format(filename)
         try:
-            self.modelData = json.load(open(filename))
+            with open(filename, "rb") as fileHandle:
+                self.modelData = self.streamFile(JSONReader(fileHandle), filename)
             self.modelFileName = filename
         except JSONDecodeError as inst:
             msg =   "Read file: {} - JSON Decode Error: {}".format(filename, inst.args[0])
@@ -61,11 +443,64 @@ class JSONFile():
         finally:
             return rc, msg
         
+    def streamFile(self, reader, filename):
+        '''
+        read the json object in the file one top level value at a time.
+        the objects in a lazy top level list are decoded one at a time and only their stub keys and position in the file are kept
+        '''
+        fileData = {}
+        reader.expect("{")
+        if reader.peek() == "}":
+            return fileData
+        while True:
+            key, offset, length = reader.decodeValue()
+            reader.expect(":")
+            if key in self.lazyTopLevels and reader.peek() == "[":
+                fileData[key] = self.streamList(reader, key, filename)
+            else:
+                fileData[key], offset, length = reader.decodeValue()
+            if reader.expect(",}") == "}":
+                return fileData
+
+    def streamList(self, reader, topLevel, filename):
+        objectList = []
+        stubKeys = self.lazyTopLevels[topLevel]
+        reader.expect("[")
+        if reader.peek() == "]":
+            reader.expect("]")
+            return objectList
+        while True:
+            objectDict, offset, length = reader.decodeValue()
+            if isinstance(objectDict, dict):
+                stub = {key: objectDict[key] for key in stubKeys if key in objectDict}
+                objectDict = LazyObject(stub, stubKeys, self, topLevel, filename, offset, length)
+            objectList.append(objectDict)
+            if reader.expect(",]") == "]":
+                return objectList
+
+    def readObject(self, topLevel, filename, offset, length):
+        '''
+        read a lazy object from the file
+        '''
+        with open(filename, "rb") as fileHandle:
+            fileHandle.seek(offset)
+            return json.loads(fileHandle.read(length).decode("utf-8"))
+
+    def loadLazyObjects(self, ):
+        '''
+        read every lazy object that hasn't been used yet.  this has to be done before the file they come from is written over
+        '''
+        for topLevel in self.lazyTopLevels:
+            for objectDict in self.modelData.get(topLevel, []):
+                if isinstance(objectDict, LazyObject):
+                    objectDict.load()
+
     def writeFile(self, ):
         if self.modelData is not None:
             rc = True
             msg = "Write File {} OK".format(self.modelFileName)
             try:
+                self.loadLazyObjects()
                 with open(self.modelFileName, 'w') as outfile:
                     json.dump(self.modelData, outfile, separators=(',', ':'))
                 self.setModelClean()
@@ -111,6 +546,25 @@ class ProjectModel(JSONFile):
         self.objectSearch["Path Template"]=[]
         self.objectSearch["Form"]=[]
         
+        # the top level objects whose references are kept in the reference index
+        self.referenceTypes = ["Node Template", "Instance Node", "Relationship Template", "Instance Relationship"]
+        # the item types the diagram index can find on each type of diagram
+        self.diagramItemTypes = {"Instance Diagram": ["Instance Node", "Instance Relationship"], "Template Diagram": ["Node Template", "Relationship Template"]}
+        
+        # where-used indexes, None means rebuild it on the next lookup
+        self.objectRefs = None          # (topLevel, objectName) -> set of (objectType, objectName) the object refers to
+        self.refIndex = None            # (objectType, objectName) -> set of (topLevel, objectName) that refer to it
+        self.refTopLevels = None        # the top levels that have been added to the reference index
+        self.diagramKeys = None         # (diagramType, diagramName) -> set of item keys on the diagram
+        self.keyDiagrams = None         # item key -> set of (diagramType, diagramName) the item is on
+
+        # diagrams and instances are read from the model file when they are first used.  the treeview and the name, NZID and neoID lookups only need the stub keys.
+        # the relationship end points are stubs so dropping a node on a diagram can find its relationships without reading them all
+        self.lazyTopLevels = {"Instance Diagram": ("name", ), 
+                                        "Template Diagram": ("name", ), 
+                                        "Instance Node": ("name", "NZID", "neoID", "displayName"), 
+                                        "Instance Relationship": ("name", "NZID", "neoID", "displayName", "startNZID", "endNZID")}
+        
     def initModel(self, ):
         '''
         Initialize an empty project model data structure
@@ -150,7 +604,8 @@ class ProjectModel(JSONFile):
         
         #create an empty list for each top level model category
         for x in self.modelData["TopLevel"]:
-            self.modelData[x] = []        
+            self.modelData[x] = TopLevelList()        
+        self.indexModel()
         
         self.setModelDirty()
 
@@ -197,20 +652,9 @@ class ProjectModel(JSONFile):
                     if len(prop) in [4, 5]:
                         prop.insert(2, "n")
                         prop.insert(3, "")
-            # add datatype to the node instance properties
-            for index, nodeInstance in enumerate(self.modelData["Instance Node"]):
-                for prop in nodeInstance["properties"]:
-                    # insert blank datatype into the property list if needed
-                    if len(prop) == 2:
-                        dataType = self.getPropertyDataType(propName=prop[0])
-                        prop.insert(1,dataType)                  
-            # add datatype to the relationship instance properties
-            for index, relInstance in enumerate(self.modelData["Instance Node"]):
-                for prop in relInstance["properties"]:
-                    # insert blank datatype into the property list if needed
-                    if len(prop) == 2:
-                        dataType = self.getPropertyDataType(propName=prop[0])
-                        prop.insert(1,dataType)              
+            # instances that haven't been read from the file yet are upgraded when they are read
+            for nodeInstance in self.loadedObjects("Instance Node"):
+                self.upgradeInstance("Instance Node", nodeInstance)
             # add datatype to the rel template properties
             for index, relTemplate in enumerate(self.modelData["Relationship Template"]):
                 if not "constraints" in relTemplate:
@@ -254,8 +698,65 @@ class ProjectModel(JSONFile):
                 self.modelData["TopLevel"] = ["Instance Diagram","Instance Node","Instance Relationship","Template Diagram","Node Template","Relationship Template","Path Template","Label","Property", "Relationship", "Form"]
                 self.modelData["Form"] = []         
                 self.setModelDirty()
+            
+            self.indexModel()
                 
         return
+
+    def upgradeInstance(self, topLevel, instanceDict):
+        '''
+        upgrade an instance node from an older model file
+        '''
+        if topLevel == "Instance Node":
+            # add datatype to the node instance properties
+            for prop in instanceDict["properties"]:
+                # insert blank datatype into the property list if needed
+                if len(prop) == 2:
+                    dataType = self.getPropertyDataType(propName=prop[0])
+                    prop.insert(1,dataType)                  
+
+    def readObject(self, topLevel, filename, offset, length):
+        objectDict = super(ProjectModel, self).readObject(topLevel, filename, offset, length)
+        self.upgradeInstance(topLevel, objectDict)
+        return objectDict
+
+    def loadedObjects(self, topLevel):
+        '''
+        return the objects in topLevel that are in memory, leaving out lazy objects that haven't been read from the model file
+        '''
+        return [objectDict for objectDict in self.modelData[topLevel] if not isinstance(objectDict, LazyObject) or objectDict.isLoaded()]
+
+    def indexModel(self, ):
+        '''
+        replace each top level list with a TopLevelList so objects can be found by name.  called when a model is created or opened
+        '''
+        for topLevel in self.modelData["TopLevel"]:
+            self.getTopLevelList(topLevel)
+        self.refIndex = None
+        self.diagramKeys = None
+
+    def getTopLevelList(self, topLevel):
+        '''
+        return the indexed list of top level objects, converting a plain list loaded from the model file the first time it is used
+        '''
+        objectList = self.modelData[topLevel]
+        if not isinstance(objectList, TopLevelList):
+            objectList = TopLevelList(objectList)
+            self.modelData[topLevel] = objectList
+            self.refIndex = None
+        if objectList.owner is None:
+            objectList.owner = self
+            objectList.topLevel = topLevel
+        return objectList
+
+    def topLevelIndex(self, topLevel=None, objectName=None):
+        '''
+        return the position of the named object in the top level list or None
+        '''
+        try:
+            return self.getTopLevelList(topLevel).indexOf(objectName)
+        except:
+            return None
         
         
     def setUpdateTreeViewMethod(self, method=None):
@@ -290,76 +791,89 @@ class ProjectModel(JSONFile):
                     
     def objectExists(self, topLevel=None,objectName=None ):
         if topLevel is not None and objectName is not None:
-            for index, listObject in enumerate(self.modelData[topLevel]):
-                if listObject["name"] == objectName:            
-                    return True
+            if self.topLevelIndex(topLevel, objectName) is not None:
+                return True
         return False
         
     def getObjectDesc(self, topLevel=None, objectName=None):
         desc = "no description"
-        if topLevel is not None and objectName is not None:
-            for index, listObject in enumerate(self.modelData[topLevel]):
-                if listObject["name"] == objectName: 
-                    try:
-                        desc =  listObject["desc"]
-                    except:
-                        pass
+        index, listObject = self.getDictByName(topLevel, objectName)
+        if listObject is not None:
+            try:
+                desc =  listObject["desc"]
+            except:
+                pass
         return desc  
 
     def getDictByName(self, topLevel=None,objectName=None):
         if topLevel is not None and objectName is not None:
-            for index, listObject in enumerate(self.modelData[topLevel]):
-                if listObject["name"] == objectName:            
-                    return index, listObject
+            index = self.topLevelIndex(topLevel, objectName)
+            if index is not None:
+                return index, self.modelData[topLevel][index]
         return None, None
         
     def deleteTopLevelObject(self, topLevel=None, objectName=None):
         hitList = None
         if topLevel is not None and objectName is not None:
-            for index, listObject in enumerate(self.modelData[topLevel]):
-                if listObject["name"] == objectName:
-                    hitList = self.scanForObjectUse(topLevel, objectName)
-                    # remove any reference to the top level object being deleted
-                    for hit in hitList:
-                        if hit[0] == "Node Template":
-                            self.removeFromNodeTemplate(hit)
-                        if hit[0] == "Relationship Template":
-                            self.removeFromRelationshipTemplate(hit)
-                        if hit[0] == "Instance Diagram":
-                            self.removeFromInstanceDiagram(hit)
-                        if hit[0] == "Template Diagram":
-                            self.removeFromTemplateDiagram(hit)
-                        if hit[0] == "Instance Node":
-                            self.removeFromInstanceNode(hit)
-                        if hit[0] == "Instance Relationship":
-                            self.removeFromInstanceRelationship(hit)
-                    # this removes the top level object from the model
+            index = self.topLevelIndex(topLevel, objectName)
+            if index is not None:
+                hitList = self.scanForObjectUse(topLevel, objectName)
+                # remove any reference to the top level object being deleted
+                for hit in hitList:
+                    if hit[0] == "Node Template":
+                        self.removeFromNodeTemplate(hit)
+                    if hit[0] == "Relationship Template":
+                        self.removeFromRelationshipTemplate(hit)
+                    if hit[0] == "Instance Diagram":
+                        self.removeFromInstanceDiagram(hit)
+                    if hit[0] == "Template Diagram":
+                        self.removeFromTemplateDiagram(hit)
+                    if hit[0] == "Instance Node":
+                        self.removeFromInstanceNode(hit)
+                    if hit[0] == "Instance Relationship":
+                        self.removeFromInstanceRelationship(hit)
+                    # the hit object was changed in place
+                    if hit[0] in self.referenceTypes:
+                        self.refreshObjectRefs(hit[0], hit[1])
+                # this removes the top level object from the model, removing the references may have moved it
+                index = self.topLevelIndex(topLevel, objectName)
+                if index is not None:
                     del self.modelData[topLevel][index]    
-                    self.setModelDirty()
+                if topLevel in self.diagramItemTypes:
+                    self.diagramKeys = None
+                self.setModelDirty()
         return hitList                    
 
     def renameTopLevelObject(self, topLevel = None, objectName=None, newName=None):
         hitList = None
         if topLevel is not None and objectName is not None and newName is not None:
-            for index, listObject in enumerate(self.modelData[topLevel]):
-                if listObject["name"] == objectName:
-                    hitList = self.scanForObjectUse(topLevel, objectName)
-                    listObject["name"] = newName
-                    for hit in hitList:
+            index, listObject = self.getDictByName(topLevel, objectName)
+            if listObject is not None:
+                hitList = self.scanForObjectUse(topLevel, objectName)
+                self.objectRemoved(topLevel, listObject)
+                listObject["name"] = newName
+                self.getTopLevelList(topLevel).rename(index, objectName)
+                self.objectAdded(topLevel, listObject)
+                if topLevel in self.diagramItemTypes:
+                    self.diagramKeys = None
+                for hit in hitList:
 #                        if hit[0] == "Instance Diagram":
 #                            self.updateInstanceDiagram(hit)
-                        if hit[0] == "Template Diagram":
-                            self.updateTemplateDiagram(hit, newName)
-                        if hit[0] == "Node Template":
-                            self.updateNodeTemplate(hit, newName)
-                        if hit[0] == "Relationship Template":
-                            self.updateRelationshipTemplate(hit, newName)
-                        if hit[0] == "Instance Node":
-                            self.updateInstanceNode(hit, newName)
-                        if hit[0] == "Instance Relationship":
-                            self.updateInstanceRelationship(hit, newName)
-                    self.setModelDirty()
-                    
+                    if hit[0] == "Template Diagram":
+                        self.updateTemplateDiagram(hit, newName)
+                    if hit[0] == "Node Template":
+                        self.updateNodeTemplate(hit, newName)
+                    if hit[0] == "Relationship Template":
+                        self.updateRelationshipTemplate(hit, newName)
+                    if hit[0] == "Instance Node":
+                        self.updateInstanceNode(hit, newName)
+                    if hit[0] == "Instance Relationship":
+                        self.updateInstanceRelationship(hit, newName)
+                    # the hit object was changed in place
+                    if hit[0] in self.referenceTypes:
+                        self.refreshObjectRefs(hit[0], hit[1])
+                self.setModelDirty()
+                
         return hitList
 
 ######################################################################################
@@ -374,6 +888,7 @@ class ProjectModel(JSONFile):
             dict['items'][int(hit[3])]["name"] = newName
         if hit[2] == "Relationship Template":
             dict['items'][int(hit[3])]["name"] = newName
+        self.indexDiagramItems("Template Diagram", dict)
             
 #    def updateInstanceDiagram(self, hit, newName):
 #        index, dict = self.getDictByName(topLevel=hit[0],objectName=hit[1])
@@ -412,7 +927,7 @@ class ProjectModel(JSONFile):
                         keepList.append(relitem)                    
             # save the ones we want to keep
             dict['items']=keepList
-            
+        self.indexDiagramItems("Instance Diagram", dict)
         
     def removeFromTemplateDiagram(self, hit):
         # get dictionary for the diagram
@@ -447,6 +962,7 @@ class ProjectModel(JSONFile):
                         keepList.append(relitem)                    
             # save the ones we want to keep
             dict['items']=keepList
+        self.indexDiagramItems("Template Diagram", dict)
             
     def updateNodeTemplate(self, hit, newName):
         index, dict = self.getDictByName(topLevel=hit[0],objectName=hit[1])
@@ -643,16 +1159,10 @@ class ProjectModel(JSONFile):
             return None
         
     def templateDiagramIndex(self, name):
-        for index, diagram in enumerate(self.modelData["Template Diagram"]):
-            if diagram["name"] == name:
-                return index
-        return None       
+        return self.topLevelIndex("Template Diagram", name)
         
     def instanceDiagramIndex(self, name):
-        for index, diagram in enumerate(self.modelData["Instance Diagram"]):
-            if diagram["name"] == name:
-                return index
-        return None
+        return self.topLevelIndex("Instance Diagram", name)
         
     def instanceList(self, listName):
         '''
@@ -683,14 +1193,7 @@ class ProjectModel(JSONFile):
         return returnList   
         
     def instanceTopLevelIndex(self, listName, objectName):
-        try:
-            searchDict = self.modelData[listName]
-            for index, object in enumerate(searchDict):
-                if object["name"] == objectName:
-                    return index
-        except:
-            return None
-        return None
+        return self.topLevelIndex(listName, objectName)
 
     def getHeaderList(self, objectType=None, listName=None):
         '''metadata for grid columns, used by html generation
@@ -722,197 +1225,390 @@ class ProjectModel(JSONFile):
 # for example: find everthing that uses a certain property
 ###################################################################################################
     def scanForObjectUse(self, findObjectType, findObjectName):
-        '''Search the project model for references to this objectType and objectName.'''
+        '''Search the project model for references to this objectType and objectName.
+        the reference indexes give the objects that refer to it so only those objects are scanned.'''
         hitList = []
         # get the top level objects that might contain findObjectTypes
         for topLevel in self.objectSearch[findObjectType]:
+            for index, objectDict in self.referencingObjects(topLevel, findObjectType, findObjectName):
+                self.scanObject(hitList, topLevel, index, objectDict, findObjectType, findObjectName)
+        return hitList
+
+    def fullScanForObjectUse(self, findObjectType, findObjectName):
+        '''Search every object in the project model for references to this objectType and objectName.
+        this doesn't use the reference indexes, verifyReferenceIndex compares it to scanForObjectUse.'''
+        hitList = []
+        for topLevel in self.objectSearch[findObjectType]:
+            for index, objectDict in enumerate(self.modelData[topLevel]):
+                self.scanObject(hitList, topLevel, index, objectDict, findObjectType, findObjectName)
+        return hitList
+
+    def verifyReferenceIndex(self, ):
+        '''
+        compare scanForObjectUse to fullScanForObjectUse for every object in the model that can be referenced.
+        returns a list of [objectType, objectName, indexHits, scanHits] for each object where they differ
+        '''
+        diffList = []
+        for findObjectType, searchList in self.objectSearch.items():
+            if len(searchList) == 0:
+                continue
+            for objectName in self.instanceList(findObjectType):
+                indexHits = self.scanForObjectUse(findObjectType, objectName)
+                scanHits = self.fullScanForObjectUse(findObjectType, objectName)
+                if indexHits != scanHits:
+                    diffList.append([findObjectType, objectName, indexHits, scanHits])
+        return diffList
+
+    def scanObject(self, hitList, topLevel, index, objectDict, findObjectType, findObjectName):
+        if topLevel == "Node Template":
+            self.scanNodeTemplate(hitList, index, objectDict, findObjectType, findObjectName)
+        if topLevel == "Relationship Template":
+            self.scanRelationshipTemplate(hitList, index, objectDict, findObjectType, findObjectName)
+        if topLevel == "Template Diagram":
+            self.scanTemplateDiagram(hitList, index, objectDict, findObjectType, findObjectName)    
+        if topLevel == "Instance Diagram":
+            self.scanInstanceDiagram(hitList, index, objectDict, findObjectType, findObjectName)    
+        if topLevel == "Instance Node":
+            self.scanInstanceNode(hitList, index, objectDict, findObjectType, findObjectName)                           
+        if topLevel == "Instance Relationship":
+            self.scanInstanceRelationship(hitList, index, objectDict, findObjectType, findObjectName)                           
+
+    def referencingObjects(self, topLevel, findObjectType, findObjectName):
+        '''
+        return a list of (index, object dictionary) for the objects in topLevel that refer to findObjectType findObjectName, in model order
+        '''
+        if topLevel in self.diagramItemTypes:
+            if not findObjectType in self.diagramItemTypes[topLevel]:
+                # the diagram index only knows the items on the diagram
+                return list(enumerate(self.modelData[topLevel]))
+            objectNames = self.lookupDiagramItem(topLevel, self.diagramItemKey(topLevel, {"NZID": findObjectName, "diagramType": findObjectType, "name": findObjectName}))
+        else:
+            return self.indexedObjects(topLevel, (findObjectType, findObjectName))
+        return self.objectsInOrder(topLevel, objectNames)
+
+    def indexedObjects(self, topLevel, key):
+        '''
+        return a list of (index, object dictionary) for the objects in topLevel filed under key in the reference index, in model order
+        '''
+        self.buildReferenceIndex(topLevel)
+        objectNames = set(objectName for refTopLevel, objectName in self.refIndex.get(key, set()) if refTopLevel == topLevel)
+        return self.objectsInOrder(topLevel, objectNames)
+
+    def objectsInOrder(self, topLevel, objectNames):
+        indexList = sorted(index for index in [self.topLevelIndex(topLevel, objectName) for objectName in objectNames] if not index is None)
+        return [(index, self.modelData[topLevel][index]) for index in indexList]
+
+######################################################################################
+#  reference index - (objectType, objectName) -> the top level objects that refer to it.
+#  it also holds the keys used to match templates, see genMatchKeys.
+#  the TopLevelList for each referencing type calls objectAdded and objectRemoved as objects are stored and deleted,
+#  changes made in place by the impact analysis functions are picked up by refreshObjectRefs.
+#  each top level is added the first time it is looked at so opening a model doesn't read every instance from the file
+######################################################################################
+    def buildReferenceIndex(self, topLevel):
+        if self.refIndex is None:
+            self.objectRefs = {}
+            self.refIndex = {}
+            self.refTopLevels = set()
+        if topLevel in self.refTopLevels or not topLevel in self.referenceTypes:
+            return
+        self.refTopLevels.add(topLevel)
+        for objectDict in self.modelData[topLevel]:
+            self.objectAdded(topLevel, objectDict)
+
+    def objectAdded(self, topLevel, objectDict):
+        if self.refIndex is None or not topLevel in self.refTopLevels:
+            return
+        objectKey = (topLevel, objectDict.get("name", None))
+        refs = self.genObjectRefs(topLevel, objectDict) | self.genMatchKeys(topLevel, objectDict)
+        self.objectRefs.setdefault(objectKey, set()).update(refs)
+        for ref in refs:
+            self.refIndex.setdefault(ref, set()).add(objectKey)
+
+    def objectRemoved(self, topLevel, objectDict):
+        if self.refIndex is None or not topLevel in self.refTopLevels:
+            return
+        objectKey = (topLevel, objectDict.get("name", None))
+        for ref in self.objectRefs.pop(objectKey, set()):
+            self.refIndex.get(ref, set()).discard(objectKey)
+
+    def refreshObjectRefs(self, topLevel, objectName):
+        '''
+        update the reference index after the named object has been changed in place
+        '''
+        index, objectDict = self.getDictByName(topLevel, objectName)
+        if not objectDict is None:
+            self.objectRemoved(topLevel, objectDict)
+            self.objectAdded(topLevel, objectDict)
+
+    def genObjectRefs(self, topLevel, objectDict):
+        '''
+        return the set of (objectType, objectName) a top level object refers to.  
+        this has to include everything the scan functions below can find in the object
+        '''
+        refs = set()
+        try:
+            if topLevel in ["Node Template", "Instance Node"]:
+                for label in objectDict.get("labels", []):
+                    refs.add(("Label", label[0]))
+            if topLevel in ["Node Template", "Instance Node", "Relationship Template", "Instance Relationship"]:
+                for property in objectDict.get("properties", []):
+                    refs.add(("Property", property[0]))
             if topLevel == "Node Template":
-                self.scanNodeTemplate(hitList, findObjectType, findObjectName)
-            if topLevel == "Relationship Template":
-                self.scanRelationshipTemplate(hitList, findObjectType, findObjectName)
-            if topLevel == "Template Diagram":
-                self.scanTemplateDiagram(hitList, findObjectType, findObjectName)    
-            if topLevel == "Instance Diagram":
-                self.scanInstanceDiagram(hitList, findObjectType, findObjectName)    
+                for constraint in objectDict.get("constraints", []) + objectDict.get("indexes", []):
+                    refs.add(("Label", constraint[1]))
+                    for propName in (constraint[2].replace("(", "").replace(")", "")).split(", "):
+                        refs.add(("Property", propName))
             if topLevel == "Instance Node":
-                self.scanInstanceNode(hitList, findObjectType, findObjectName)                           
+                refs.add(("Node Template", objectDict.get("nodeTemplate", None)))
+            if topLevel == "Relationship Template":
+                refs.add(("Relationship", objectDict.get("relname", None)))
+                refs.add(("Node Template", objectDict.get("fromTemplate", None)))
+                refs.add(("Node Template", objectDict.get("toTemplate", None)))
+                for constraint in objectDict.get("constraints", []):
+                    for propName in (constraint[1].replace("(", "").replace(")", "")).split(","):
+                        refs.add(("Property", propName))
             if topLevel == "Instance Relationship":
-                self.scanInstanceRelationship(hitList, findObjectType, findObjectName)                           
-        
-#        for hit in hitList:
-#            print("hit: {}".format(hit))
-        return hitList
-        
-    def scanNodeTemplate(self, hitList, findObjectType, findObjectName):
-        nodeTemplateList = self.instanceList("Node Template")
-        for nodeTemplateName in nodeTemplateList:
-            index, nodeTemplateDict = self.getDictByName(topLevel="Node Template", objectName = nodeTemplateName)
-            if findObjectType == "Label":
-                for index, label in enumerate(nodeTemplateDict["labels"]):
-                    if label[0] == findObjectName:
-                       hitList.append(["Node Template", nodeTemplateDict["name"], "labels", str(index)]) 
-                for index, constraint in enumerate(nodeTemplateDict["constraints"]):
-                    if findObjectName in constraint[1]:
-                       hitList.append(["Node Template", nodeTemplateDict["name"], "constraints", str(index), findObjectType])      
-                for index, constraint in enumerate(nodeTemplateDict["indexes"]):
-                    if findObjectName in constraint[1]:
-                       hitList.append(["Node Template", nodeTemplateDict["name"], "indexes", str(index), findObjectType])                             
-            if findObjectType == "Property":
-                for index, property in enumerate(nodeTemplateDict["properties"]):
-                    if property[0] == findObjectName:
-                       hitList.append(["Node Template", nodeTemplateDict["name"], "properties", str(index)]) 
-                for index, constraint in enumerate(nodeTemplateDict["constraints"]):
-                    propList = (constraint[2].replace("(", "").replace(")", "")).split(", ")
-                    if findObjectName in propList: 
+                refs.add(("Relationship", objectDict.get("relName", None)))
+                refs.add(("Relationship Template", objectDict.get("relTemplate", None)))
+                refs.add(("Instance Node", objectDict.get("startNZID", None)))
+                refs.add(("Instance Node", objectDict.get("endNZID", None)))
+        except:
+            pass
+        return refs
+
+    def genMatchKeys(self, topLevel, objectDict):
+        '''
+        return the set of keys a template is found by when matching nodes and relationships to templates.
+        a node template is found by each of its required labels, a relationship template by its type and node templates together and by each end
+        '''
+        keys = set()
+        try:
+            if topLevel == "Node Template":
+                for label in objectDict.get("labels", []):
+                    if label[REQUIRED] == Qt.Checked:
+                        keys.add(("Required Label", label[LABEL]))
+            if topLevel == "Relationship Template":
+                keys.add(("Relationship Signature", (objectDict.get("relname", None), objectDict.get("fromTemplate", None), objectDict.get("toTemplate", None))))
+                keys.add(("From Template", objectDict.get("fromTemplate", None)))
+                keys.add(("To Template", objectDict.get("toTemplate", None)))
+        except:
+            pass
+        return keys
+
+######################################################################################
+#  diagram index - the diagrams each item is on.  instance diagram items are found by NZID, template diagram items by template type and name
+######################################################################################
+    def lookupDiagramItem(self, diagramType=None, key=None):
+        '''
+        return the names of the diagrams of diagramType that have an item with this key on them
+        '''
+        if self.diagramKeys is None:
+            self.buildDiagramIndex()
+        return sorted(diagramName for keyDiagramType, diagramName in self.keyDiagrams.get(key, set()) if keyDiagramType == diagramType)
+
+    def diagramItemKey(self, diagramType, itemDict):
+        if diagramType == "Instance Diagram":
+            return itemDict.get("NZID", None)
+        return (itemDict.get("diagramType", ""), itemDict.get("name", ""))
+
+    def buildDiagramIndex(self, ):
+        self.diagramKeys = {}
+        self.keyDiagrams = {}
+        for diagramType in self.diagramItemTypes:
+            for diagramDict in self.modelData[diagramType]:
+                self.indexDiagramItems(diagramType, diagramDict)
+
+    def indexDiagramItems(self, diagramType, diagramDict):
+        '''
+        reindex the items on a diagram.  call this when the diagram's item list is replaced or its items are changed in place
+        '''
+        if self.diagramKeys is None or diagramDict is None:
+            return
+        diagram = (diagramType, diagramDict["name"])
+        for key in self.diagramKeys.pop(diagram, set()):
+            self.keyDiagrams.get(key, set()).discard(diagram)
+        for itemDict in diagramDict.get("items", []):
+            self.addDiagramItem(diagramType, diagramDict["name"], itemDict)
+
+    def addDiagramItem(self, diagramType, diagramName, itemDict):
+        '''
+        record an item dropped on a diagram
+        '''
+        if self.diagramKeys is None:
+            return
+        diagram = (diagramType, diagramName)
+        key = self.diagramItemKey(diagramType, itemDict)
+        self.diagramKeys.setdefault(diagram, set()).add(key)
+        self.keyDiagrams.setdefault(key, set()).add(diagram)
+
+    def removeDiagramItem(self, diagramType, diagramName, itemDict):
+        '''
+        record an item removed from a diagram
+        '''
+        if self.diagramKeys is None:
+            return
+        diagram = (diagramType, diagramName)
+        key = self.diagramItemKey(diagramType, itemDict)
+        self.diagramKeys.get(diagram, set()).discard(key)
+        self.keyDiagrams.get(key, set()).discard(diagram)
+
+######################################################################################
+#  the scan functions look for references to findObjectType findObjectName in one top level object
+######################################################################################
+    def scanNodeTemplate(self, hitList, index, nodeTemplateDict, findObjectType, findObjectName):
+        if findObjectType == "Label":
+            for index, label in enumerate(nodeTemplateDict["labels"]):
+                if label[0] == findObjectName:
+                   hitList.append(["Node Template", nodeTemplateDict["name"], "labels", str(index)]) 
+            # a constraint or index has one label.  rename replaces the whole label so only an exact match is a hit
+            for index, constraint in enumerate(nodeTemplateDict["constraints"]):
+                if constraint[1] == findObjectName:
+                   hitList.append(["Node Template", nodeTemplateDict["name"], "constraints", str(index), findObjectType])      
+            for index, constraint in enumerate(nodeTemplateDict["indexes"]):
+                if constraint[1] == findObjectName:
+                   hitList.append(["Node Template", nodeTemplateDict["name"], "indexes", str(index), findObjectType])                             
+        if findObjectType == "Property":
+            for index, property in enumerate(nodeTemplateDict["properties"]):
+                if property[0] == findObjectName:
+                   hitList.append(["Node Template", nodeTemplateDict["name"], "properties", str(index)]) 
+            for index, constraint in enumerate(nodeTemplateDict["constraints"]):
+                propList = (constraint[2].replace("(", "").replace(")", "")).split(", ")
+                if findObjectName in propList: 
 #                    if findObjectName in constraint[2]:
-                       hitList.append(["Node Template", nodeTemplateDict["name"], "constraints", str(index), findObjectType, findObjectName])      
-                for index, constraint in enumerate(nodeTemplateDict["indexes"]):
-                    propList = (constraint[2].replace("(", "").replace(")", "")).split(", ")
-                    if findObjectName in propList: 
+                   hitList.append(["Node Template", nodeTemplateDict["name"], "constraints", str(index), findObjectType, findObjectName])      
+            for index, constraint in enumerate(nodeTemplateDict["indexes"]):
+                propList = (constraint[2].replace("(", "").replace(")", "")).split(", ")
+                if findObjectName in propList: 
 #                    if findObjectName in constraint[2]:
-                       hitList.append(["Node Template", nodeTemplateDict["name"], "indexes", str(index), findObjectType, findObjectName])      
+                   hitList.append(["Node Template", nodeTemplateDict["name"], "indexes", str(index), findObjectType, findObjectName])      
         return
 
-    def scanInstanceNode(self, hitList, findObjectType, findObjectName):
-        instanceNodeList = self.instanceList("Instance Node")
-        for instanceNodeName in instanceNodeList:
-            index, instanceNodeDict = self.getDictByName(topLevel="Instance Node", objectName = instanceNodeName)
-            if findObjectType == "Label":
-                for index, label in enumerate(instanceNodeDict["labels"]):
-                    if label[0] == findObjectName:
-                       hitList.append(["Instance Node", instanceNodeDict["name"], "labels", str(index)]) 
-            if findObjectType == "Property":
-                for index, property in enumerate(instanceNodeDict["properties"]):
-                    if property[0] == findObjectName:
-                       hitList.append(["Instance Node", instanceNodeDict["name"], "properties", str(index)]) 
-            if findObjectType == "Node Template":   
-                if instanceNodeDict["nodeTemplate"] == findObjectName:
-                    hitList.append(["Instance Node", instanceNodeDict["name"], "nodeTemplate"]) 
-            
+    def scanInstanceNode(self, hitList, index, instanceNodeDict, findObjectType, findObjectName):
+        if findObjectType == "Label":
+            for index, label in enumerate(instanceNodeDict["labels"]):
+                if label[0] == findObjectName:
+                   hitList.append(["Instance Node", instanceNodeDict["name"], "labels", str(index)]) 
+        if findObjectType == "Property":
+            for index, property in enumerate(instanceNodeDict["properties"]):
+                if property[0] == findObjectName:
+                   hitList.append(["Instance Node", instanceNodeDict["name"], "properties", str(index)]) 
+        if findObjectType == "Node Template":   
+            if instanceNodeDict["nodeTemplate"] == findObjectName:
+                hitList.append(["Instance Node", instanceNodeDict["name"], "nodeTemplate"]) 
+        
         return
 
 
-    def scanRelationshipTemplate(self, hitList, findObjectType, findObjectName):
-        relTemplateList = self.instanceList("Relationship Template")
-        for relTemplateName in relTemplateList:
-            index, relTemplateDict = self.getDictByName(topLevel="Relationship Template", objectName = relTemplateName)
-            if findObjectType == "Relationship":
-                if findObjectName == relTemplateDict["relname"]:
-                    hitList.append(["Relationship Template", relTemplateDict["name"], "relname" ]) 
-            if findObjectType == "Property":
-                for index, property in enumerate(relTemplateDict["properties"]):
-                    if property[0] == findObjectName:
-                       hitList.append(["Relationship Template", relTemplateDict["name"], "properties", str(index)]) 
-                for index, property in enumerate(relTemplateDict["constraints"]):
-                    propList = (property[1].replace("(", "").replace(")", "")).split(",")
-                    if findObjectName in propList: 
-                       hitList.append(["Relationship Template", relTemplateDict["name"], "constraints", str(index), findObjectType, findObjectName])      
-            if findObjectType == "Node Template":
-                if findObjectName == relTemplateDict["fromTemplate"]:
-                    hitList.append(["Relationship Template", relTemplateDict["name"], "from node template", str(index)]) 
-                if findObjectName == relTemplateDict["toTemplate"]:
-                    hitList.append(["Relationship Template", relTemplateDict["name"], "to node template", str(index)]) 
+    def scanRelationshipTemplate(self, hitList, index, relTemplateDict, findObjectType, findObjectName):
+        if findObjectType == "Relationship":
+            if findObjectName == relTemplateDict["relname"]:
+                hitList.append(["Relationship Template", relTemplateDict["name"], "relname" ]) 
+        if findObjectType == "Property":
+            for index, property in enumerate(relTemplateDict["properties"]):
+                if property[0] == findObjectName:
+                   hitList.append(["Relationship Template", relTemplateDict["name"], "properties", str(index)]) 
+            for index, property in enumerate(relTemplateDict["constraints"]):
+                propList = (property[1].replace("(", "").replace(")", "")).split(",")
+                if findObjectName in propList: 
+                   hitList.append(["Relationship Template", relTemplateDict["name"], "constraints", str(index), findObjectType, findObjectName])      
+        if findObjectType == "Node Template":
+            if findObjectName == relTemplateDict["fromTemplate"]:
+                hitList.append(["Relationship Template", relTemplateDict["name"], "from node template", str(index)]) 
+            if findObjectName == relTemplateDict["toTemplate"]:
+                hitList.append(["Relationship Template", relTemplateDict["name"], "to node template", str(index)]) 
 
         return   
         
-    def scanInstanceRelationship(self, hitList, findObjectType, findObjectName):
-        instanceRelationshipList = self.instanceList("Instance Relationship")
-        for instanceRelationshipName in instanceRelationshipList:
-            index, instanceRelationshipDict = self.getDictByName(topLevel="Instance Relationship", objectName = instanceRelationshipName)
-            if findObjectType == "Relationship":
-                if findObjectName == instanceRelationshipDict["relName"]:
-                    hitList.append(["Instance Relationship", instanceRelationshipDict["name"], "relName"]) 
-            if findObjectType == "Property":
-                for index, property in enumerate(instanceRelationshipDict["properties"]):
-                    if property[0] == findObjectName:
-                       hitList.append(["Instance Relationship", instanceRelationshipDict["name"], "properties", str(index)]) 
-            if findObjectType == "Relationship Template":   
-                if instanceRelationshipDict["relTemplate"] == findObjectName:
-                    hitList.append(["Instance Relationship", instanceRelationshipDict["name"], "relTemplate"]) 
-            if findObjectType == "Instance Node":   
-                if instanceRelationshipDict["startNZID"] == findObjectName:
-                    hitList.append(["Instance Relationship", instanceRelationshipDict["name"], "startNZID"]) 
-            if findObjectType == "Instance Node":   
-                if instanceRelationshipDict["endNZID"] == findObjectName:
-                    hitList.append(["Instance Relationship", instanceRelationshipDict["name"], "endNZID"]) 
+    def scanInstanceRelationship(self, hitList, index, instanceRelationshipDict, findObjectType, findObjectName):
+        if findObjectType == "Relationship":
+            if findObjectName == instanceRelationshipDict["relName"]:
+                hitList.append(["Instance Relationship", instanceRelationshipDict["name"], "relName"]) 
+        if findObjectType == "Property":
+            for index, property in enumerate(instanceRelationshipDict["properties"]):
+                if property[0] == findObjectName:
+                   hitList.append(["Instance Relationship", instanceRelationshipDict["name"], "properties", str(index)]) 
+        if findObjectType == "Relationship Template":   
+            if instanceRelationshipDict["relTemplate"] == findObjectName:
+                hitList.append(["Instance Relationship", instanceRelationshipDict["name"], "relTemplate"]) 
+        if findObjectType == "Instance Node":   
+            if instanceRelationshipDict["startNZID"] == findObjectName:
+                hitList.append(["Instance Relationship", instanceRelationshipDict["name"], "startNZID"]) 
+        if findObjectType == "Instance Node":   
+            if instanceRelationshipDict["endNZID"] == findObjectName:
+                hitList.append(["Instance Relationship", instanceRelationshipDict["name"], "endNZID"]) 
         
         return
         
-    def scanInstanceDiagram(self, hitList, findObjectType, findObjectName):
-        instanceDiagramList = self.instanceList("Instance Diagram")
-        for instanceDiagramName in instanceDiagramList:
-            index, instanceDiagramDict = self.getDictByName(topLevel="Instance Diagram", objectName = instanceDiagramName)
-            for itemIndex, item in enumerate(instanceDiagramDict["items"]):
-                if findObjectType == "Instance Node":
-                    if item["NZID"] == findObjectName:
-                        hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex), item["NZID"] ])
-                        break
-                if findObjectType == "Instance Relationship":
-                    if item["NZID"] == findObjectName:
-                        hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex), item["NZID"] ])
-                        break
-                # check the  nodes on the diagram
-                if item["diagramType"] == "Node":
-                    index, instanceDict = self.getDictByName(topLevel="Instance Node", objectName = item["NZID"])
-
-
-                    if findObjectType == "Property":   
-                        for index, property in enumerate(instanceDict["properties"]):
-                            if property[0] == findObjectName:
-                               hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex),"properties", str(index)]) 
-
-                    if findObjectType == "Label":   
-                        for index, label in enumerate(instanceDict["labels"]):
-                            if label[0] == findObjectName:
-                               hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex),"labels", str(index)]) 
-                    
-                    if findObjectType == "Node Template":   
-                        if item["nodeTemplate"] == findObjectName:
-                            hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex),"nodeTemplate"]) 
-
-                # check the relationships on the diagram
-                if item["diagramType"] == "Instance Relationship":
-                    if findObjectType == "Relationship Template":   
-                        if item["relTemplate"] == findObjectName:
-                            hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex),"relTemplate"]) 
-                    
-                    index, instanceDict = self.getDictByName(topLevel="Instance Relationship", objectName = item["NZID"])
-                    if findObjectType == "Property":   
-                        for index, property in enumerate(instanceDict["properties"]):
-                            if property[0] == findObjectName:
-                               hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex),"properties", str(index)]) 
+    def scanInstanceDiagram(self, hitList, index, instanceDiagramDict, findObjectType, findObjectName):
+        for itemIndex, item in enumerate(instanceDiagramDict["items"]):
+            if findObjectType == "Instance Node":
+                if item["NZID"] == findObjectName:
+                    hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex), item["NZID"] ])
+                    break
+            if findObjectType == "Instance Relationship":
+                if item["NZID"] == findObjectName:
+                    hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex), item["NZID"] ])
+                    break
+            # check the  nodes on the diagram
+            if item["diagramType"] == "Node":
+                index, instanceDict = self.getDictByName(topLevel="Instance Node", objectName = item["NZID"])
+
+
+                if findObjectType == "Property":   
+                    for index, property in enumerate(instanceDict["properties"]):
+                        if property[0] == findObjectName:
+                           hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex),"properties", str(index)]) 
+
+                if findObjectType == "Label":   
+                    for index, label in enumerate(instanceDict["labels"]):
+                        if label[0] == findObjectName:
+                           hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex),"labels", str(index)]) 
+                
+                if findObjectType == "Node Template":   
+                    if item["nodeTemplate"] == findObjectName:
+                        hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex),"nodeTemplate"]) 
+
+            # check the relationships on the diagram
+            if item["diagramType"] == "Instance Relationship":
+                if findObjectType == "Relationship Template":   
+                    if item["relTemplate"] == findObjectName:
+                        hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex),"relTemplate"]) 
+                
+                index, instanceDict = self.getDictByName(topLevel="Instance Relationship", objectName = item["NZID"])
+                if findObjectType == "Property":   
+                    for index, property in enumerate(instanceDict["properties"]):
+                        if property[0] == findObjectName:
+                           hitList.append(["Instance Diagram", instanceDiagramDict["name"], item["diagramType"], str(itemIndex),"properties", str(index)]) 
 
         return       
-              
-    def scanTemplateDiagram(self, hitList, findObjectType, findObjectName):
-        templateDiagramList = self.instanceList("Template Diagram")
-        for templateDiagramName in templateDiagramList:
-            index, templateDiagramDict = self.getDictByName(topLevel="Template Diagram", objectName = templateDiagramName)
-            for itemIndex, item in enumerate(templateDiagramDict["items"]):
-                if  (item.get("diagramType", "") == findObjectType
-                    and item.get("name", "") == findObjectName):
-                        hitList.append(["Template Diagram", templateDiagramDict["name"], item["diagramType"], str(itemIndex),item["NZID"] ])
-
-                # check the  nodes on the diagram for labels and properties
-                if item["diagramType"] == "Node Template":
-                    index, instanceDict = self.getDictByName(topLevel="Node Template", objectName = item["NZID"])
-                    if findObjectType == "Property":   
-                        for index, property in enumerate(instanceDict["properties"]):
-                            if property[0] == findObjectName:
-                               hitList.append(["Template Diagram", templateDiagramDict["name"], item["diagramType"], str(itemIndex),"properties", str(index)]) 
-
-                    if findObjectType == "Label":   
-                        for index, label in enumerate(instanceDict["labels"]):
-                            if label[0] == findObjectName:
-                               hitList.append(["Template Diagram", templateDiagramDict["name"], item["diagramType"], str(itemIndex),"labels", str(index)]) 
-                    
-                # check the relationships on the diagram for properties
-                if (item["diagramType"] == "Relationship Template" and findObjectType == "Property") :
-                    index, instanceDict = self.getDictByName(topLevel="Relationship Template", objectName = item["NZID"])
-                    if findObjectType == "Property":   
-                        for index, property in enumerate(instanceDict["properties"]):
-                            if property[0] == findObjectName:
-                               hitList.append(["Template Diagram", templateDiagramDict["name"], item["diagramType"], str(itemIndex),"properties", str(index)]) 
+          
+    def scanTemplateDiagram(self, hitList, index, templateDiagramDict, findObjectType, findObjectName):
+        for itemIndex, item in enumerate(templateDiagramDict["items"]):
+            if  (item.get("diagramType", "") == findObjectType
+                and item.get("name", "") == findObjectName):
+                    hitList.append(["Template Diagram", templateDiagramDict["name"], item["diagramType"], str(itemIndex),item["NZID"] ])
+
+            # check the  nodes on the diagram for labels and properties
+            if item["diagramType"] == "Node Template":
+                index, instanceDict = self.getDictByName(topLevel="Node Template", objectName = item["NZID"])
+                if findObjectType == "Property":   
+                    for index, property in enumerate(instanceDict["properties"]):
+                        if property[0] == findObjectName:
+                           hitList.append(["Template Diagram", templateDiagramDict["name"], item["diagramType"], str(itemIndex),"properties", str(index)]) 
+
+                if findObjectType == "Label":   
+                    for index, label in enumerate(instanceDict["labels"]):
+                        if label[0] == findObjectName:
+                           hitList.append(["Template Diagram", templateDiagramDict["name"], item["diagramType"], str(itemIndex),"labels", str(index)]) 
+                
+            # check the relationships on the diagram for properties
+            if (item["diagramType"] == "Relationship Template" and findObjectType == "Property") :
+                index, instanceDict = self.getDictByName(topLevel="Relationship Template", objectName = item["NZID"])
+                if findObjectType == "Property":   
+                    for index, property in enumerate(instanceDict["properties"]):
+                        if property[0] == findObjectName:
+                           hitList.append(["Template Diagram", templateDiagramDict["name"], item["diagramType"], str(itemIndex),"properties", str(index)]) 
 
         return       
 
@@ -993,6 +1689,7 @@ class ProjectModel(JSONFile):
         propList = self.helper.genPropValueList("n", nodeDict)
         signature = "({} {} {}{}{} )".format(str(nodeID), lblList, "{", propList, "}")
         nodeDict["displayName"] =  signature        
+        self.reindexInstance("Instance Node", nodeDict)
         
 
     def genRelSignature(self, relDict):
@@ -1010,6 +1707,7 @@ class ProjectModel(JSONFile):
         propList = self.helper.genPropValueList("n", relDict)
         signature = "({})-[{}:{} {}{}{}]->({})".format(str(fromID), str(relID), relDict["relname"], "{", propList, "}", str(toID))
         relDict["displayName"] =  signature   
+        self.reindexInstance("Instance Relationship", relDict)
         
     def getInstanceItemDict(self, diagramName, NodeEraKey):
         '''
@@ -1026,50 +1724,78 @@ class ProjectModel(JSONFile):
                         return itemDict
         return None
         
+    def lookupInstance(self, topLevel=None, key=None, value=None):
+        '''
+        return the Instance Node or Instance Relationship dictionary whose key matches the value or None.
+        the top level list keeps a reverse index for each key so this doesn't scan the instances
+        '''
+        try:
+            index = self.getTopLevelList(topLevel).indexOfKey(key, value)
+        except:
+            return None
+        if index is None:
+            return None
+        return self.modelData[topLevel][index]
+
+    def reindexInstance(self, topLevel=None, instanceDict=None):
+        '''
+        update the reverse indexes after an instance dictionary in the model has been changed in place, for example the neoID set by a sync
+        '''
+        try:
+            self.getTopLevelList(topLevel).updateObject(instanceDict)
+        except:
+            pass
+
     def lookupNeoID(self, NZID=None):
         '''find the neoID based on the NZID
         '''
-        for instance in self.instanceList("Instance Node"):
-            instanceIndex, instanceDict = self.getDictByName(topLevel="Instance Node", objectName=instance)
-            if str(instanceDict.get("NZID", None)) == str(NZID):
-                return instanceDict.get("neoID", None)        
-        return None
+        instanceDict = self.lookupInstance(topLevel="Instance Node", key="NZID", value=NZID)
+        if instanceDict is None:
+            return None
+        return instanceDict.get("neoID", None)        
         
     def lookupNZID(self, neoID=None, topLevel=None):
         '''
         find the NZID based on a neoID
         '''
-        for instance in self.instanceList(topLevel):
-            instanceIndex, instanceDict = self.getDictByName(topLevel=topLevel, objectName=instance)
-            if str(instanceDict.get("neoID", None)) == str(neoID):
-                return instanceDict.get("NZID", None)
-                
-        return None
+        instanceDict = self.lookupInstance(topLevel=topLevel, key="neoID", value=neoID)
+        if instanceDict is None:
+            return None
+        return instanceDict.get("NZID", None)
         
     def lookupNZIDfromDisplayName(self, displayName=None, topLevel=None):
         '''
         find the NZID based  on the display  name for an Instance Node or Instance Rel
         '''
-        for instance in self.instanceList(topLevel):
-            instanceIndex, instanceDict = self.getDictByName(topLevel=topLevel, objectName=instance)
-            if str(instanceDict.get("displayName", "")) == str(displayName):
-                return instanceDict.get("NZID", None)
-                
-        return None
+        instanceDict = self.lookupInstance(topLevel=topLevel, key="displayName", value=displayName)
+        if instanceDict is None:
+            return None
+        return instanceDict.get("NZID", None)
+
+    def lookupDiagrams(self, NZID=None):
+        '''
+        return the names of the instance diagrams an instance node or relationship is on
+        '''
+        return self.lookupDiagramItem("Instance Diagram", NZID)
     
     def matchNodeTemplate(self, nodeObject=None):
         '''
         nodeObject is a neo4j node data type returned from a query.
         this function looks for a node template that matches the labels and properties in the node.
         It picks the first template it founds where the required labels are present 
+        only the templates that require one of the node's labels are checked, see genMatchKeys
         future - should also match on required properties
         '''
         nodeLblSet = set([lbl for lbl in nodeObject.labels]  )
-        for nodeTemplate in self.instanceList("Node Template"):
-            nodeIndex, nodeDict = self.getDictByName(topLevel="Node Template", objectName=nodeTemplate) 
+        candidates = {}
+        for lbl in nodeLblSet:
+            for nodeIndex, nodeDict in self.indexedObjects("Node Template", ("Required Label", lbl)):
+                candidates[nodeIndex] = nodeDict
+        for nodeIndex in sorted(candidates):
+            nodeDict = candidates[nodeIndex]
             reqLabels = set([label[LABEL] for label in nodeDict["labels"] if label[REQUIRED] == Qt.Checked])
             if (len(reqLabels) > 0 and reqLabels.issubset(nodeLblSet)):
-                return nodeTemplate
+                return nodeDict["name"]
         
         return None
             
@@ -1078,64 +1804,43 @@ class ProjectModel(JSONFile):
         see if a relationship template has the given start and end node template and the relationshipn name.
         This returns the first matching template it finds
         '''
-        for relTemplate in self.instanceList("Relationship Template"):
-            relIndex, relDict = self.getDictByName(topLevel="Relationship Template", objectName=relTemplate) 
-            if relDict["relname"] == relName and relDict["fromTemplate"] == startNodeTemplate and relDict["toTemplate"] == endNodeTemplate:
-                return relTemplate
+        for relIndex, relDict in self.indexedObjects("Relationship Template", ("Relationship Signature", (relName, startNodeTemplate, endNodeTemplate))):
+            return relDict["name"]
     
         return None
 
     def matchAllRelTemplates(self, startNodeTemplate=None, endNodeTemplate=None, relName = None ):
         '''
         see if a relationship template has the given start and end node template and the relationshipn name.
+        "No Template Selected" or "" matches any node template.  if no relationship type has been selected yet only the node templates are matched.
         This returns all matching templates in a list
         '''
+        noTemplate = ["No Template Selected", ""]
+        relSelected = not relName in ["NoRelationshipName", "Enter or Select Relationship Type"]
+        # start from the smallest set of templates the index can give
+        if not startNodeTemplate in noTemplate:
+            candidates = self.getOutboundRelTemplates(startNodeTemplate)
+        elif not endNodeTemplate in noTemplate:
+            candidates = self.getInboundRelTemplates(endNodeTemplate)
+        elif relSelected:
+            candidates = [relDict for relIndex, relDict in self.indexedObjects("Relationship Template", ("Relationship", relName))]
+        else:
+            candidates = self.modelData["Relationship Template"]
         relTemplateList = []
-        for relTemplate in self.instanceList("Relationship Template"):
-            relIndex, relDict = self.getDictByName(topLevel="Relationship Template", objectName=relTemplate) 
-            # a relationship type has been selected
-            if not relName in ["NoRelationshipName", "Enter or Select Relationship Type"]:
-                if relDict["relname"] == relName:
-                    if (((relDict["fromTemplate"] == startNodeTemplate) and (relDict["toTemplate"] == endNodeTemplate))
-                        or
-                        ((relDict["fromTemplate"] == startNodeTemplate) and (endNodeTemplate in ["No Template Selected", ""]))
-                        or
-                        ((startNodeTemplate in ["No Template Selected", ""]) and (relDict["toTemplate"] == endNodeTemplate))
-                        or
-                        ((startNodeTemplate in ["No Template Selected", ""]) and (endNodeTemplate in ["No Template Selected", ""]))
-                        ):
-                        relTemplateList.append(relTemplate)
-            # no relationship type has been selected yet so only look at node templates to make a match
-            else:
-                if (((relDict["fromTemplate"] == startNodeTemplate) and (relDict["toTemplate"] == endNodeTemplate))
-                    or
-                    ((relDict["fromTemplate"] == startNodeTemplate) and (endNodeTemplate in ["No Template Selected", ""]))
-                    or
-                    ((startNodeTemplate in ["No Template Selected", ""]) and (relDict["toTemplate"] == endNodeTemplate))
-                    or
-                    ((startNodeTemplate in ["No Template Selected", ""]) and (endNodeTemplate in ["No Template Selected", ""]))
-                    ):
-                    relTemplateList.append(relTemplate)
+        for relDict in candidates:
+            if relSelected and relDict["relname"] != relName:
+                continue
+            if ((startNodeTemplate in noTemplate or relDict["fromTemplate"] == startNodeTemplate)
+                and (endNodeTemplate in noTemplate or relDict["toTemplate"] == endNodeTemplate)):
+                relTemplateList.append(relDict["name"])
                     
         return relTemplateList
         
     def getInboundRelTemplates(self, nodeTemplateName = None):
-        relTemplateList = []
-        for relTemplate in self.instanceList("Relationship Template"):
-            relIndex, relDict = self.getDictByName(topLevel="Relationship Template", objectName=relTemplate)
-            if relDict["toTemplate"] == nodeTemplateName:
-                relTemplateList.append(relDict)
-
-        return relTemplateList 
+        return [relDict for relIndex, relDict in self.indexedObjects("Relationship Template", ("To Template", nodeTemplateName))]
         
     def getOutboundRelTemplates(self, nodeTemplateName = None):
-        relTemplateList = []
-        for relTemplate in self.instanceList("Relationship Template"):
-            relIndex, relDict = self.getDictByName(topLevel="Relationship Template", objectName=relTemplate)
-            if relDict["fromTemplate"] == nodeTemplateName:
-                relTemplateList.append(relDict)
-
-        return relTemplateList         
+        return [relDict for relIndex, relDict in self.indexedObjects("Relationship Template", ("From Template", nodeTemplateName))]
 
                 
     def newLabel(self, name):
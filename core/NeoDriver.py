@@ -19,14 +19,27 @@ You should have received a copy of the GNU General Public License along with Nod
 """
 import datetime
 import logging
+import time
+import uuid
+from itertools import islice
 
-from neo4j import GraphDatabase
+from neo4j import READ_ACCESS, WRITE_ACCESS, Query
 from neo4j.exceptions import Neo4jError
 from neo4j.exceptions import DriverError
 
 from PyQt5.QtCore import QSettings
 
 from core.helper import Helper
+from core.NeoDriverRegistry import driverRegistry
+from core.QueryCache import QueryCache
+from core.ResultBuffer import ResultBuffer
+from core.userExceptions import queryCancelledError
+
+# the update counters returned in a result summary
+COUNTERNAMES = ["nodes_created", "nodes_deleted", "relationships_created", "relationships_deleted", "properties_set", 
+                            "labels_added", "labels_removed", "indexes_added", "indexes_removed", "constraints_added", "constraints_removed"]
+# the size of one record in this many is measured, the rest use the average of the ones measured
+SIZESAMPLE = 1000
 
 #############################################################################
 # this class acts as a wrapper to the neo4j V4 python driver
@@ -46,14 +59,18 @@ class NeoDriver():
         if not promptPW is None:
             self.neoDict["password"] = promptPW
         
-        # driver used by this NeoDriver object
+        # driver used by this NeoDriver object.  this is shared with every other NeoDriver connected to the same slot, see NeoDriverRegistry
         self.myDriver = None
         # session used for unmanaged transaction
         self.session = None
+        # access mode the session was opened with.  in a cluster READ sessions are routed to followers and read replicas
+        self.sessionAccessMode = None
         # transaction used for unmanaged transaction
         self.tx = None
         # result object used while consuming query results and saving them to self.resultSet
         self.result = None
+        # the column names of the last result.  a cached result has no result object so use this instead of self.result.keys()
+        self.resultKeys = None
         # persistent result set and summary
         self.resultSet = None
         self.resultSummary = None
@@ -62,10 +79,49 @@ class NeoDriver():
         self.cursorChunk = None
         self.chunkStart = 0         # this is the record number of the first record in the chunk
         self.chunkEnd = 0           # this is the record number of the last record in the chunk
-        self.chunkSize = 10     # some day we'll make this a parameter setting
+        self.chunkSize = int(self.settings.value("Default/ChunkSize", "10"))     # number of records returned by forwardCursor
         self.curRecord = 0          # this is the last record retrieved
         self.endReached = False
         
+        # streaming cursor support.  when streaming is True, forwardCursor pulls records from the live result
+        # instead of slicing self.resultSet and the explicit transaction stays open until the result is exhausted
+        self.streaming = False
+        self.cursorResult = None    # the live result being streamed.  runCypherAuto replaces self.result but not this
+        self.cursorLogDict = {}     # the cypherLogDict of the streaming query.  rows, bytes and timings keep adding up here as chunks are pulled
+        self.fetchSize = int(self.settings.value("Default/FetchSize", "1000"))       # number of records the driver pulls from the server per network round trip
+        
+        # prefetch support. prefetchCursor pulls the next chunk ahead of time (normally on a NeoThread) and forwardCursor hands it out
+        self.prefetchChunk = None
+        self.prefetchSize = 0       # the chunk size that was requested when the prefetched chunk was pulled
+        
+        # adaptive chunk sizing.  chunkSize moves between minChunkSize and maxChunkSize so that pulling one chunk
+        # takes about targetChunkTime seconds and about targetChunkBytes of data
+        self.adaptiveChunk = str(self.settings.value("Default/AdaptiveChunk", "True")) == "True"
+        self.minChunkSize = self.chunkSize
+        self.maxChunkSize = int(self.settings.value("Default/MaxChunkSize", "1000"))
+        self.targetChunkTime = 0.2
+        self.targetChunkBytes = 1000000
+        
+        # batched writes.  runCypherBatch sends this many rows per UNWIND transaction
+        self.batchSize = int(self.settings.value("Default/BatchSize", "1000"))
+        self.batchLog = []          # one dictionary per batch describing the outcome of the last runCypherBatch
+        self.batchTotals = {}       # counters summed over every successful batch of the last runCypherBatch
+        
+        # opt in cache of read only query results.  any update run thru this NeoDriver clears it
+        self.queryCache = QueryCache(enabled=str(self.settings.value("Default/QueryCache", "False")) == "True", 
+                                                    maxEntries=int(self.settings.value("Default/QueryCacheSize", "100")), 
+                                                    ttl=int(self.settings.value("Default/QueryCacheTTL", "60")), 
+                                                    maxRows=int(self.settings.value("Default/QueryCacheMaxRows", "10000")))
+        self.cursorCacheRows = None     # the rows of a cacheable streaming cursor collected as they are pulled
+        self.cursorCacheKey = None      # cypher, parameters and column names of the cacheable streaming cursor
+        
+        # result sets bigger than this many megabytes are spilled to a temporary file
+        self.resultMemoryLimit = int(self.settings.value("Default/ResultMemoryMB", "256")) * 1000000
+        
+        # query cancellation.  every transaction is tagged with queryTag in its metadata so cancel can find it on the server
+        self.queryTag = None
+        self.cancelRequested = False
+        
         # track query statistics
         self.stats = None 
         # default to true
@@ -183,11 +239,18 @@ class NeoDriver():
         
         return strRel        
 
-    def runCypherAuto(self, cypherText, cypherParms=None):
+    def runCypherAuto(self, cypherText, cypherParms=None, readOnly=False, useCache=True):
         '''
             run a cypher in an automatic transaction.
             save the entire result.
+            readOnly=True opens a READ session which a neo4j:// routing connection sends to a follower or read replica.
+            readOnly results are saved in the query cache if it is enabled, useCache=False always goes to the server.
         '''
+        # see if the result is already cached
+        if readOnly == True and useCache == True:
+            entry = self.queryCache.get(cypherText=cypherText, parms=cypherParms)
+            if not entry is None:
+                return self.useCachedResult(entry, cypherText, cypherParms)
         
         # first create the driver  object if we haven't done that yet
         if self.myDriver is not None:
@@ -200,6 +263,8 @@ class NeoDriver():
 
         # now run the query and save the result set
         errSuffix = "Run Cypher Auto Error"
+        autoSession = None
+        accessMode = None
         try:
             rc = False
             self.cypherLogDict = {}
@@ -207,24 +272,36 @@ class NeoDriver():
             self.cypherLogDict["startTime"] = datetime.datetime.now()  
             self.cypherLogDict["offset"] = -1
             self.cypherLogDict["cypher"] = cypherText
+            self.cypherLogDict["parms"] = cypherParms
+            self.startTiming()
             
             # create a session
-            self.logScript('aSession = aDriver.session()')
-            self.session = self.myDriver.session()
+            accessMode = self.genAccessMode(readOnly=readOnly, explicit=False)
+            # wait for the last update on this connection so a read replica doesn't return data from before it
+            bookmarks = driverRegistry.bookmarks(self.myDriver)
+            self.logScript('aSession = aDriver.session(default_access_mode={}, bookmarks={})'.format(accessMode, bookmarks))
+            # the session is local so it doesn't replace the session of an open explicit or streaming transaction
+            autoSession = driverRegistry.openSession(self.myDriver, default_access_mode=accessMode, bookmarks=bookmarks)
             self.logDriverStatus()
             
-            # run an autocommit transaction
-            self.logScript('aResult = aSession.run({})'.format(cypherText))
-            self.result = self.session.run(cypherText)
+            # run an autocommit transaction tagged so it can be cancelled
+            self.cancelRequested = False
+            self.genQueryTag()
+            self.cypherLogDict["runClock"] = time.perf_counter()
+            if cypherParms is None:
+                self.logScript('aResult = aSession.run({})'.format(cypherText))
+                self.result = autoSession.run(Query(cypherText, metadata=self.txMetadata()))
+            else:
+                self.logScript('aResult = aSession.run("{}",parameters="{}"'.format(cypherText, cypherParms))
+                self.result = autoSession.run(Query(cypherText, metadata=self.txMetadata()), parameters=cypherParms)
+            self.resultKeys = list(self.result.keys())
             self.logDriverStatus()
             
             # save the result as a list of records
             self.logScript('self.resultSet = []')
             self.logScript('for rec in self.result:')
             self.logScript('    self.resultSet.append(rec)')
-            self.resultSet = []
-            for rec in self.result:
-                self.resultSet.append(rec)            
+            self.resultSet = self.fetchRecords(self.result)
             
 #            self.logScript('aResultSet = aResult.data()')
 #            self.resultSet = self.result.data()
@@ -235,6 +312,9 @@ class NeoDriver():
             self.resultSummary = self.result.consume()
             self.logDriverStatus()
             
+            if readOnly == True and useCache == True:
+                self.cacheResult(cypherText, cypherParms, self.resultSet, self.resultKeys)
+            
             rc = True
             msg = "Query Completed"
             
@@ -250,6 +330,8 @@ class NeoDriver():
             
             # save query results if present
             if not self.resultSummary is None:
+                self.saveSummaryTiming()
+                self.invalidateOnUpdate(self.resultSummary)
                 if not self.resultSummary.plan is None:
                     self.cypherLogDict["plan"] = self.resultSummary.plan
                 else:
@@ -271,19 +353,175 @@ class NeoDriver():
                     if msg.find("(offset: ") > -1:
                         self.cypherLogDict["offset"] =  int(msg[msg.find("(offset: ")+9 : msg.find(")", msg.find("(offset: ")) ])
             
-            if not self.session is None:
+            if not autoSession is None:
+                if rc == True and accessMode == WRITE_ACCESS:
+                    driverRegistry.saveBookmark(self.myDriver, autoSession)
                 self.logScript('aSession.close()')
-                self.session.close()
+                autoSession.close()
                 self.logDriverStatus()
                 
             return rc, msg         
 
-    def runCypherExplicit(self, cypherText, parmData=None):
+    def runCypherBatch(self, cypherText, rows, batchSize=None, parmData=None):
+        '''
+            run a parameterized cypher statement once for every row dictionary in rows.
+            the rows are sent in batches of batchSize using "UNWIND $rows AS row" so cypherText refers to each row as row, for example
+                "match (n) where id(n) = row.nodeID set n.name = row.name"
+            each batch runs in its own transaction so a failure only rolls back the batch that failed.
+            parmData holds any other parameters used by cypherText.
+            the outcome of each batch is saved in self.batchLog and the summed counters in self.batchTotals
+        '''
+        # first create the driver  object if we haven't done that yet
+        if self.myDriver is not None:
+            pass
+        else:
+            rc, msg = self.setDriver()
+            if rc == False:
+                return False, msg
+                
+        if batchSize is None:
+            batchSize = self.batchSize
+        batchSize = max(1, int(batchSize))
+        batchCypher = "UNWIND $rows AS row \n{}".format(cypherText)
+        
+        self.batchLog = []
+        self.batchTotals = {counter: 0 for counter in COUNTERNAMES}
+        self.cypherLogDict = {}
+        self.cypherLogDict["error"] = ""
+        self.cypherLogDict["offset"] = -1
+        self.cypherLogDict["cypher"] = batchCypher
+        self.cypherLogDict["parms"] = parmData
+        self.cypherLogDict["startTime"] = datetime.datetime.now()
+        
+        errSuffix = "Run Cypher Batch Error"
+        batchSession = None
+        rowCount = 0
+        failCount = 0
+        try:
+            rc = False
+            # the batches get their own session so an open explicit transaction or streaming cursor isn't disturbed
+            bookmarks = driverRegistry.bookmarks(self.myDriver)
+            self.logScript('aSession = aDriver.session(bookmarks={})'.format(bookmarks))
+            batchSession = driverRegistry.openSession(self.myDriver, bookmarks=bookmarks)
+            rowIter = iter(rows)
+            batchNum = 0
+            self.cancelRequested = False
+            while self.cancelRequested == False:
+                batch = list(islice(rowIter, batchSize))
+                if len(batch) == 0:
+                    break
+                batchNum = batchNum + 1
+                rowCount = rowCount + len(batch)
+                batchParms = dict(parmData) if not parmData is None else {}
+                batchParms["rows"] = batch
+                rc1, msg1, batchDict = self.runBatch(batchSession, batchCypher, batchParms, batchNum)
+                batchDict["firstRow"] = rowCount - len(batch)
+                batchDict["rowCount"] = len(batch)
+                self.batchLog.append(batchDict)
+                if rc1 == True:
+                    for counter in COUNTERNAMES:
+                        self.batchTotals[counter] = self.batchTotals[counter] + batchDict["counters"].get(counter, 0)
+                else:
+                    failCount = failCount + 1
+                    self.logMsg(msg1)
+                    
+            if self.cancelRequested == True:
+                msg = "Query Cancelled after {} batches - {}".format(len(self.batchLog), errSuffix)
+            elif failCount == 0:
+                rc = True
+                msg = "{} rows processed in {} batches".format(rowCount, len(self.batchLog))
+            else:
+                msg = "{} of {} batches failed - {}".format(failCount, len(self.batchLog), errSuffix)
+                
+        except Neo4jError as e:
+            msg =  "Neo4j Error :{} - {}".format(repr(e), errSuffix)
+        except DriverError as e:
+            msg =  "Driver Error :{} - {}".format(repr(e), errSuffix)
+        except BaseException as e:
+            msg =   "Base Exception :{} - {}".format(repr(e), errSuffix) 
+            
+        finally:
+            self.cypherLogDict["endTime"] = datetime.datetime.now()
+            # a batch run has no single summary, the counters are in batchTotals
+            self.stats = None
+            if rc == False:
+                self.cypherLogDict["error"] = msg
+            if not batchSession is None:
+                self.logScript('aSession.close()')
+                batchSession.close()
+                
+            return rc, msg
+            
+    def runBatch(self, batchSession, batchCypher, batchParms, batchNum):
+        '''
+            run one batch in its own transaction and return rc, msg and a dictionary describing the batch
+        '''
+        batchDict = {"batch": batchNum, "rc": False, "error": "", "counters": {}}
+        batchDict["startTime"] = datetime.datetime.now()
+        startClock = time.perf_counter()
+        errSuffix = "Run Batch {} Error".format(batchNum)
+        batchTx = None
+        try:
+            rc = False
+            self.logScript('aTx = aSession.begin_transaction()')
+            self.genQueryTag()
+            batchTx = batchSession.begin_transaction(metadata=self.txMetadata())
+            self.logScript('aResult = aTx.run("{}",parameters=batch {})'.format(batchCypher, batchNum))
+            batchResult = batchTx.run(batchCypher, parameters=batchParms)
+            batchSummary = batchResult.consume()
+            self.logScript('aTx.commit()')
+            batchTx.commit()
+            batchTx = None
+            driverRegistry.saveBookmark(self.myDriver, batchSession)
+            if not batchSummary.counters is None:
+                batchDict["counters"] = {counter: getattr(batchSummary.counters, counter, 0) for counter in COUNTERNAMES}
+            self.invalidateOnUpdate(batchSummary)
+            rc = True
+            msg = "Batch {} Completed".format(batchNum)
+        except Neo4jError as e:
+            msg =  "Neo4j Error :{} - {}".format(repr(e), errSuffix)
+        except DriverError as e:
+            msg =  "Driver Error :{} - {}".format(repr(e), errSuffix)
+        except BaseException as e:
+            msg =   "Base Exception :{} - {}".format(repr(e), errSuffix) 
+        finally:
+            # a batch that didn't commit is rolled back when its transaction is closed
+            if not batchTx is None:
+                try:
+                    self.logScript('aTx.close()')
+                    batchTx.close()
+                except BaseException as e:
+                    self.logMsg("Error closing batch transaction - {}".format(repr(e)))
+            batchDict["rc"] = rc
+            if rc == False:
+                batchDict["error"] = msg
+            batchDict["endTime"] = datetime.datetime.now()
+            batchDict["elapsed"] = time.perf_counter() - startClock
+            return rc, msg, batchDict
+
+    def runCypherExplicit(self, cypherText, parmData=None, stream=False, readOnly=False, useCache=True):
         '''  run a cypher query in an explicit txn
             consume the entire result set
             leave the transaction open for possible further queries
+            if stream is True the result is not consumed.  forwardCursor will pull records from the server one chunk 
+            at a time and the transaction stays open until the end of the result is reached or closeCursor is called.
+            readOnly=True opens a READ session when autocommit is on, see genAccessMode.
+            readOnly results are saved in the query cache when autocommit is on, useCache=False always goes to the server.
         '''
-        
+        # a new query replaces any streaming cursor that is still open
+        if self.streaming == True:
+            self.closeCursor()
+            
+        # see if the result is already cached.  a cached result is paged thru by forwardCursor like any other result set
+        cacheable = readOnly == True and useCache == True and self.autoCommit == True
+        if cacheable == True:
+            entry = self.queryCache.get(cypherText=cypherText, parms=parmData)
+            if not entry is None:
+                self.chunkStart = 0
+                self.chunkEnd = 0    
+                self.endReached = False
+                self.prefetchChunk = None
+                return self.useCachedResult(entry, cypherText, parmData)
 
         # first create the driver  object if we haven't done that yet
         if self.myDriver is not None:
@@ -297,26 +535,44 @@ class NeoDriver():
             rc = False
             errSuffix = "Run Cypher Explicit Error"   
             
+            # the access mode belongs to the session so switch sessions if the mode changes between transactions
+            accessMode = self.genAccessMode(readOnly=readOnly, explicit=True)
+            if not self.session is None and self.sessionAccessMode != accessMode:
+                if self.tx is None or self.tx.closed() is True:
+                    self.logScript('aSession.close()')
+                    self.session.close()
+                    self.session = None
+                    self.tx = None
+                    
             # create a session if we don't have one
             if self.session is None:
-               self.logScript('aSession = aDriver.session()') 
-               self.session =  self.myDriver.session()
+               bookmarks = driverRegistry.bookmarks(self.myDriver)
+               self.logScript('aSession = aDriver.session(fetch_size={}, default_access_mode={}, bookmarks={})'.format(self.fetchSize, accessMode, bookmarks)) 
+               self.session =  driverRegistry.openSession(self.myDriver, fetch_size=self.fetchSize, default_access_mode=accessMode, bookmarks=bookmarks)
+               self.sessionAccessMode = accessMode
                self.logDriverStatus()
                
 
                 
             # get a new transaction if needed
+            self.cancelRequested = False
             self.getNewTransaction()
             
             # now run the query 
             self.chunkStart = 0
             self.chunkEnd = 0    
             self.endReached = False
+            self.resultSet = None
+            self.resultSummary = None
+            self.prefetchChunk = None
             self.cypherLogDict = {}
             self.cypherLogDict["error"] = ""
             self.cypherLogDict["offset"] = 0
             self.cypherLogDict["cypher"] = cypherText
+            self.cypherLogDict["parms"] = parmData
             self.cypherLogDict["startTime"] = datetime.datetime.now()    
+            self.startTiming()
+            self.cypherLogDict["runClock"] = time.perf_counter()
 
             if parmData is None:
                 self.logScript('aResult = aTx.run("{}")'.format(cypherText))
@@ -326,16 +582,29 @@ class NeoDriver():
                 self.logScript('aResult = aTx.run("{}",parameters="{}"'.format(cypherText, parmData))
                 self.result = self.tx.run(cypherText, parameters=parmData)
                 self.logDriverStatus()
+            self.resultKeys = list(self.result.keys())
                 
+            if stream == True:
+                # leave the result on the server, forwardCursor will fetch it a chunk at a time
+                self.cursorResult = self.result
+                self.cursorLogDict = self.cypherLogDict
+                self.streaming = True
+                # collect the rows as they are pulled so a fully read result can be cached
+                if cacheable == True and self.queryCache.enabled == True:
+                    self.cursorCacheRows = []
+                    self.cursorCacheKey = (cypherText, parmData, self.resultKeys)
+                else:
+                    self.cursorCacheRows = None
+                rc = True
+                msg = "Streaming Cursor Created"
+                return rc, msg
 
             # this consumes the entire result and saves it
 #            self.logScript('aResultSet = aResult.data()')
             self.logScript('self.resultSet = []')
             self.logScript('for rec in self.result:')
             self.logScript('    self.resultSet.append(rec)')
-            self.resultSet = []
-            for rec in self.result:
-                self.resultSet.append(rec)
+            self.resultSet = self.fetchRecords(self.result)
             self.logDriverStatus()
             
             # this gets the query stats
@@ -343,6 +612,9 @@ class NeoDriver():
             self.resultSummary = self.result.consume()
             self.logDriverStatus() 
             
+            if cacheable == True:
+                self.cacheResult(cypherText, parmData, self.resultSet, self.resultKeys)
+            
             # if autocommit is true then force a commit of this txn
             if self.autoCommit == True:
                 self.commitTxn()
@@ -359,6 +631,8 @@ class NeoDriver():
             self.cypherLogDict["endTime"] = datetime.datetime.now()
             # save query summary if present
             if not self.resultSummary is None:
+                self.saveSummaryTiming()
+                self.invalidateOnUpdate(self.resultSummary)
                 if not self.resultSummary.plan is None:
                     self.cypherLogDict["plan"] = self.resultSummary.plan
                 else:
@@ -389,11 +663,16 @@ class NeoDriver():
                         
                     self.logScript('aSession.close()') 
                     self.session.close()
+                    self.session = None
+                    self.sessionAccessMode = None
                     self.logDriverStatus()
                     
             return rc, msg  
 
     def forwardCursor(self, ):
+        if self.streaming == True:
+            return self.forwardStream()
+            
         ctr = 0
         self.cursorChunk = []
         self.endReached = False
@@ -427,18 +706,378 @@ class NeoDriver():
 #            print('resultLen:{} chunkStart:{} chunkEnd:{}'.format(str(len(self.resultSet)), self.chunkStart, self.chunkEnd))
             return ctr, msg         
             
+    def forwardStream(self, ):
+        '''
+            pull the next chunk of records from the live result of a streaming cursor.
+            when the end of the result is reached the cursor is closed.
+        '''
+        ctr = 0
+        self.cursorChunk = []
+        try:
+            errSuffix = "Error streaming rows"
+            if self.endReached == False:
+                # use the chunk that was prefetched if there is one
+                if self.prefetchChunk is None:
+                    self.cursorChunk, requested = self.pullChunk()
+                else:
+                    self.cursorChunk, requested = self.prefetchChunk, self.prefetchSize
+                    self.prefetchChunk = None
+                ctr = len(self.cursorChunk)
+                self.chunkEnd = self.chunkStart + ctr
+                self.chunkStart = self.chunkEnd
+                # peek only blocks if the driver has to fetch the next batch from the server
+                if ctr < requested or self.cursorResult.peek() is None:
+                    self.closeCursor(complete=True)
+            msg = "Fetch complete"
+        except Neo4jError as e:
+            msg =  "Neo4j Error :{} - {}".format(repr(e), errSuffix)
+            self.abortCursor()
+        except DriverError as e:
+            msg =  "Driver Error :{} - {}".format(repr(e), errSuffix)
+            self.abortCursor()
+        except BaseException as e:
+            msg =   "Base Exception :{} - {}".format(repr(e), errSuffix) 
+            self.abortCursor()
+        finally:
+            return ctr, msg         
+
+    def prefetchCursor(self, ):
+        '''
+            pull the next chunk of a streaming cursor ahead of time so the next forwardCursor doesn't wait on the server.
+            this is run on a NeoThread so the caller must not use this NeoDriver until the thread finishes.
+        '''
+        ctr = 0
+        try:
+            errSuffix = "Error prefetching rows"
+            if self.streaming == True and self.endReached == False and self.prefetchChunk is None:
+                self.prefetchChunk, self.prefetchSize = self.pullChunk()
+                ctr = len(self.prefetchChunk)
+            msg = "Prefetch complete"
+        except Neo4jError as e:
+            msg =  "Neo4j Error :{} - {}".format(repr(e), errSuffix)
+        except DriverError as e:
+            msg =  "Driver Error :{} - {}".format(repr(e), errSuffix)
+        except BaseException as e:
+            msg =   "Base Exception :{} - {}".format(repr(e), errSuffix) 
+        finally:
+            # if the prefetch failed then forwardCursor will try again and report the error
+            if ctr == 0:
+                self.prefetchChunk = None
+            return ctr, msg         
+
+    def useCachedResult(self, entry, cypherText, parms):
+        '''
+            make a cached result look like the query was just run
+        '''
+        self.cypherLogDict = {}
+        self.cypherLogDict["error"] = ""
+        self.cypherLogDict["startTime"] = datetime.datetime.now()  
+        self.cypherLogDict["offset"] = -1
+        self.cypherLogDict["cypher"] = cypherText
+        self.cypherLogDict["parms"] = parms
+        self.cypherLogDict["cached"] = True
+        self.startTiming()
+        self.cypherLogDict["rows"] = len(entry.resultSet)
+        self.resultSet = list(entry.resultSet)
+        self.resultKeys = list(entry.keys)
+        self.resultSummary = entry.resultSummary
+        if not self.resultSummary is None:
+            self.saveSummaryTiming()
+            self.stats = self.resultSummary.counters
+        else:
+            self.stats = None
+        self.cypherLogDict["endTime"] = datetime.datetime.now()
+        return True, "Query Completed (cached)"
+        
+    def cacheResult(self, cypherText, parms, resultSet, keys):
+        '''
+            save the result of a read only query and its column names unless the query turned out to update the graph
+        '''
+        if self.hasUpdates(self.resultSummary) == False:
+            self.queryCache.put(cypherText=cypherText, parms=parms, resultSet=resultSet, resultSummary=self.resultSummary, keys=keys)
+            
+    def hasUpdates(self, resultSummary):
+        '''
+            True if the query summary shows the graph or the schema was changed
+        '''
+        if resultSummary is None or resultSummary.counters is None:
+            return False
+        counters = resultSummary.counters
+        return getattr(counters, "contains_updates", False) == True or getattr(counters, "contains_system_updates", False) == True
+        
+    def invalidateOnUpdate(self, resultSummary):
+        '''
+            an update makes the cached results stale for every NeoDriver using the same connection slot and uri, not just this one
+        '''
+        if self.hasUpdates(resultSummary):
+            self.queryCache.invalidate()
+            driverRegistry.invalidateCaches(slot=self.neoDict.get("slot", ""), uri=self.genURI())
+        
+    def startTiming(self, ):
+        '''
+            add the per phase timing entries to cypherLogDict.
+            availableAfter and consumedAfter are reported by the server in milliseconds.
+            firstRecord is seconds from sending the query to receiving the first record, fetch is the seconds spent pulling records off the result.
+            materialize is the seconds the caller spends turning records into something it can display, the data grid adds to it.
+        '''
+        self.cypherLogDict["runClock"] = time.perf_counter()
+        self.cypherLogDict["availableAfter"] = None
+        self.cypherLogDict["consumedAfter"] = None
+        self.cypherLogDict["firstRecord"] = None
+        self.cypherLogDict["fetch"] = 0.0
+        self.cypherLogDict["materialize"] = 0.0
+        self.cypherLogDict["rows"] = 0
+        self.cypherLogDict["bytes"] = 0
+        
+    def fetchRecords(self, result, count=None, logDict=None):
+        '''
+            pull count records (or all of them if count is None) from result and add the row count, byte count and timings to logDict
+        '''
+        if logDict is None:
+            logDict = self.cypherLogDict
+        if count is None:
+            # a whole result set goes in a ResultBuffer which spills to disk once it gets too big to keep in memory
+            records = ResultBuffer(memoryLimit=self.resultMemoryLimit)
+        else:
+            records = []
+        # measuring a record means turning it into a string so only a sample of them are measured
+        sampleBytes = 0
+        samples = 0
+        startTime = time.perf_counter()
+        for rowNum, rec in enumerate(result if count is None else islice(result, count)):
+            if logDict.get("firstRecord", 0) is None:
+                logDict["firstRecord"] = time.perf_counter() - logDict["runClock"]
+            # stop pulling records the server already sent if the query has been cancelled
+            if self.cancelRequested == True:
+                if count is None:
+                    records.close()
+                raise queryCancelledError("Query Cancelled")
+            if count is None:
+                if rowNum % SIZESAMPLE == 0:
+                    sampleBytes = sampleBytes + self.recordBytes(rec)
+                    samples = samples + 1
+                records.append(rec, int(sampleBytes / samples))
+            else:
+                records.append(rec)
+        if count is None:
+            records.flush()
+            recordBytes = int(sampleBytes / samples * len(records)) if samples > 0 else 0
+        else:
+            # a chunk is estimated from its first record
+            recordBytes = self.recordBytes(records[0]) * len(records) if len(records) > 0 else 0
+        logDict["fetch"] = logDict.get("fetch", 0.0) + (time.perf_counter() - startTime)
+        logDict["rows"] = logDict.get("rows", 0) + len(records)
+        logDict["bytes"] = logDict.get("bytes", 0) + recordBytes
+        return records
+        
+    def recordBytes(self, record):
+        '''
+            estimate the size of a record from its string representation.  this is slow for big records so fetchRecords only calls it for a sample of them
+        '''
+        return len(str(record.values()))
+        
+    def saveSummaryTiming(self, logDict=None):
+        '''
+            save the server side timings from the result summary
+        '''
+        if logDict is None:
+            logDict = self.cypherLogDict
+        logDict["availableAfter"] = getattr(self.resultSummary, "result_available_after", None)
+        logDict["consumedAfter"] = getattr(self.resultSummary, "result_consumed_after", None)
+        
+    def pullChunk(self, ):
+        '''
+            pull up to chunkSize records from the live result.
+            returns the list of records and the chunk size that was requested.
+        '''
+        requested = self.chunkSize
+        startTime = time.perf_counter()
+        self.logScript('aChunk = list(islice(aResult, {}))'.format(requested))
+        chunk = self.fetchRecords(self.cursorResult, requested, logDict=self.cursorLogDict)
+        if not self.cursorCacheRows is None:
+            self.cursorCacheRows.extend(chunk)
+            # too big to cache so stop collecting
+            if len(self.cursorCacheRows) > self.queryCache.maxRows:
+                self.cursorCacheRows = None
+        self.adaptChunkSize(time.perf_counter() - startTime, chunk)
+        return chunk, requested
+        
+    def adaptChunkSize(self, elapsed, chunk):
+        '''
+            adjust chunkSize based on how long the last chunk took to pull and how big the records are.
+            the new size is halfway between the old size and the size that would hit the targets so it doesn't jump around.
+        '''
+        if self.adaptiveChunk == False or len(chunk) == 0:
+            return
+        perRecordTime = elapsed / len(chunk)
+        # estimate the record size from the first record in the chunk
+        perRecordBytes = max(self.recordBytes(chunk[0]), 1)
+        if perRecordTime > 0:
+            targetSize = min(self.targetChunkTime / perRecordTime, self.targetChunkBytes / perRecordBytes)
+        else:
+            targetSize = self.targetChunkBytes / perRecordBytes
+        newSize = int((self.chunkSize + targetSize) / 2)
+        self.chunkSize = max(self.minChunkSize, min(self.maxChunkSize, newSize))
+
+    def closeCursor(self, complete=False):
+        '''
+            finish a streaming cursor.  the rest of the result is discarded on the server, the summary is saved
+            and the transaction is committed if autocommit is on.
+            complete is True when every record has been pulled, the result can then be cached
+        '''
+        try:
+            rc = False
+            errSuffix = "Close Cursor Error"
+            if self.streaming == True:
+                self.streaming = False
+                self.endReached = True
+                self.prefetchChunk = None
+                self.logScript('aResultSummary = aResult.consume()')
+                self.resultSummary = self.cursorResult.consume()
+                self.cursorResult = None
+                self.saveSummaryTiming(logDict=self.cursorLogDict)
+                if complete == True and not self.cursorCacheRows is None:
+                    self.cacheResult(self.cursorCacheKey[0], self.cursorCacheKey[1], self.cursorCacheRows, self.cursorCacheKey[2])
+                self.cursorCacheRows = None
+                self.invalidateOnUpdate(self.resultSummary)
+                if not self.resultSummary.counters is None:
+                    self.stats = self.resultSummary.counters
+                else:
+                    self.stats  = None
+                self.logDriverStatus()
+                if self.autoCommit == True:
+                    rc, msg = self.commitTxn()
+                else:
+                    rc = True
+                    msg = "Cursor Closed"
+            else:
+                rc = True
+                msg = "no streaming cursor to close"
+        except Neo4jError as e:
+            msg =  "Neo4j Error :{} - {}".format(repr(e), errSuffix)
+        except DriverError as e:
+            msg =  "Driver Error :{} - {}".format(repr(e), errSuffix)
+        except BaseException as e:
+            msg =   "Base Exception :{} - {}".format(repr(e), errSuffix) 
+        finally:
+            if rc == False:
+                self.abortCursor()
+            self.logMsg(msg)
+            return rc, msg             
+
+    def abortCursor(self, ):
+        '''
+            a streaming cursor failed so roll back the transaction and get rid of the session
+        '''
+        self.streaming = False
+        self.endReached = True
+        self.cursorResult = None
+        self.prefetchChunk = None
+        self.cursorCacheRows = None
+        self.closeTxn()
+        if not self.session is None:
+            self.logScript('aSession.close()') 
+            self.session.close()
+            self.session = None
+            self.sessionAccessMode = None
+            self.logDriverStatus()
+            
+    def genQueryTag(self, ):
+        '''
+            generate the tag for the next transaction
+        '''
+        self.queryTag = "{}-{}".format(self.name, uuid.uuid4().hex)
+        return self.queryTag
+        
+    def txMetadata(self, ):
+        '''
+            the transaction metadata.  it shows up in dbms.listTransactions/SHOW TRANSACTIONS so the transaction can be found and terminated
+        '''
+        return {"app": "NodeEra", "queryTag": self.queryTag}
+        
+    def cancel(self, ):
+        '''
+            cancel the query this NeoDriver is running.  this is called from the gui thread while a NeoThread is running the query.
+            the transaction is found by its metadata tag and terminated on the server using a separate session on the shared driver,
+            the thread running the query then gets a transaction terminated error right away instead of waiting for the query to finish.
+        '''
+        self.cancelRequested = True
+        tag = self.queryTag
+        if tag is None or self.myDriver is None:
+            return False, "No query to cancel"
+            
+        errSuffix = "Cancel Query Error"
+        cancelSession = None
+        try:
+            rc = False
+            killed = 0
+            self.logScript('aSession = aDriver.session()')
+            cancelSession = driverRegistry.openSession(self.myDriver)
+            try:
+                cypher = '''CALL dbms.listTransactions() YIELD transactionId, metaData 
+                                WHERE metaData.queryTag = $tag 
+                                CALL dbms.killTransaction(transactionId) YIELD message 
+                                RETURN transactionId, message'''
+                killed = len(list(cancelSession.run(cypher, parameters={"tag": tag})))
+            except Neo4jError as e:
+                # newer versions of neo4j replaced the transaction procedures with SHOW/TERMINATE TRANSACTIONS
+                self.logMsg("listTransactions failed, trying SHOW TRANSACTIONS - {}".format(repr(e)))
+                cypher = "SHOW TRANSACTIONS YIELD transactionId, metaData WHERE metaData.queryTag = $tag RETURN transactionId"
+                txIds = [rec["transactionId"] for rec in cancelSession.run(cypher, parameters={"tag": tag})]
+                if len(txIds) > 0:
+                    cancelSession.run("TERMINATE TRANSACTIONS $txIds", parameters={"txIds": txIds}).consume()
+                killed = len(txIds)
+            rc = True
+            msg = "Query Cancelled - {} transaction(s) terminated".format(killed)
+        except Neo4jError as e:
+            msg =  "Neo4j Error :{} - {}".format(repr(e), errSuffix)
+        except DriverError as e:
+            msg =  "Driver Error :{} - {}".format(repr(e), errSuffix)
+        except BaseException as e:
+            msg =   "Base Exception :{} - {}".format(repr(e), errSuffix) 
+        finally:
+            if not cancelSession is None:
+                self.logScript('aSession.close()')
+                cancelSession.close()
+            self.logMsg(msg)
+            return rc, msg
+            
+    def genAccessMode(self, readOnly=False, explicit=False):
+        '''
+            return the session access mode for a query.
+            an explicit transaction with autocommit off may go on to run updates so it always gets a WRITE session
+        '''
+        if readOnly == True and (explicit == False or self.autoCommit == True):
+            return READ_ACCESS
+        return WRITE_ACCESS
+        
+    def genURI(self, ):
+        '''
+            return the uri for the connection.  
+            the neo4j:// scheme routes queries across a causal cluster, bolt:// connects directly to one server
+        '''
+        conType = self.neoDict.get("conType", "bolt")
+        # bolt+routing is the 3.x name for the neo4j routing scheme
+        if conType in ("neo4j", "bolt+routing"):
+            scheme = "neo4j"
+        else:
+            scheme = "bolt"
+        return "{}://{}:{}".format(scheme, self.neoDict["host"], self.neoDict["port"])
+        
     def getNewTransaction(self, ):
         # create a new transaction if needed
         if self.tx is None:
             self.logScript('aTx = aSession.begin_transaction()')
-            self.tx = self.session.begin_transaction()
+            self.genQueryTag()
+            self.tx = self.session.begin_transaction(metadata=self.txMetadata())
             self.logDriverStatus()
             
             self.logMsg("Start first txn - AutoCommit = {}".format(self.autoCommit))
         else:
             if self.tx.closed() is True:
                 self.logScript('aTx = aSession.begin_transaction()')
-                self.tx = self.session.begin_transaction()
+                self.genQueryTag()
+                self.tx = self.session.begin_transaction(metadata=self.txMetadata())
                 self.logDriverStatus()
                 
                 self.logMsg("Start another txn - AutoCommit = {}".format(self.autoCommit))
@@ -452,11 +1091,15 @@ class NeoDriver():
         try:
             rc = False
             errSuffix = "Commit Error"
+            # ending the transaction ends any streaming cursor running in it
+            self.streaming = False
             if not self.tx is None:
                 if not self.tx.closed():
                     self.logScript('aTx.commit()')
                     self.tx.commit()
                     self.logDriverStatus()
+                    if self.sessionAccessMode == WRITE_ACCESS:
+                        driverRegistry.saveBookmark(self.myDriver, self.session)
                     
                     rc = True 
                     msg = "Transaction Committed"
@@ -484,6 +1127,8 @@ class NeoDriver():
         try:
             rc = False
             errSuffix = "Txn Close Error"
+            # ending the transaction ends any streaming cursor running in it
+            self.streaming = False
             if not self.tx is None:
                 if not self.tx.closed():
                     self.logScript('aTx.close() # implied rollback')
@@ -517,6 +1162,8 @@ class NeoDriver():
         try:
             rc = False
             errSuffix = "RollBack Error"
+            # ending the transaction ends any streaming cursor running in it
+            self.streaming = False
             if not self.tx is None:
                 if not self.tx.closed():
                     self.logScript('aTx.rollback()')
@@ -549,12 +1196,13 @@ class NeoDriver():
                 rc = False
                 errSuffix = "Driver Object Error"
                 # get the keyword parameters from the necon dictionary
-                uri = "bolt://{}:{}".format(self.neoDict["host"], self.neoDict["port"])
+                uri = self.genURI()
                 # create a base driver graphdatabase object, this verifies connectivity and authentication and will produce usable error messages if anything is wrong.
                 self.myDriver = None
                 pw = self.helper.getText(self.neoDict['password'])
                 self.logScript('aDriver = GraphDatabase.driver({},auth=({},{})'.format(uri, self.neoDict['userid'], pw))
-                self.myDriver = GraphDatabase.driver(uri,auth=(self.neoDict['userid'], pw))
+                # get the shared driver for this connection from the registry
+                self.myDriver = driverRegistry.acquireDriver(neoCon=self, uri=uri, userid=self.neoDict['userid'], password=pw)
                 self.logDriverStatus()
                 
                 rc = True 
@@ -576,13 +1224,31 @@ class NeoDriver():
             return rc, msg             
             
 
+    def close(self, ):
+        '''
+            end any open cursor or transaction and give the shared driver back to the registry.
+            the driver itself stays open for the other NeoDriver objects using the same connection
+        '''
+        if self.streaming == True:
+            self.closeCursor()
+        if not self.tx is None:
+            self.closeTxn()
+        if not self.session is None:
+            self.session.close()
+            self.session = None
+        if not self.myDriver is None:
+            driverRegistry.releaseDriver(neoCon=self)
+            self.myDriver = None
+        # updates made while this NeoDriver isn't registered with a driver aren't seen so drop the cached results
+        self.queryCache.invalidate()
+
     def test(self):
         # test the connection to see if it is working
         # this will create a new driver object if none has been created or it will use the existing driver
         try:
             rc = False
             errSuffix = "Test Neo4j Connection: {}".format(self.name)
-            rc, msg = self.runCypherAuto("match (n) return n limit 1")
+            rc, msg = self.runCypherAuto("match (n) return n limit 1", readOnly=True, useCache=False)
             if rc == True:
                 msg = "Connection Successful: {}".format(self.name)
         except Neo4jError as e:
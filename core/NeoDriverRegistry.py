@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+The NeoDriverRegistry class shares neo4j driver objects (and their connection pools) across all NeoDriver instances.
+Every NeoDriver that connects to the same connection slot, host, port and user gets the same driver object.
+
+    Author: John Singer
+
+Copyright 2018-2020 SingerLinks Consulting LLC
+
+This file is part of NodeEra.
+
+NodeEra is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+NodeEra is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with NodeEra. If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+import datetime
+import hashlib
+import logging
+import threading
+import weakref
+
+from neo4j import GraphDatabase
+
+from PyQt5.QtCore import QSettings
+
+class DriverEntry():
+    '''
+    one shared driver object and the facts about how it is being used
+    '''
+    def __init__(self, key=None, uri=None, driver=None):
+        self.key = key
+        self.uri = uri
+        self.driver = driver
+        # the NeoDriver objects currently using this driver.  NeoDriver objects that are garbage collected drop out automatically
+        self.users = weakref.WeakSet()
+        self.created = datetime.datetime.now()
+        self.lastUsed = self.created
+        self.sessionsOpened = 0
+        self.acquireCount = 0
+        # the bookmark of the last transaction committed in a WRITE session.  later sessions wait for it so a read replica doesn't return data from before the update
+        self.bookmark = None
+
+    def touch(self, ):
+        self.lastUsed = datetime.datetime.now()
+
+    def idleSeconds(self, ):
+        return (datetime.datetime.now() - self.lastUsed).total_seconds()
+
+#############################################################################
+# process wide registry of neo4j driver objects
+#############################################################################
+class NeoDriverRegistry():
+
+    def __init__(self, ):
+        # driver objects are shared across threads (NeoThread) so all changes to the registry are locked
+        self.lock = threading.RLock()
+        # registry key -> DriverEntry
+        self.entries = {}
+
+    def logMsg(self, msg):
+        if logging:
+            logging.info(msg)
+
+    def settingValue(self, key, default):
+        # the registry is created at import time, before the application name is set, so get a fresh QSettings each time
+        return QSettings().value(key, default)
+
+    def maxPoolSize(self, ):
+        '''maximum number of bolt connections held by one shared driver'''
+        return int(self.settingValue("Default/PoolMaxSize", "10"))
+
+    def idleTimeout(self, ):
+        '''number of seconds a driver with no users is kept before it is closed'''
+        return int(self.settingValue("Default/PoolIdleTimeout", "300"))
+
+    def maxConnectionLifetime(self, ):
+        '''number of seconds a bolt connection is kept in the pool before it is replaced'''
+        return int(self.settingValue("Default/PoolMaxLifetime", "3600"))
+
+    def genKey(self, neoDict=None, uri=None, password=None):
+        '''
+        the registry key is the connection slot, host, port and user.
+        the uri and a hash of the password are included so an edited connection never gets a driver built for the old settings
+        '''
+        pwHash = hashlib.sha256(str(password).encode("utf-8")).hexdigest()
+        return (neoDict.get("slot", ""), neoDict.get("host", ""), str(neoDict.get("port", "")), neoDict.get("userid", ""), uri, pwHash)
+
+    def acquireDriver(self, neoCon=None, uri=None, userid=None, password=None):
+        '''
+        return the shared driver for the NeoDriver neoCon, creating it if needed
+        '''
+        with self.lock:
+            self.reapIdle()
+            key = self.genKey(neoDict=neoCon.neoDict, uri=uri, password=password)
+            entry = self.entries.get(key, None)
+            if entry is None:
+                # the 4.x driver can't close idle connections in a pool that is in use.  max_connection_lifetime retires old connections
+                # when they are next acquired and keep_alive has the os notice connections the server or a firewall has dropped
+                driver = GraphDatabase.driver(uri, auth=(userid, password),
+                                                            max_connection_pool_size=self.maxPoolSize(),
+                                                            max_connection_lifetime=self.maxConnectionLifetime(),
+                                                            keep_alive=True)
+                entry = DriverEntry(key=key, uri=uri, driver=driver)
+                self.entries[key] = entry
+                self.logMsg("Shared driver created for {} - {}".format(neoCon.neoDict.get("slot", ""), uri))
+            entry.users.add(neoCon)
+            entry.acquireCount = entry.acquireCount + 1
+            entry.touch()
+            return entry.driver
+
+    def releaseDriver(self, neoCon=None):
+        '''
+        the NeoDriver neoCon is done with its driver.  the driver stays open for other users until it is reaped
+        '''
+        with self.lock:
+            for entry in self.entries.values():
+                if neoCon in entry.users:
+                    entry.users.discard(neoCon)
+                    entry.touch()
+            self.reapIdle()
+
+    def openSession(self, driver=None, **config):
+        '''
+        open a session on a shared driver and count it in the pool statistics
+        '''
+        with self.lock:
+            for entry in self.entries.values():
+                if entry.driver is driver:
+                    entry.sessionsOpened = entry.sessionsOpened + 1
+                    entry.touch()
+                    break
+        return driver.session(**config)
+
+    def invalidateCaches(self, slot=None, uri=None):
+        '''
+        clear the query cache of every NeoDriver using a driver for this connection slot and uri.  called when any of them updates the graph
+        '''
+        with self.lock:
+            users = [neoCon for entry in self.entries.values() if entry.key[0] == slot and entry.uri == uri for neoCon in entry.users]
+        for neoCon in users:
+            neoCon.queryCache.invalidate()
+
+    def findEntry(self, driver):
+        for entry in self.entries.values():
+            if entry.driver is driver:
+                return entry
+        return None
+
+    def saveBookmark(self, driver=None, session=None):
+        '''
+        keep the bookmark of the last transaction committed in a WRITE session on a shared driver
+        '''
+        try:
+            bookmark = session.last_bookmark()
+        except BaseException as e:
+            self.logMsg("Error getting session bookmark - {}".format(repr(e)))
+            return
+        if bookmark is None:
+            return
+        with self.lock:
+            entry = self.findEntry(driver)
+            if not entry is None:
+                entry.bookmark = bookmark
+
+    def bookmarks(self, driver=None):
+        '''
+        return the bookmarks a new session on a shared driver should wait for or None
+        '''
+        with self.lock:
+            entry = self.findEntry(driver)
+            if entry is None or entry.bookmark is None:
+                return None
+            return [entry.bookmark]
+
+    def reapIdle(self, ):
+        '''
+        close drivers that have no users and haven't been used in idleTimeout seconds.
+        this only closes whole drivers, idle connections in the pool of a driver that is still in use are left to the driver, see acquireDriver
+        '''
+        with self.lock:
+            timeout = self.idleTimeout()
+            for key in list(self.entries.keys()):
+                entry = self.entries[key]
+                if len(entry.users) == 0 and entry.idleSeconds() >= timeout:
+                    self.closeEntry(key)
+
+    def closeEntry(self, key):
+        entry = self.entries.pop(key, None)
+        if not entry is None:
+            try:
+                entry.driver.close()
+            except BaseException as e:
+                self.logMsg("Error closing shared driver {} - {}".format(entry.uri, repr(e)))
+            self.logMsg("Shared driver closed for {} - {}".format(key[0], entry.uri))
+
+    def closeAll(self, ):
+        '''
+        close every shared driver.  called when the application exits
+        '''
+        with self.lock:
+            for key in list(self.entries.keys()):
+                self.closeEntry(key)
+
+    def poolStats(self, ):
+        '''
+        return a list of dictionaries that describe each shared driver
+        '''
+        statList = []
+        with self.lock:
+            for entry in self.entries.values():
+                stats = {}
+                stats["slot"] = entry.key[0]
+                stats["host"] = entry.key[1]
+                stats["port"] = entry.key[2]
+                stats["userid"] = entry.key[3]
+                stats["URL"] = entry.uri
+                stats["users"] = len(entry.users)
+                stats["acquireCount"] = entry.acquireCount
+                stats["sessionsOpened"] = entry.sessionsOpened
+                stats["created"] = entry.created
+                stats["lastUsed"] = entry.lastUsed
+                stats["idleSeconds"] = entry.idleSeconds()
+                stats["maxPoolSize"] = self.maxPoolSize()
+                statList.append(stats)
+        return statList
+
+# the one registry used by every NeoDriver in the process
+driverRegistry = NeoDriverRegistry()
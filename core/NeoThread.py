@@ -20,31 +20,69 @@ from PyQt5.QtCore import QThread, pyqtSignal
 class NeoThread(QThread):
     '''
     This class provides a thread that is used to call the  neoDriver runCypherExplicit function
+    mode "cursor" consumes the entire result, mode "stream" leaves the result on the server for forwardCursor to page thru
+    mode "prefetch" pulls the next chunk of a streaming cursor in the background
+    each NeoThread should have its own NeoDriver, NeoThreads with different NeoDrivers run their queries at the same time on the shared driver.
+    cancel terminates the query on the server so the thread finishes right away.
     '''
     neoCallComplete = pyqtSignal(bool, str)
     
-    def __init__(self, neoCon=None, cypher=None, mode=None, parmData=None):
+    def __init__(self, neoCon=None, cypher=None, mode=None, parmData=None, chunkConverter=None, readOnly=False):
         QThread.__init__(self)
 #        print("NeoThread init")
         self.neoCon = neoCon
         self.cypher = cypher
         self.parmData = parmData
         self.mode = mode
+        # readOnly queries can be routed to a follower or read replica
+        self.readOnly = readOnly
+        # prefetch mode - optional function that converts the prefetched records into grid ready rows
+        self.chunkConverter = chunkConverter
+        self.chunk = None
+        self.convertedChunk = None
         
         
+    def cancel(self, waitTime=5000):
+        '''
+        cancel the query this thread is running and wait up to waitTime milliseconds for the thread to finish
+        '''
+        rc = True
+        msg = "Thread not running"
+        if self.isRunning():
+            rc, msg = self.neoCon.cancel()
+            self.wait(waitTime)
+        return rc, msg
+        
     def run(self, ):
 #        print("NeoThread Run")
         if self.mode == "cursor":
             if self.parmData is None:
-                rc, msg = self.neoCon.runCypherExplicit(self.cypher)
+                rc, msg = self.neoCon.runCypherExplicit(self.cypher, readOnly=self.readOnly)
                 self.neoCallComplete.emit(rc, msg)
             else:
 #                print("cypher:{} parms:{}".format(self.cypher, self.parmData))
-                rc, msg = self.neoCon.runCypherExplicit(self.cypher, parmData = self.parmData)
+                rc, msg = self.neoCon.runCypherExplicit(self.cypher, parmData = self.parmData, readOnly=self.readOnly)
                 self.neoCallComplete.emit(rc, msg)
                 
+        elif self.mode == "stream":
+            rc, msg = self.neoCon.runCypherExplicit(self.cypher, parmData = self.parmData, stream=True, readOnly=self.readOnly)
+            self.neoCallComplete.emit(rc, msg)
+                
+        elif self.mode == "prefetch":
+            rc = True
+            ctr, msg = self.neoCon.prefetchCursor()
+            self.chunk = self.neoCon.prefetchChunk
+            if not self.chunk is None and not self.chunkConverter is None:
+                try:
+                    self.convertedChunk = self.chunkConverter(self.chunk)
+                except BaseException as e:
+                    # the grid will convert the chunk itself
+                    self.neoCon.logMsg("Prefetch chunk conversion failed - {}".format(repr(e)))
+                    self.convertedChunk = None
+            self.neoCallComplete.emit(rc, msg)
+            
         elif self.mode == "query":
-            rc, msg = self.neoCon.runCypherAuto(self.cypher)
+            rc, msg = self.neoCon.runCypherAuto(self.cypher, self.parmData, readOnly=self.readOnly)
             self.neoCallComplete.emit(rc, msg)
         else:
             rc = False
@@ -124,6 +124,55 @@ class NeoTypeFunc():
         
         return setEqualTo
         
+    def genPropParm(self, dataValue=None, neoType=None, parmName=None):
+        '''
+        return the cypher expression that sets a property equal to the parameter parmName and the value to pass for that parameter.
+        the value never appears in the cypher text so the same statement is reused for every value and nothing needs to be escaped.
+        '''
+        parm = "${}".format(parmName)
+        # a value that doesn't convert to its datatype is reported as a ValueError the caller can show to the user
+        try:
+            if neoType == DataType.STRING.value:
+                return parm, str(dataValue)
+            elif neoType == DataType.INT.value:
+                return parm, int(dataValue)
+            elif neoType == DataType.FLOAT.value:
+                return parm, float(dataValue)
+            elif neoType == DataType.BOOLEAN.value:
+                return "toBoolean({})".format(parm), str(dataValue)
+            elif neoType == ( DataType.DATE.value):
+                return "date({})".format(parm), str(dataValue)
+            elif neoType == ( DataType.DATETIME.value):
+                return "datetime({})".format(parm), str(dataValue)
+            elif neoType == ( DataType.DURATION.value):
+                return "duration({})".format(parm), str(dataValue)
+            elif neoType == ( DataType.TIME.value):
+                return "time({})".format(parm), str(dataValue)
+            elif neoType == ( DataType.LOCALTIME.value):
+                return "localtime({})".format(parm), str(dataValue)
+            elif neoType == ( DataType.LOCALDATETIME.value):
+                return "localdatetime({})".format(parm), str(dataValue)
+            elif neoType == DataType.POINTCARTESIAN.value:
+                start = dataValue.find("(")  
+                end = dataValue.find(")")
+                data = dataValue[start+1:end].strip().split(" ")
+                pointMap = {"x": float(data[0]), "y": float(data[1])}
+                if len(data) > 2:
+                    pointMap["z"] = float(data[2])
+                return "point({})".format(parm), pointMap
+            elif neoType == DataType.POINTWGS84.value:
+                start = dataValue.find("(")  
+                end = dataValue.find(")")
+                data = dataValue[start+1:end].strip().split(" ")
+                pointMap = {"longitude": float(data[0]), "latitude": float(data[1])}
+                if len(data) > 2:
+                    pointMap["height"] = float(data[2])
+                return "point({})".format(parm), pointMap
+            else:
+                return "", None
+        except (ValueError, IndexError):
+            raise ValueError("[{}] is not a valid {} value".format(dataValue, neoType))
+        
     def convertTypeToString(self, dataValue):
         '''
         converts a python value of a given datatype to it's string value
@@ -133,8 +133,8 @@ class NodeInstance():
             self.logMsg("The Node does not exist in the database.  Cannot delete.")
             return True, "No Node to delete."
         # delete the node based on the neoID    
-        cypher = "match (n) where id(n) = " + str(self.neoID) + " detach delete n"
-        rc, msg = self.neoCon.runCypherAuto(cypher)
+        cypher = "match (n) where id(n) = $nodeID detach delete n"
+        rc, msg = self.neoCon.runCypherAuto(cypher, {"nodeID": self.neoID})
         self.logMsg(msg)
         return rc, msg  
 
@@ -152,8 +152,8 @@ class NodeInstance():
             return rc, msg
         
         # see if the node still exists in the db based on the node id
-        cypher = "match (n) where id(n) = {} return n".format(str(self.neoID)) 
-        rc, msg = self.neoCon.runCypherExplicit(cypher)
+        cypher = "match (n) where id(n) = $nodeID return n"
+        rc, msg = self.neoCon.runCypherExplicit(cypher, parmData={"nodeID": self.neoID})
         if rc is False:
             self.logMsg(msg)
             msg = "Error Querying Graph."     
@@ -251,8 +251,8 @@ class NodeInstance():
             rc, msg = self.createBlankNode() 
             return rc, msg
         # try to retrieve the node based on the neoID    
-        cypher = "match (n) where id(n) = " + str(self.neoID) + " return n"
-        rc, msg = self.neoCon.runCypherExplicit(cypher)
+        cypher = "match (n) where id(n) = $nodeID return n"
+        rc, msg = self.neoCon.runCypherExplicit(cypher, parmData={"nodeID": self.neoID})
         if rc is False:
             self.logMsg(msg)
             return rc, msg   
@@ -279,6 +279,7 @@ class NodeInstance():
             if not firstRec is None:
                 self.neoID =  firstRec["id(n)"]
                 self.nodeInstanceDict["neoID"] = self.neoID
+                self.model.reindexInstance("Instance Node", self.nodeInstanceDict)
                 self.node = firstRec["n"]
             else:
                 self.logMsg(msg)
@@ -293,9 +294,14 @@ class NodeInstance():
         rc, msg = self.getNode()
         if rc is True:
             # now update the node in the neo4j instance
-            updateCypher = self.helper.genUpdateCypher(neoID = self.neoID, nodeInstanceDict = self.getObjectDict(),  node = self.node)
+            try:
+                updateCypher, updateParms = self.helper.genUpdateCypher(neoID = self.neoID, nodeInstanceDict = self.getObjectDict(),  node = self.node)
+            except ValueError as e:
+                msg = "Sync Node [{}] error - {}".format(self.NZID, str(e))
+                self.logMsg(msg)
+                return False, msg
 #            print("syncToDB {}".format(updateCypher))
-            rc, msg = self.neoCon.runCypherAuto(updateCypher)
+            rc, msg = self.neoCon.runCypherAuto(updateCypher, updateParms)
             return rc, msg
         else:
             return rc, msg
@@ -320,6 +326,7 @@ class NodeInstance():
             self.nodeInstanceDict["labels"] = lbls
             self.nodeInstanceDict["properties"] = props
             self.genNodeSignature(self.nodeInstanceDict)
+            self.model.reindexInstance("Instance Node", self.nodeInstanceDict)
             return True, "Instance Node Synced"
         else:
             return False, "Error syncing Instance Node"
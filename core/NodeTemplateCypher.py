@@ -57,9 +57,10 @@ class NodeTemplateCypher():
             if model.headerData(header, Qt.Horizontal, Qt.DisplayRole) == "nodeID":
                 self.nodeID = model.item(row,header).data(Qt.EditRole)
 
-        cypher = 'match (n)  \n where id(n) = {}  \n detach delete n'.format(self.nodeID)
+        cypher = 'match (n)  \n where id(n) = $nodeID  \n detach delete n'
+        parms = {"nodeID": self.nodeID}
          
-        return cypher
+        return cypher, parms
 
     def genUpdateLabel(self, updateIndex=None, dataGrid=None):
         model = dataGrid.model()
@@ -77,15 +78,16 @@ class NodeTemplateCypher():
         # get the label name
         self.updateLabel = model.headerData(updateIndex.column(), Qt.Horizontal, Qt.DisplayRole)
             
-        p1 = self.nodeID
         p2 = self.operation
         p3 = self.updateLabel
-        cypher = 'match (n) \n where id(n) = {}  \n {} n:{} '.format(p1, p2, p3)
+        cypher = 'match (n) \n where id(n) = $nodeID  \n {} n:{} '.format(p2, p3)
+        parms = {"nodeID": self.nodeID}
         
-        return cypher     
+        return cypher, parms
         
     def genUpdateProp(self, updateIndex=None, dataGrid=None):
         cypher = ""
+        parms = {}
         rc = True
         model = dataGrid.model()
         self.nodeID = None
@@ -94,7 +96,7 @@ class NodeTemplateCypher():
             if model.headerData(header, Qt.Horizontal, Qt.DisplayRole) == "nodeID":
                 self.nodeID = model.item(updateIndex.row(),header).data(Qt.EditRole)
         if self.nodeID is None:
-            return False, "Node ID not found."
+            return False, "Node ID not found.", parms
         
         try:
             # get the new data value which is a string
@@ -109,29 +111,30 @@ class NodeTemplateCypher():
                 rc = False
             else:
                 # generate the correct syntax that you set the property equal to
-                self.setEqualTo = self.helper.genPropEqualTo(dataValue=self.updateData, neoType = neoType)
-                p1 = self.nodeID
+                self.setEqualTo, propValue = self.helper.genPropParm(dataValue=self.updateData, neoType = neoType, parmName="propValue")
                 p2 = self.updateProp
                 p3 = self.setEqualTo
-                cypher = "match (n) \n where id(n) = {}  \n set n.{} = {} ".format(p1, p2, p3)
+                cypher = "match (n) \n where id(n) = $nodeID  \n set n.{} = {} ".format(p2, p3)
+                parms = {"nodeID": self.nodeID, "propValue": propValue}
                 rc = True
         except BaseException as e:
             # something went wrong
             cypher = "Error generating cypher: {}".format(repr(e))
             rc = False
         finally:
-            return rc, cypher
+            return rc, cypher, parms
             
     def genRemoveProp(self, updateIndex=None, dataGrid=None):
         model = dataGrid.model()
         cypher = None
+        parms = None
         self.nodeID = None
         # get the nodeID
         for header in range(model.columnCount()):
             if model.headerData(header, Qt.Horizontal, Qt.DisplayRole) == "nodeID":
                 self.nodeID = model.item(updateIndex.row(),header).data(Qt.EditRole)
         if self.nodeID is None:
-            return cypher
+            return cypher, parms
             
         # get the property name
         self.updateProp = model.headerData(updateIndex.column(), Qt.Horizontal, Qt.DisplayRole)
@@ -139,17 +142,18 @@ class NodeTemplateCypher():
         for prop in self.templateDict["properties"]:
             if prop[PROPERTY] == self.updateProp:
                 if prop[PROPREQ] != Qt.Checked:
-                    p1 = self.nodeID
                     p2 = self.updateProp
-                    cypher = "match (n) \n where id(n) = {}  \n remove n.{} ".format(p1, p2)
+                    cypher = "match (n) \n where id(n) = $nodeID  \n remove n.{} ".format(p2)
+                    parms = {"nodeID": self.nodeID}
                 else:
                     self.helper.displayErrMsg("Set Null", "Property {} is required by the Node Template. Cannot remove this property.".format(self.updateProp))
-        return cypher      
+        return cypher, parms
             
     def genNewNode(self):
         nodeName = "n"
+        parms = {}
         p1 = self.genWhereLabelList(nodeName)
-        p11 = self.genSetPropList(nodeName)
+        p11 = self.genSetPropList(nodeName, parms)
         p2 = " id(" + nodeName +  ") as nodeID "
         p3 = self.genReturnLblList(nodeName)
         p4 = self.genReturnPropList(nodeName)
@@ -163,7 +167,7 @@ class NodeTemplateCypher():
         cypher = 'create ({}) \n {} \n return  {} \n {} \n {} '.format(
                     p1, p11, p2, p3, p4
                     )
-        return cypher    
+        return cypher, parms
 
     def genMatchReturnNodeOnly(self):
         nodeName = "n"
@@ -246,15 +250,16 @@ class NodeTemplateCypher():
         lblList = ",".join(nodeName + ":" + x[LABEL]  + " as " + x[LABEL] for x in self.templateDict["labels"] )
         return lblList
         
-    def genSetPropList(self, nodeName):
-        'return a set statement for each property that has a default value (i.e. required)'
+    def genSetPropList(self, nodeName, parms):
+        'return a set statement for each property that has a default value (i.e. required).  the default values are added to parms'
         setPropList = []
         if not self.templateDict is None:
             for prop in self.templateDict["properties"]:
                 # if the property has a default value then generate the set statement.
                 if prop[PROPDEF] != "":
                     # generate the correct syntax that you set the property equal to
-                    setEqualTo = self.helper.genPropEqualTo(dataValue=prop[PROPDEF], neoType = prop[DATATYPE])
+                    parmName = "{}_p{}".format(nodeName, len(setPropList))
+                    setEqualTo, parms[parmName] = self.helper.genPropParm(dataValue=prop[PROPDEF], neoType = prop[DATATYPE], parmName=parmName)
                     setPropList.append("set {}.{} = {}".format(nodeName, prop[PROPERTY], setEqualTo))
         setProps = " \n ".join(setProp for setProp in setPropList)
         return setProps
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+The QueryCache class holds the results of read only queries run by a NeoDriver so the same query doesn't go back to the server.
+Entries expire after a time to live, the least recently used entry is dropped when the cache is full,
+and the NeoDriver clears the cache whenever it runs a query that updates the graph.
+
+    Author: John Singer
+
+Copyright 2018-2020 SingerLinks Consulting LLC
+
+This file is part of NodeEra.
+
+NodeEra is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+NodeEra is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with NodeEra. If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+class CacheEntry():
+    '''
+    the saved result of one query
+    '''
+    def __init__(self, resultSet=None, resultSummary=None, keys=None):
+        self.resultSet = resultSet
+        self.resultSummary = resultSummary
+        self.keys = keys            # the column names of the result
+        self.created = time.monotonic()
+        self.hits = 0
+
+    def age(self, ):
+        return time.monotonic() - self.created
+
+class QueryCache():
+
+    def __init__(self, enabled=False, maxEntries=100, ttl=60, maxRows=10000):
+        # the cache is filled from NeoThread's as well as the gui thread
+        self.lock = threading.RLock()
+        self.enabled = enabled
+        self.maxEntries = maxEntries        # number of query results kept
+        self.ttl = ttl                                  # number of seconds a result is good for
+        self.maxRows = maxRows                # results with more rows than this are not cached
+        # key -> CacheEntry, in least recently used order
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def genKey(self, cypherText=None, parms=None):
+        '''
+        the key is the query text with the white space normalized plus the parameters
+        '''
+        normalText = re.sub(r"\s+", " ", cypherText).strip()
+        if parms:
+            parmKey = repr(sorted(parms.items(), key=lambda item: item[0]))
+        else:
+            parmKey = ""
+        return (normalText, parmKey)
+
+    def get(self, cypherText=None, parms=None):
+        '''
+        return the CacheEntry for the query or None if it isn't cached or has expired
+        '''
+        if self.enabled == False:
+            return None
+        key = self.genKey(cypherText=cypherText, parms=parms)
+        with self.lock:
+            entry = self.entries.get(key, None)
+            if not entry is None and entry.age() > self.ttl:
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses = self.misses + 1
+                return None
+            self.entries.move_to_end(key)
+            entry.hits = entry.hits + 1
+            self.hits = self.hits + 1
+            return entry
+
+    def put(self, cypherText=None, parms=None, resultSet=None, resultSummary=None, keys=None):
+        '''
+        save the result of a query.  returns True if the result was cached
+        '''
+        if self.enabled == False or resultSet is None or len(resultSet) > self.maxRows:
+            return False
+        key = self.genKey(cypherText=cypherText, parms=parms)
+        with self.lock:
+            self.entries[key] = CacheEntry(resultSet=list(resultSet), resultSummary=resultSummary, keys=list(keys or []))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxEntries:
+                self.entries.popitem(last=False)
+        return True
+
+    def invalidate(self, ):
+        '''
+        drop every cached result.  called when a query updates the graph
+        '''
+        with self.lock:
+            if len(self.entries) > 0:
+                self.invalidations = self.invalidations + 1
+            self.entries.clear()
+
+    def cacheStats(self, ):
+        '''
+        return a dictionary that describes how the cache is doing
+        '''
+        with self.lock:
+            stats = {}
+            stats["enabled"] = self.enabled
+            stats["entries"] = len(self.entries)
+            stats["maxEntries"] = self.maxEntries
+            stats["ttl"] = self.ttl
+            stats["hits"] = self.hits
+            stats["misses"] = self.misses
+            stats["invalidations"] = self.invalidations
+            return stats
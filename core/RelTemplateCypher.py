@@ -51,6 +51,8 @@ class RelTemplateCypher():
 
     def genDeleteDetach(self, row=None, dataGrid=None):
         model = dataGrid.model()
+        cypher = None
+        parms = None
         # get the relID
         self.relID = None
         for header in range(model.columnCount()):
@@ -58,17 +60,18 @@ class RelTemplateCypher():
                 self.relID = model.item(row,header).data(Qt.EditRole)
         
         if not self.relID is None:
-            p1 = self.relID
             cypher = " ".join(["match (f)-[r]->(t) \n", 
-                                      "where id(r) = {} \n", 
+                                      "where id(r) = $relID \n", 
                                       "delete r"
-                                    ]).format(p1)
+                                    ])
+            parms = {"relID": self.relID}
          
-        return cypher
+        return cypher, parms
 
        
     def genUpdateProp(self, updateIndex=None, dataGrid=None):
         cypher = ""
+        parms = {}
         rc = True        
         model = dataGrid.model()
         # get the RELATIONSHIP ID
@@ -78,7 +81,7 @@ class RelTemplateCypher():
                 self.relID = model.item(updateIndex.row(),header).data(Qt.EditRole)
         
         if self.relID is None:
-            return False, "Relationship ID not found."
+            return False, "Relationship ID not found.", parms
         
         try:
             self.updateData = model.item(updateIndex.row(),updateIndex.column()).data(Qt.EditRole)
@@ -91,15 +94,15 @@ class RelTemplateCypher():
                 rc = False
             else:
                 # generate the correct syntax that you set the property equal to
-                self.setEqualTo = self.helper.genPropEqualTo(dataValue=self.updateData, neoType = neoType)
-                p1 = self.relID
+                self.setEqualTo, propValue = self.helper.genPropParm(dataValue=self.updateData, neoType = neoType, parmName="propValue")
                 p2 = self.updateProp
                 p3 = self.setEqualTo
                 
                 cypher = " ".join(["match (f)-[r]->(t) \n", 
-                                          "where id(r) = {} \n", 
+                                          "where id(r) = $relID \n", 
                                           "set r.{} = {}"
-                                        ]).format(p1, p2, p3)
+                                        ]).format(p2, p3)
+                parms = {"relID": self.relID, "propValue": propValue}
                 rc = True
                 
         except BaseException as e:
@@ -107,30 +110,31 @@ class RelTemplateCypher():
             cypher = "Error generating cypher: {}".format(repr(e))
             rc = False
         finally:
-            return rc, cypher
+            return rc, cypher, parms
 
     def genRemoveProp(self, updateIndex=None, dataGrid=None):
         model = dataGrid.model()
         cypher = None
+        parms = None
         self.relID = None
         # get the relID
         for header in range(model.columnCount()):
             if model.headerData(header, Qt.Horizontal, Qt.DisplayRole) == "rel_id":
                 self.relID = model.item(updateIndex.row(),header).data(Qt.EditRole)
         if self.relID is None:
-            return cypher
+            return cypher, parms
         # get the property name
         self.updateProp = model.headerData(updateIndex.column(), Qt.Horizontal, Qt.DisplayRole)        
         # MAKE SURE IT ISN'T A REQUIRED PROPERTY
         for prop in self.templateDict["properties"]:
             if prop[PROPERTY] == self.updateProp:
                 if prop[PROPREQ] != Qt.Checked:
-                    p1 = self.relID
                     p2 = self.updateProp
-                    cypher = "match (f)-[r]->(t) \n where id(r) = {}  \n remove r.{} ".format(p1, p2)
+                    cypher = "match (f)-[r]->(t) \n where id(r) = $relID  \n remove r.{} ".format(p2)
+                    parms = {"relID": self.relID}
                 else:
                     self.helper.displayErrMsg("Set Null", "Property {} is required by the Relationship Template. Cannot remove this property.".format(self.updateProp))
-        return cypher      
+        return cypher, parms
 
         
     def genMatch(self):
@@ -176,15 +180,16 @@ class RelTemplateCypher():
         propList = ",".join(nodeName + "." + x[PROPERTY] + " as " + x[PROPERTY] + " \n" for x in self.templateDict["properties"] ) 
         return propList
     
-    def genSetPropList(self, nodeName):
-        'return a set statement for each property that has a default value (i.e. required)'
+    def genSetPropList(self, nodeName, parms):
+        'return a set statement for each property that has a default value (i.e. required).  the default values are added to parms'
         setPropList = []
         if not self.templateDict is None:
             for prop in self.templateDict["properties"]:
                 # if the property has a default value then generate the set statement.
                 if prop[PROPDEF] != "":
                     # generate the correct syntax that you set the property equal to
-                    setEqualTo = self.helper.genPropEqualTo(dataValue=prop[PROPDEF], neoType = prop[DATATYPE])
+                    parmName = "{}_p{}".format(nodeName, len(setPropList))
+                    setEqualTo, parms[parmName] = self.helper.genPropParm(dataValue=prop[PROPDEF], neoType = prop[DATATYPE], parmName=parmName)
                     setPropList.append("set {}.{} = {}".format(nodeName, prop[PROPERTY], setEqualTo))
         setProps = " \n ".join(setProp for setProp in setPropList)
         return setProps        
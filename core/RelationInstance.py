@@ -167,8 +167,8 @@ class RelationInstance():
             self.logMsg("The Relationship does not exist in the database.  Cannot delete.")
             return True, "No Relationship to delete."
         # delete the Relationship based on the neoID    
-        cypher = "match ()-[r]->() where id(r) = " + str(self.neoID) + "  delete r"
-        rc, msg = self.neoCon.runCypherAuto(cypher)
+        cypher = "match ()-[r]->() where id(r) = $relID  delete r"
+        rc, msg = self.neoCon.runCypherAuto(cypher, {"relID": self.neoID})
         self.logMsg(msg)
         return rc, msg
 
@@ -185,8 +185,8 @@ class RelationInstance():
             return rc, msg
         
         # see if the node still exists in the db based on the node id
-        cypher = "match ()-[r]->() where id(r) = " + str(self.neoID) + " return r"
-        rc, msg = self.neoCon.runCypherExplicit(cypher)
+        cypher = "match ()-[r]->() where id(r) = $relID return r"
+        rc, msg = self.neoCon.runCypherExplicit(cypher, parmData={"relID": self.neoID})
         if rc is False:
             self.logMsg(msg)
             msg = "Error Querying Graph."     
@@ -269,8 +269,8 @@ class RelationInstance():
         if self.neoID is None:
             return None, "Relationship [{}] doesn't exist in Neo4j".format(self.neoID)
         # try to retrieve the relationship based on the neoid    
-        cypher = "match ()-[r]->() where id(r) = " + str(self.neoID) + " return r"
-        rc, msg = self.neoCon.runCypherAuto(cypher)
+        cypher = "match ()-[r]->() where id(r) = $relID return r"
+        rc, msg = self.neoCon.runCypherAuto(cypher, {"relID": self.neoID})
         if rc is False:
             return  rc, "Retrieve Relationship [{}] error - {}".format(self.neoID, msg) 
         else:
@@ -301,9 +301,13 @@ class RelationInstance():
             return rc, "Create Relationship error on to node - {}".format(msg)
         
         # generate cypher stmt to create the relationship
-        cypher = self.helper.genCreateRelCypher(relInstanceDict = self.getObjectDict(), rel = self.relationship, fromNeoID = self.startNode.neoID, toNeoID=self.endNode.neoID)
+        try:
+            cypher, parms = self.helper.genCreateRelCypher(relInstanceDict = self.getObjectDict(), rel = self.relationship, fromNeoID = self.startNode.neoID, toNeoID=self.endNode.neoID)
+        except ValueError as e:
+            self.logMsg(str(e))
+            return False, "Create New Relationship [{}] error - {}".format(self.NZID, str(e))
         # run the create 
-        rc, msg = self.neoCon.runCypherAuto(cypher)      
+        rc, msg = self.neoCon.runCypherAuto(cypher, parms)      
 
         if rc is True:            
             firstRec = None
@@ -313,6 +317,7 @@ class RelationInstance():
                 self.relationship = firstRec["r"]  # the rel was found so set it
                 self.neoID = firstRec["id(r)"]
                 self.relationInstanceDict["neoID"] = self.neoID
+                self.model.reindexInstance("Instance Relationship", self.relationInstanceDict)
                 return rc, "New Relationship Created - {}".format(msg)
         else:
             self.logMsg(msg)                
@@ -340,9 +345,13 @@ class RelationInstance():
         # set the logging method
         self.setLogMethod(logMethod)
         # generate cypher stmt to create the relationship 
-        cypher = self.helper.genUpdateRelCypher(relInstanceDict = self.getObjectDict(), rel = self.relationship, relID = self.neoID)
+        try:
+            cypher, parms = self.helper.genUpdateRelCypher(relInstanceDict = self.getObjectDict(), rel = self.relationship, relID = self.neoID)
+        except ValueError as e:
+            self.logMsg(str(e))
+            return False, "Update Existing Relationship [{}] error - {}".format(self.NZID, str(e))
         # run the create
-        rc, msg = self.neoCon.runCypherAuto(cypher)    
+        rc, msg = self.neoCon.runCypherAuto(cypher, parms)    
         if rc is True:
             return rc, "Existing Relationship Updated - {}".format(msg)
         else:
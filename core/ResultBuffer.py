@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+The ResultBuffer class holds the records returned by a query.
+The first memoryLimit bytes of records are kept in memory, the rest are spilled to a temporary SQLite file.
+A ResultBuffer acts like a list of records: len(), indexing by row number, slicing and iteration all work
+no matter where the row is stored.
+
+    Author: John Singer
+
+Copyright 2018-2020 SingerLinks Consulting LLC
+
+This file is part of NodeEra.
+
+NodeEra is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+NodeEra is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with NodeEra. If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+import logging
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+
+from neo4j import Record
+from neo4j.graph import Graph, Node, Relationship, Path
+from neo4j.time import Date, Time, DateTime, Duration
+
+# tags used to pack graph objects so they can be pickled without the graph they came from
+PACKNODE, PACKREL, PACKPATH = ("__node__", "__rel__", "__path__")
+# tags used to pack temporal values, which don't pickle, as their component fields
+PACKDATE, PACKTIME, PACKDATETIME, PACKDURATION = ("__date__", "__time__", "__datetime__", "__duration__")
+
+class ResultBuffer():
+
+    def __init__(self, memoryLimit=256000000, spillDir=None, pageSize=1000):
+        # the buffer is filled on a NeoThread and read on the gui thread
+        self.lock = threading.RLock()
+        self.memoryLimit = memoryLimit      # number of bytes of records kept in memory before spilling to disk
+        self.spillDir = spillDir                    # directory for the spill file, None uses the system temp directory
+        self.pageSize = pageSize                # number of spilled rows read or written at a time
+        self.memRows = []
+        self.memBytes = 0
+        self.spillCount = 0
+        self.pendingRows = []                   # spilled rows not yet written to the spill file
+        self.db = None
+        self.spillPath = None
+        # the last page read from the spill file
+        self.pageStart = None
+        self.page = []
+
+    def logMsg(self, msg):
+        if logging:
+            logging.info(msg)
+
+    def __len__(self, ):
+        return len(self.memRows) + self.spillCount
+
+    def __bool__(self, ):
+        return len(self) > 0
+
+    def __repr__(self, ):
+        if self.isSpilled():
+            return "ResultBuffer(rows={}, inMemory={}, spillFile={})".format(len(self), len(self.memRows), self.spillPath)
+        return repr(self.memRows)
+
+    def __iter__(self, ):
+        for record in self.memRows:
+            yield record
+        pageStart = len(self.memRows)
+        while pageStart < len(self):
+            for record in self.readPage(pageStart):
+                yield record
+            pageStart = pageStart + self.pageSize
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[rowNum] for rowNum in range(*index.indices(len(self)))]
+        if index < 0:
+            index = index + len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("ResultBuffer index out of range")
+        if index < len(self.memRows):
+            return self.memRows[index]
+        # read the page of spilled rows that holds the row
+        pageStart = index - ((index - len(self.memRows)) % self.pageSize)
+        page = self.readPage(pageStart)
+        return page[index - pageStart]
+
+    def isSpilled(self, ):
+        return self.spillCount > 0
+
+    def append(self, record, size=0):
+        '''
+        add a record to the end of the buffer.  size is the estimated size of the record in bytes
+        '''
+        with self.lock:
+            if self.spillCount == 0 and self.memBytes + size <= self.memoryLimit:
+                self.memRows.append(record)
+                self.memBytes = self.memBytes + size
+            else:
+                self.pendingRows.append((len(self), pickle.dumps(self.packRecord(record), protocol=pickle.HIGHEST_PROTOCOL)))
+                self.spillCount = self.spillCount + 1
+                if len(self.pendingRows) >= self.pageSize:
+                    self.flush()
+
+    def flush(self, ):
+        '''
+        write the pending spilled rows to the spill file
+        '''
+        with self.lock:
+            if len(self.pendingRows) == 0:
+                return
+            if self.db is None:
+                self.openSpillFile()
+            self.db.executemany("insert into rows (rownum, data) values (?, ?)", self.pendingRows)
+            self.db.commit()
+            self.pendingRows = []
+
+    def openSpillFile(self, ):
+        fileHandle, self.spillPath = tempfile.mkstemp(prefix="NodeEraResult", suffix=".db", dir=self.spillDir)
+        os.close(fileHandle)
+        self.db = sqlite3.connect(self.spillPath, check_same_thread=False)
+        # the spill file is thrown away when the buffer is closed so it doesn't need to survive a crash
+        self.db.execute("pragma journal_mode = off")
+        self.db.execute("pragma synchronous = off")
+        self.db.execute("create table rows (rownum integer primary key, data blob)")
+        self.logMsg("Result set spilled to {} after {} rows".format(self.spillPath, len(self.memRows)))
+
+    def readPage(self, pageStart):
+        '''
+        return the list of spilled records starting at row pageStart
+        '''
+        with self.lock:
+            if self.pageStart == pageStart:
+                return self.page
+            self.flush()
+            cursor = self.db.execute("select data from rows where rownum >= ? and rownum < ? order by rownum", (pageStart, pageStart + self.pageSize))
+            self.page = [self.unpackRecord(pickle.loads(row[0])) for row in cursor]
+            self.pageStart = pageStart
+            return self.page
+
+    def close(self, ):
+        '''
+        drop the spill file.  the NeoDriver leaves this to garbage collection since other objects can still hold the result set
+        '''
+        with self.lock:
+            self.pendingRows = []
+            self.page = []
+            self.pageStart = None
+            if not self.db is None:
+                try:
+                    self.db.close()
+                    os.remove(self.spillPath)
+                except BaseException as e:
+                    self.logMsg("Error removing result spill file {} - {}".format(self.spillPath, repr(e)))
+                self.db = None
+
+    def __del__(self, ):
+        self.close()
+
+##############################################################################################
+# a spilled record is packed into plain python values.  nodes, relationships and paths refer to the graph
+# of the whole result so they are packed without it and rebuilt in a graph of their own when the row is read back
+##############################################################################################
+    def packRecord(self, record):
+        return (list(record.keys()), [self.packValue(value) for value in record.values()])
+
+    def packValue(self, value):
+        if isinstance(value, Node):
+            return (PACKNODE, value.id, list(value.labels), self.packValue(dict(value)))
+        if isinstance(value, Relationship):
+            return (PACKREL, value.id, value.type, self.packValue(dict(value)), self.packValue(value.start_node), self.packValue(value.end_node))
+        if isinstance(value, Path):
+            return (PACKPATH, [self.packValue(node) for node in value.nodes], [self.packValue(rel) for rel in value.relationships])
+        if isinstance(value, DateTime):
+            return (PACKDATETIME, value.year, value.month, value.day, value.hour, value.minute, int(value.second), value.nanosecond, value.tzinfo)
+        if isinstance(value, Date):
+            return (PACKDATE, value.year, value.month, value.day)
+        if isinstance(value, Time):
+            return (PACKTIME, value.hour, value.minute, int(value.second), value.nanosecond, value.tzinfo)
+        if isinstance(value, Duration):
+            return (PACKDURATION, value.months, value.days, value.seconds, value.nanoseconds)
+        if isinstance(value, list):
+            return [self.packValue(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.packValue(item) for key, item in value.items()}
+        return value
+
+    def checkRoundTrip(self, records=None):
+        '''
+        pack, pickle and unpack records the way a spilled row is stored and return the keys of the values that don't come back the same.
+        with no records a sample covering graph objects and temporal values is used
+        '''
+        if records is None:
+            hydrator = Graph.Hydrator(Graph())
+            temporals = {"date": Date(2020, 1, 2), "time": Time(12, 3, 4, 123456789), "datetime": DateTime(2020, 1, 2, 3, 4, 5, 987654321),
+                                "duration": Duration(months=14, days=3, seconds=5, nanoseconds=7)}
+            startNode = hydrator.hydrate_node(1, ["Start"], temporals)
+            endNode = hydrator.hydrate_node(2, ["End"], {"list": list(temporals.values())})
+            rel = hydrator.hydrate_relationship(3, 1, 2, "TO", temporals)
+            records = [Record(zip(list(temporals.keys()) + ["start", "end", "rel", "map"], list(temporals.values()) + [startNode, endNode, rel, temporals]))]
+        diffList = []
+        for rowNum, record in enumerate(records):
+            copy = self.unpackRecord(pickle.loads(pickle.dumps(self.packRecord(record), protocol=pickle.HIGHEST_PROTOCOL)))
+            for key, value in record.items():
+                copyValue = copy[key]
+                if isinstance(value, (Node, Relationship)):
+                    value, copyValue = (dict(value), dict(copyValue))
+                if value != copyValue:
+                    diffList.append((rowNum, key))
+        return diffList
+
+    def unpackRecord(self, packedRecord):
+        keys, values = packedRecord
+        hydrator = Graph.Hydrator(Graph())
+        return Record(zip(keys, [self.unpackValue(value, hydrator) for value in values]))
+
+    def unpackValue(self, value, hydrator):
+        if isinstance(value, tuple) and len(value) > 0:
+            if value[0] == PACKNODE:
+                return hydrator.hydrate_node(value[1], value[2], self.unpackValue(value[3], hydrator))
+            if value[0] == PACKREL:
+                startNode = self.unpackValue(value[4], hydrator)
+                endNode = self.unpackValue(value[5], hydrator)
+                return hydrator.hydrate_relationship(value[1], startNode.id, endNode.id, value[2], self.unpackValue(value[3], hydrator))
+            if value[0] == PACKPATH:
+                nodes = [self.unpackValue(node, hydrator) for node in value[1]]
+                rels = [self.unpackValue(rel, hydrator) for rel in value[2]]
+                return Path(nodes[0], *rels)
+            if value[0] == PACKDATETIME:
+                return DateTime(value[1], value[2], value[3], value[4], value[5], value[6], value[7], tzinfo=value[8])
+            if value[0] == PACKDATE:
+                return Date(value[1], value[2], value[3])
+            if value[0] == PACKTIME:
+                return Time(value[1], value[2], value[3], value[4], tzinfo=value[5])
+            if value[0] == PACKDURATION:
+                return Duration(months=value[1], days=value[2], seconds=value[3], nanoseconds=value[4])
+        if isinstance(value, list):
+            return [self.unpackValue(item, hydrator) for item in value]
+        if isinstance(value, dict):
+            return {key: self.unpackValue(item, hydrator) for key, item in value.items()}
+        return value
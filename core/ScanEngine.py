@@ -0,0 +1,925 @@
+#!/usr/bin/env python3
+"""
+The ScanEngine class scans a neo4j database and builds the node and relationship patterns used by the reverse engineering dialog to generate templates.
+The ScanThread class runs a ScanEngine on a subthread and reports progress to the dialog with signals.
+
+    Author: John Singer
+
+Copyright 2018-2020 SingerLinks Consulting LLC
+
+This file is part of NodeEra.
+
+NodeEra is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+NodeEra is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with NodeEra. If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+import datetime
+import json
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from core.NeoDriver import NeoDriver
+from core.NeoTypeFunc import NeoTypeFunc
+from core.Enums import DataType
+
+# property types reported by db.schema.nodeTypeProperties and db.schema.relTypeProperties
+SCHEMATYPES = {"String": DataType.STRING.value, "Long": DataType.INT.value, "Double": DataType.FLOAT.value, "Boolean": DataType.BOOLEAN.value,
+                        "Date": DataType.DATE.value, "Time": DataType.TIME.value, "LocalTime": DataType.LOCALTIME.value, "DateTime": DataType.DATETIME.value,
+                        "LocalDateTime": DataType.LOCALDATETIME.value, "Duration": DataType.DURATION.value}
+
+class ScanEngine():
+    '''
+    scan the nodes and relationships of a database a chunk at a time and tally the label, property and relationship patterns.
+    the engine doesn't touch the gui, it reports messages and progress thru the msgCallback and progressCallback functions.
+    '''
+    def __init__(self, neoCon=None, processSize=1000, skipAmt=0, scanNodes=True, scanRels=True, fastScan=False, scanWorkers=1, aggregate=False, sampleSize=0, checkpointFile=None, resume=False, inferCardinality=False, supernodeDegree=10000, msgCallback=None, progressCallback=None):
+        self.neoCon = neoCon
+        self.neoTypeFunc = NeoTypeFunc()
+        self.processSize = processSize      # number of id's scanned per chunk
+        self.skipAmt = skipAmt                  # number of id's skipped between chunks
+        self.scanNodes = scanNodes
+        self.scanRels = scanRels
+        self.fastScan = fastScan
+        self.scanWorkers = scanWorkers      # number of id ranges scanned at the same time
+        self.partitions = []                    # the ScanEngine for each id range of a parallel scan
+        self.aggregate = aggregate              # group each chunk into patterns on the server instead of returning every object
+        self.sampleSize = sampleSize            # if more than 0 scan a random sample of about this many objects instead of all of them
+        self.random = random.Random()
+        self.checkpointFile = checkpointFile    # file the scan state is saved in, None turns off checkpoints
+        self.resume = resume                            # start from the checkpoint instead of the beginning
+        self.checkpointInterval = 30                # seconds between checkpoints
+        self.lastCheckpoint = time.perf_counter()
+        self.highWater = {"Node": -1, "Relationship": -1}     # highest id covered by a finished scan
+        self.inferCardinality = inferCardinality        # compute the from and to cardinality of each relationship pattern after the scan
+        self.supernodeDegree = supernodeDegree          # nodes with this many relationships of one type are flagged as supernodes
+        self.msgCallback = msgCallback
+        self.progressCallback = progressCallback
+        self.stopScan = False
+        self.newScan()
+
+    def newScan(self, ):
+        self.patternList = []           # keeps track of the unique label combinations
+        self.nodeDict = {}            # dictionary to hold discovered node patterns
+        self.relDict = {}               # dictionary to hold discovered relationship patterns
+        self.buildIndexes()
+
+    def buildIndexes(self, ):
+        '''
+        rebuild the hash indexes over patternList, nodeDict and relDict so each scanned record is tallied in constant time.
+        call this whenever patternList, nodeDict or relDict are replaced instead of added to
+        '''
+        self.patternIndex = {}          # frozen label set -> nodeDict key
+        self.relTypeCount = {}          # relationship type -> number of relationship patterns that use it
+        self.nodePropIndex = {}         # nodeDict key -> set of property names found so far
+        self.relPropIndex = {}          # relDict key -> set of property names found so far
+        for x, labels in enumerate(self.patternList):
+            self.patternIndex.setdefault(frozenset(labels), "{0:0>5}".format(x))
+        for patternName, nodeData in self.nodeDict.items():
+            self.nodePropIndex[patternName] = set(nodeData["propList"])
+        for relKey, relData in self.relDict.items():
+            self.relTypeCount[relData["relName"]] = self.relTypeCount.get(relData["relName"], 0) + 1
+            self.relPropIndex[relKey] = set(relData["propList"])
+
+    def mergeProps(self, patternData=None, propSet=None, propNames=None):
+        '''
+        add the property names that aren't in the pattern yet to its propList and propSet and return them
+        '''
+        newProps = [propName for propName in propNames if not propName in propSet]
+        if len(newProps) > 0:
+            propSet.update(newProps)
+            patternData["propList"].extend(newProps)
+        return newProps
+
+    def displayScanMsg(self, text):
+        if not self.msgCallback is None:
+            self.msgCallback(text)
+
+    def reportProgress(self, phase=None, processed=0, fromID=0, highID=0, startTime=None, chunkLatency=0.0, patterns=0):
+        '''
+        send a progress dictionary to the progressCallback.  the eta is based on the rate id's have been scanned so far
+        '''
+        if self.progressCallback is None:
+            return
+        elapsed = time.perf_counter() - startTime
+        progress = {}
+        progress["phase"] = phase
+        progress["processed"] = processed
+        progress["fromID"] = fromID
+        progress["highID"] = highID
+        progress["patterns"] = patterns
+        progress["chunkLatency"] = chunkLatency
+        progress["elapsed"] = elapsed
+        if elapsed > 0:
+            progress["rowsPerSec"] = processed / elapsed
+            idsPerSec = fromID / elapsed
+        else:
+            progress["rowsPerSec"] = 0.0
+            idsPerSec = 0.0
+        if idsPerSec > 0:
+            progress["eta"] = max(highID - fromID, 0) / idsPerSec
+        else:
+            progress["eta"] = None
+        self.progressCallback(progress)
+
+    def run(self, ):
+        '''
+        run the scan. returns rc, msg
+        '''
+        self.stopScan = False
+        if self.fastScan == True:
+            rc, msg = self.schemaScan()
+        else:
+            rc, msg = self.scanAll()
+        if rc == True and self.inferCardinality == True and self.scanRels == True and self.stopScan == False:
+            self.scanCardinality()
+        return rc, msg
+
+    def getDataTypes(self, propValues=None, propDataTypeDict=None, propList=None):
+        '''
+        set the datatype of each property in propList from the property values returned by the scan query.
+        the values are already the correct python object for each property so no query is needed
+        '''
+        for propName in propList:
+            value = propValues.get(propName, None)
+            if not value is None:
+                dataType = self.neoTypeFunc.getNeo4jDataType(value)
+                propDataTypeDict[propName] = dataType
+
+    def scanAll(self, ):
+        rc = False
+        msg = "Scan finished"
+        # where each scan starts.  a resumed scan starts where the checkpoint left off, an incremental scan starts past the last scan's high water mark
+        startID = {"Node": 0, "Relationship": 0}
+        skipNodes = False
+        if self.resume == True and self.sampleSize == 0:
+            checkpoint = self.loadCheckpoint()
+            if not checkpoint is None:
+                self.restoreCheckpoint(checkpoint)
+                if checkpoint["phase"] == "Complete":
+                    startID["Node"] = self.highWater["Node"] + 1
+                    startID["Relationship"] = self.highWater["Relationship"] + 1
+                    self.displayScanMsg("Incremental scan of Nodes past ID {} and Relationships past ID {}.".format(self.highWater["Node"], self.highWater["Relationship"]))
+                else:
+                    startID[checkpoint["phase"]] = checkpoint["nextID"]
+                    skipNodes = checkpoint["phase"] == "Relationship"
+                    self.displayScanMsg("Resume {} scan at ID {} from checkpoint saved {}.".format(checkpoint["phase"], checkpoint["nextID"], checkpoint["saved"]))
+        if self.scanNodes == True and skipNodes == False:
+            # scan the nodes
+            rc, msg = self.scanObjects(objectType="Node", fromID=startID["Node"])
+        if self.scanRels == True and self.stopScan == False:
+            # scan the relationships.  the node patterns have to be known first to find the from and to templates
+            rc, msg = self.scanObjects(objectType="Relationship", fromID=startID["Relationship"])
+        if rc == True and self.stopScan == False and self.sampleSize == 0:
+            self.saveCheckpoint(phase="Complete", nextID=0)
+        return rc, msg
+
+    def scanObjects(self, objectType=None, fromID=0):
+        '''
+        scan all the nodes or relationships from fromID on, split into scanWorkers id ranges that are scanned at the same time
+        '''
+        rc = False
+        phase = self.phaseName(objectType)
+        msg = "Scan {} finished".format(phase)
+        self.displayScanMsg("Start Scanning {}.".format(phase))
+        try:
+            highID = self.getHighID(objectType=objectType)
+            if self.sampleSize > 0:
+                rc, msg, totAmt = self.sampleScan(objectType=objectType, highID=highID)
+                if rc == True and self.stopScan == False:
+                    self.estimateCounts(objectType=objectType, sampled=totAmt)
+            elif self.scanWorkers > 1 and highID >= fromID:
+                rc, msg, totAmt = self.parallelScanRange(objectType=objectType, fromID=fromID, highID=highID)
+                # the partitions can't be resumed part way thru so the checkpoint is only written when they all finish
+                if rc == True and self.stopScan == False:
+                    self.highWater[objectType] = max(highID, self.highWater[objectType])
+                    self.saveCheckpoint(phase=objectType, nextID=highID + 1)
+            else:
+                rc, msg, totAmt = self.scanRange(objectType=objectType, fromID=fromID, highID=highID)
+                if rc == True and self.stopScan == False:
+                    self.highWater[objectType] = max(highID, self.highWater[objectType])
+        except BaseException as e:
+            msg = "{} - {} Scan failed.".format(repr(e), phase)
+        finally:
+            self.displayScanMsg(msg)
+        return rc, msg
+
+    def scanCardinality(self, ):
+        '''
+        compute the out degree of the from nodes and the in degree of the to nodes for each relationship pattern and map them to cardinalities.
+        the degrees only count relationships whose other end has exactly the labels of the other node pattern, so a relationship type
+        that connects a pattern to several others gets a cardinality for each (from, type, to) pattern.
+        '''
+        self.displayScanMsg("Start Relationship Cardinality Scan.")
+        for relKey, relData in self.relDict.items():
+            if self.stopScan == True:
+                break
+            fromLabels = self.getNodeLabels(relData["fromTemplate"])
+            toLabels = self.getNodeLabels(relData["toTemplate"])
+            if fromLabels is None or toLabels is None:
+                continue
+            try:
+                outDegree = self.getDegreeStats(labels=fromLabels, relType=relData["relName"], direction="out", otherLabels=toLabels)
+                inDegree = self.getDegreeStats(labels=toLabels, relType=relData["relName"], direction="in", otherLabels=fromLabels)
+            except BaseException as e:
+                self.displayScanMsg("{} - Cardinality Scan of {} failed.".format(repr(e), relKey))
+                continue
+            relData["outDegree"] = outDegree
+            relData["inDegree"] = inDegree
+            # the to cardinality is how many to nodes one from node has, the from cardinality is how many from nodes one to node has
+            relData["toCardinality"] = self.genCardinality(outDegree)
+            relData["fromCardinality"] = self.genCardinality(inDegree)
+            relData["supernode"] = outDegree["maxDegree"] >= self.supernodeDegree or inDegree["maxDegree"] >= self.supernodeDegree
+            self.displayScanMsg("{} From: {} (max in degree {}, avg {:.1f}) To: {} (max out degree {}, avg {:.1f})".format(relKey, 
+                                                relData["fromCardinality"], inDegree["maxDegree"], inDegree["avgDegree"], 
+                                                relData["toCardinality"], outDegree["maxDegree"], outDegree["avgDegree"]))
+            if relData["supernode"] == True:
+                self.displayScanMsg("{} has supernodes with {} or more relationships.".format(relKey, self.supernodeDegree))
+
+    def getNodeLabels(self, templateName):
+        '''
+        return the label list of the node pattern with the template name or None if there isn't one
+        '''
+        for nodepattern, nodedata in self.nodeDict.items():
+            if nodedata["templateLblName"] == templateName:
+                return nodedata["labelList"]
+        return None
+
+    def getDegreeStats(self, labels=None, relType=None, direction="out", otherLabels=None):
+        '''
+        return a dictionary with the number of nodes in the pattern, how many have at least one relationship to the otherLabels pattern and the max and average degree.
+        a sample scan only looks at sampleSize nodes
+        '''
+        matchLabels = "".join(":`{}`".format(label) for label in labels)
+        matchOtherLabels = "".join(":`{}`".format(label) for label in otherLabels)
+        if direction == "out":
+            degree = "size([(n)-[:`{}`]->(m{}) where size(labels(m)) = $numOtherLabels | m])".format(relType, matchOtherLabels)
+        else:
+            degree = "size([(n)<-[:`{}`]-(m{}) where size(labels(m)) = $numOtherLabels | m])".format(relType, matchOtherLabels)
+        if self.sampleSize > 0:
+            limit = "with n limit {} ".format(self.sampleSize)
+        else:
+            limit = ""
+        cypher = '''match (n{}) where size(labels(n)) = $numLabels {}
+                    with {} as degree 
+                    return count(*) as nodes, sum(case when degree > 0 then 1 else 0 end) as connected, max(degree) as maxDegree, avg(degree) as avgDegree'''.format(matchLabels, limit, degree)
+        rc1, msg1 = self.neoCon.runCypherAuto(cypher, {"numLabels": len(labels), "numOtherLabels": len(otherLabels)}, readOnly=True, useCache=False)
+        if rc1 == False:
+            raise Exception(msg1)
+        record = self.neoCon.resultSet[0]
+        degreeStats = {}
+        degreeStats["nodes"] = record["nodes"]
+        degreeStats["connected"] = record["connected"]
+        degreeStats["maxDegree"] = record["maxDegree"] if not record["maxDegree"] is None else 0
+        degreeStats["avgDegree"] = record["avgDegree"] if not record["avgDegree"] is None else 0.0
+        return degreeStats
+
+    def genCardinality(self, degreeStats):
+        '''
+        the minimum is 1 if every node in the pattern has the relationship, the maximum is M if any node has more than one
+        '''
+        if degreeStats["nodes"] > 0 and degreeStats["connected"] == degreeStats["nodes"]:
+            low = "1"
+        else:
+            low = "0"
+        if degreeStats["maxDegree"] > 1:
+            high = "M"
+        else:
+            high = "1"
+        return "{}:{}".format(low, high)
+
+##############################################################################################
+# checkpoints - the scan state is saved to checkpointFile as it goes so a stopped or failed scan can be resumed,
+# and the high water marks of a finished scan let the next scan look only at new nodes and relationships
+##############################################################################################
+    def saveCheckpoint(self, phase=None, nextID=0):
+        '''
+        save the scan state.  phase is the object type being scanned and nextID is the first id not scanned yet, or phase is Complete
+        '''
+        if self.checkpointFile is None:
+            return
+        checkpoint = {}
+        checkpoint["version"] = 1
+        checkpoint["saved"] = datetime.datetime.now().isoformat()
+        # the uri comes from the connection settings, neoDict["URL"] isn't set until the driver has been created
+        checkpoint["URL"] = self.neoCon.genURI()
+        checkpoint["userid"] = self.neoCon.neoDict.get("userid", "")
+        checkpoint["processSize"] = self.processSize
+        checkpoint["skipAmt"] = self.skipAmt
+        checkpoint["phase"] = phase
+        checkpoint["nextID"] = nextID
+        checkpoint["highWater"] = self.highWater
+        checkpoint["patternList"] = self.patternList
+        checkpoint["nodeDict"] = self.nodeDict
+        checkpoint["relDict"] = self.relDict
+        try:
+            # write a new file and swap it in so a crash never leaves a half written checkpoint
+            tempFile = self.checkpointFile + ".tmp"
+            with open(tempFile, "w") as f:
+                json.dump(checkpoint, f)
+            os.replace(tempFile, self.checkpointFile)
+            self.lastCheckpoint = time.perf_counter()
+        except BaseException as e:
+            self.displayScanMsg("{} - Save checkpoint failed.".format(repr(e)))
+
+    def loadCheckpoint(self, ):
+        '''
+        return the saved checkpoint or None if there isn't one for this database and these scan settings
+        '''
+        if self.checkpointFile is None or not os.path.exists(self.checkpointFile):
+            self.displayScanMsg("No checkpoint found, starting a new scan.")
+            return None
+        try:
+            with open(self.checkpointFile, "r") as f:
+                checkpoint = json.load(f)
+        except BaseException as e:
+            self.displayScanMsg("{} - Load checkpoint failed, starting a new scan.".format(repr(e)))
+            return None
+        if (checkpoint.get("URL") != self.neoCon.genURI() or checkpoint.get("userid") != self.neoCon.neoDict.get("userid", "")
+                or checkpoint.get("processSize") != self.processSize or checkpoint.get("skipAmt") != self.skipAmt):
+            self.displayScanMsg("The checkpoint is for a different database or scan settings, starting a new scan.")
+            return None
+        return checkpoint
+
+    def restoreCheckpoint(self, checkpoint):
+        self.patternList = checkpoint["patternList"]
+        self.nodeDict = checkpoint["nodeDict"]
+        self.relDict = checkpoint["relDict"]
+        self.highWater = checkpoint["highWater"]
+        self.buildIndexes()
+
+    def genScanCypher(self, objectType=None):
+        '''
+        return the query that scans one window of node or relationship id's
+        '''
+        if objectType == "Node":
+            # walk the node id space a window at a time. each window is an id seek so a chunk costs the same no matter how far into the graph it is
+            if self.aggregate == True:
+                # one row per label and property key combination with the properties of one node to get the datatypes from
+                return "unwind range($fromID, $toID) as objectID match (n) where id(n) = objectID return labels(n), keys(n), count(*) as patternCount, head(collect(properties(n))) as props"
+            else:
+                # only the property keys are returned, the values needed for datatypes are fetched by lookupDataTypes for keys the pattern hasn't seen yet
+                return "unwind range($fromID, $toID) as objectID match (n) where id(n) = objectID return id(n) as nodeID, labels(n), keys(n)"
+        else:
+            # walk the relationship id space a window at a time the same way as the node scan
+            if self.aggregate == True:
+                # one row per relationship type, end point labels and property key combination
+                return "unwind range($fromID, $toID) as objectID match (f)-[r]->(t) where id(r) = objectID return type(r), labels(f), labels(t), keys(r), count(*) as patternCount, head(collect(properties(r))) as props"
+            else:
+                return "unwind range($fromID, $toID) as objectID match (f)-[r]->(t) where id(r) = objectID return id(r) as relID, type(r), labels(f), labels(t), keys(r)"
+
+    def scanWindow(self, objectType=None, cypher=None, fromID=0, toID=0):
+        '''
+        scan the nodes or relationships with id's from fromID thru toID and tally their patterns.
+        returns rc, msg, the number of objects processed and the number of patterns found so far
+        '''
+        rc1, msg1 = self.neoCon.runCypherAuto(cypher, {"fromID": fromID, "toID": toID}, readOnly=True, useCache=False)
+        if rc1 == False:
+            return rc1, msg1, 0, 0
+        if objectType == "Node":
+            x = self.processModelChunk()
+            patterns = len(self.nodeDict)
+        else:
+            x = self.processRelModelChunk()
+            patterns = len(self.relDict)
+        return rc1, msg1, x, patterns
+
+    def scanRange(self, objectType=None, fromID=0, highID=0):
+        '''
+        scan the nodes or relationships with id's from fromID thru highID.  returns rc, msg and the number of objects processed
+        '''
+        rc = False
+        limitAmt = self.processSize
+        skipIncrement = self.skipAmt
+        firstID = fromID
+        totAmt = 0
+        startTime = time.perf_counter()
+        phase = self.phaseName(objectType)
+        cypher = self.genScanCypher(objectType=objectType)
+        while (fromID <= highID and self.stopScan == False):
+            toID = min(fromID + limitAmt - 1, highID)
+            #run the query
+            chunkStart = time.perf_counter()
+            rc1, msg1, x, patterns = self.scanWindow(objectType=objectType, cypher=cypher, fromID=fromID, toID=toID)
+            if rc1 == True:
+                totAmt = totAmt + x
+                self.displayScanMsg("Scan ID's: {} to {} Processed: {} Total Processed {} {}.".format(str(fromID), str(toID), str(x), totAmt, phase))
+                # skip over skipIncrement id's to sample the graph
+                fromID = toID + 1 + skipIncrement
+                self.reportProgress(phase=phase, processed=totAmt, fromID=fromID - firstID, highID=highID - firstID + 1, startTime=startTime,
+                                            chunkLatency=time.perf_counter() - chunkStart, patterns=patterns)
+                if time.perf_counter() - self.lastCheckpoint >= self.checkpointInterval:
+                    self.saveCheckpoint(phase=objectType, nextID=fromID)
+            else:
+                msg = "Scan {} Error {}".format(phase, msg1)
+                break
+        else:
+            rc = True
+            if self.stopScan == True:
+                msg = "Scan {} stopped".format(phase)
+            else:
+                msg = "Scan {} complete".format(phase)
+        # fromID is the first id that hasn't been scanned, a resumed scan starts there
+        self.saveCheckpoint(phase=objectType, nextID=fromID)
+        return rc, msg, totAmt
+
+    def sampleScan(self, objectType=None, highID=0):
+        '''
+        scan a stratified random sample of about sampleSize nodes or relationships.
+        the id space is split into equal strata and one window of processSize id's at a random position is scanned in each stratum.
+        returns rc, msg and the number of objects processed
+        '''
+        rc = False
+        phase = self.phaseName(objectType)
+        windowSize = self.processSize
+        numWindows = max(1, -(-self.sampleSize // windowSize))
+        strataSize = (highID + 1) / numWindows
+        cypher = self.genScanCypher(objectType=objectType)
+        totAmt = 0
+        startTime = time.perf_counter()
+        self.displayScanMsg("Sampling {} windows of {} id's.".format(numWindows, windowSize))
+        for stratum in range(numWindows):
+            if self.stopScan == True:
+                msg = "Sample {} stopped".format(phase)
+                break
+            strataFrom = int(stratum * strataSize)
+            strataTo = int((stratum + 1) * strataSize) - 1
+            fromID = self.random.randint(strataFrom, max(strataFrom, strataTo - windowSize + 1))
+            toID = min(fromID + windowSize - 1, strataTo)
+            chunkStart = time.perf_counter()
+            rc1, msg1, x, patterns = self.scanWindow(objectType=objectType, cypher=cypher, fromID=fromID, toID=toID)
+            if rc1 == False:
+                msg = "Sample {} Error {}".format(phase, msg1)
+                return rc, msg, totAmt
+            totAmt = totAmt + x
+            self.displayScanMsg("Sample ID's: {} to {} Processed: {} Total Processed {} {}.".format(str(fromID), str(toID), str(x), totAmt, phase))
+            self.reportProgress(phase=phase, processed=totAmt, fromID=int((stratum + 1) * strataSize), highID=highID + 1, startTime=startTime,
+                                        chunkLatency=time.perf_counter() - chunkStart, patterns=patterns)
+        else:
+            msg = "Sample {} complete".format(phase)
+        rc = True
+        return rc, msg, totAmt
+
+    def estimateCounts(self, objectType=None, sampled=0):
+        '''
+        extrapolate the count of each pattern in the sample to the whole graph using the count store total.
+        the 95% confidence interval is the normal approximation for a proportion, clustering within a window isn't accounted for so treat it as a lower bound on the error.
+        '''
+        if objectType == "Node":
+            cypher = "match (n) return count(n) as total"
+            patternDict = self.nodeDict
+        else:
+            cypher = "match ()-[r]->() return count(r) as total"
+            patternDict = self.relDict
+        rc1, msg1 = self.neoCon.runCypherAuto(cypher, readOnly=True, useCache=False)
+        if rc1 == False:
+            raise Exception("Count {} Error {}".format(objectType, msg1))
+        total = self.neoCon.resultSet[0]["total"]
+        if sampled == 0:
+            return
+        for patternName, patternData in patternDict.items():
+            p = patternData["count"] / sampled
+            margin = 1.96 * math.sqrt(p * (1 - p) / sampled)
+            patternData["estCount"] = int(round(p * total))
+            patternData["estLow"] = max(int(round((p - margin) * total)), patternData["count"])
+            patternData["estHigh"] = int(round(min(p + margin, 1.0) * total))
+            if patternData["count"] < 5:
+                self.displayScanMsg("Pattern {} was seen only {} time(s) in the sample, its estimate is unreliable.".format(patternData.get("labelList", patternName), patternData["count"]))
+        # rule of three - a pattern that wasn't seen in a sample of n has a 95% upper bound of 3/n of the total
+        self.displayScanMsg("Sampled {} of {} {}. Patterns with fewer than about {} {} may have been missed.".format(sampled, total, self.phaseName(objectType), 
+                                                int(math.ceil(3 * total / sampled)), self.phaseName(objectType)))
+
+    def phaseName(self, objectType=None):
+        if objectType == "Node":
+            return "Nodes"
+        else:
+            return "Relationships"
+
+    def parallelScanRange(self, objectType=None, fromID=0, highID=0):
+        '''
+        split the id space into scanWorkers ranges and scan each range with its own ScanEngine and NeoDriver.
+        the ranges start on a chunk boundary so the sample is the same as a single range scan.
+        the partition results are merged in id order so the patterns and template names come out the same as a single range scan.
+        '''
+        stride = self.processSize + self.skipAmt
+        numChunks = (highID - fromID) // stride + 1
+        chunksPerWorker = -(-numChunks // self.scanWorkers)
+        ranges = []
+        for worker in range(self.scanWorkers):
+            rangeFrom = fromID + worker * chunksPerWorker * stride
+            if rangeFrom > highID:
+                break
+            rangeTo = min(fromID + (worker + 1) * chunksPerWorker * stride - 1, highID)
+            ranges.append((rangeFrom, rangeTo))
+        self.displayScanMsg("Scanning {} id ranges at the same time.".format(len(ranges)))
+        # progress from each partition is added up and reported as one scan
+        startTime = time.perf_counter()
+        partProgress = {}
+        progressLock = threading.Lock()
+        def partitionProgress(worker, progress):
+            with progressLock:
+                partProgress[worker] = progress
+                self.reportProgress(phase=progress["phase"], processed=sum(part["processed"] for part in partProgress.values()),
+                                            fromID=sum(min(part["fromID"], part["highID"]) for part in partProgress.values()), highID=highID - fromID + 1, startTime=startTime,
+                                            chunkLatency=progress["chunkLatency"], patterns=progress["patterns"])
+        self.partitions = []
+        results = []
+        try:
+            for worker, (rangeFrom, rangeTo) in enumerate(ranges):
+                # connecting a partition takes a while so stop setting them up if the scan was stopped
+                if self.stopScan == True:
+                    break
+                partNeoCon = NeoDriver(name=self.neoCon.name, promptPW=self.neoCon.neoDict["password"])
+                partition = ScanEngine(neoCon=partNeoCon, processSize=self.processSize, skipAmt=self.skipAmt, aggregate=self.aggregate,
+                                                    msgCallback=lambda text, worker=worker: self.displayScanMsg("Range {}: {}".format(worker + 1, text)),
+                                                    progressCallback=lambda progress, worker=worker: partitionProgress(worker, progress))
+                # add the partition as soon as it exists so cancel can stop it and close its connection
+                self.partitions.append(partition)
+                partition.stopScan = self.stopScan
+                # relationship partitions look up the from and to node templates in the node patterns already found
+                if objectType == "Relationship":
+                    partition.patternList = list(self.patternList)
+                    partition.nodeDict = self.nodeDict
+                    partition.buildIndexes()
+            if len(self.partitions) > 0:
+                with ThreadPoolExecutor(max_workers=len(self.partitions)) as executor:
+                    futures = []
+                    for partition, (rangeFrom, rangeTo) in zip(self.partitions, ranges):
+                        if self.stopScan == True:
+                            break
+                        futures.append(executor.submit(partition.scanRange, objectType, rangeFrom, rangeTo))
+                    results = [future.result() for future in futures]
+            for partition, result in zip(self.partitions, results):
+                if objectType == "Node":
+                    self.mergeNodePatterns(partition)
+                else:
+                    self.mergeRelPatterns(partition)
+        finally:
+            for partition in self.partitions:
+                partition.neoCon.close()
+            self.partitions = []
+        totAmt = sum(result[2] for result in results)
+        for rc, msg, x in results:
+            if rc == False:
+                return rc, msg, totAmt
+        if self.stopScan == True:
+            return True, "Scan {} stopped".format(self.phaseName(objectType)), totAmt
+        return True, results[-1][1], totAmt
+
+    def mergeNodePatterns(self, partition):
+        '''
+        add the node patterns found by a partition to this engine.  new patterns are added in the order the partition found them
+        '''
+        for labels in partition.patternList:
+            partName = partition.getNodePattern(labels)
+            partData = partition.nodeDict[partName]
+            patternName = self.getNodePattern(labels)
+            nodeData = self.nodeDict[patternName]
+            nodeData["count"] = nodeData["count"] + partData["count"]
+            for propName, dataType in partData["propDataType"].items():
+                nodeData["propDataType"].setdefault(propName, dataType)
+            self.mergeProps(patternData=nodeData, propSet=self.nodePropIndex[patternName], propNames=partData["propList"])
+
+    def mergeRelPatterns(self, partition):
+        '''
+        add the relationship patterns found by a partition to this engine.  new patterns are added in the order the partition found them
+        '''
+        for partKey, partData in partition.relDict.items():
+            relKey = self.getRelPattern(partData["relName"], partData["fromTemplate"], partData["toTemplate"])
+            relData = self.relDict[relKey]
+            relData["count"] = relData["count"] + partData["count"]
+            for propName, dataType in partData["propDataType"].items():
+                relData["propDataType"].setdefault(propName, dataType)
+            self.mergeProps(patternData=relData, propSet=self.relPropIndex[relKey], propNames=partData["propList"])
+
+    def cancel(self, ):
+        '''
+        stop the scan and terminate the queries running on the server
+        '''
+        self.stopScan = True
+        for partition in list(self.partitions):
+            partition.stopScan = True
+            partition.neoCon.cancel()
+        return self.neoCon.cancel()
+
+    def getHighID(self, objectType=None):
+        '''
+        return the highest node or relationship id in use.  the scan stops when it passes this id
+        '''
+        if objectType == "Node":
+            cypher = "match (n) return max(id(n)) as highID"
+        else:
+            cypher = "match ()-[r]->() return max(id(r)) as highID"
+        rc1, msg1 = self.neoCon.runCypherAuto(cypher, readOnly=True, useCache=False)
+        if rc1 == False:
+            raise Exception("Get Highest {} ID Error {}".format(objectType, msg1))
+        highID = self.neoCon.resultSet[0]["highID"]
+        # an empty graph has no id's
+        if highID is None:
+            return -1
+        return highID
+
+    def schemaScan(self, ):
+        '''
+        build nodeDict and relDict from the schema procedures and the count store instead of scanning every node and relationship.
+        the counts are estimates, use scanAll for exact counts.
+        '''
+        rc = False
+        msg = "Fast Scan finished"
+        if self.scanNodes == True:
+            self.displayScanMsg("Start Fast Scan of Node Patterns.")
+            try:
+                rc1, msg1 = self.neoCon.runCypherAuto("call db.schema.nodeTypeProperties() yield nodeLabels, propertyName, propertyTypes return nodeLabels, propertyName, propertyTypes",
+                                                                        readOnly=True, useCache=False)
+                if rc1 == True:
+                    labelCounts = {}
+                    for record in self.neoCon.resultSet:
+                        labels = sorted(record["nodeLabels"])
+                        patternName = self.getNodePattern(labels)
+                        propName = record["propertyName"]
+                        if not propName is None:
+                            self.mergeProps(patternData=self.nodeDict[patternName], propSet=self.nodePropIndex[patternName], propNames=[propName])
+                            self.nodeDict[patternName]["propDataType"][propName] = self.getSchemaDataType(record["propertyTypes"])
+                    # a pattern has at most as many nodes as its least used label
+                    for patternName, nodeData in self.nodeDict.items():
+                        counts = [self.getLabelCount(label, labelCounts) for label in nodeData["labelList"]]
+                        if len(counts) > 0:
+                            nodeData["count"] = min(counts)
+                    rc = True
+                    msg = "Fast Scan found {} Node Patterns. Node counts are the count store total for the least used label in the pattern.".format(len(self.nodeDict))
+                else:
+                    msg = "Fast Scan Nodes Error {}".format(msg1)
+            except BaseException as e:
+                msg = "{} - Fast Node Scan failed.".format(repr(e))
+            finally:
+                self.displayScanMsg(msg)
+
+        if self.scanRels == True and self.stopScan == False:
+            self.displayScanMsg("Start Fast Scan of Relationship Patterns.")
+            try:
+                rc1, msg1 = self.neoCon.runCypherAuto("call db.schema.relTypeProperties() yield relType, propertyName, propertyTypes return relType, propertyName, propertyTypes",
+                                                                        readOnly=True, useCache=False)
+                if rc1 == True:
+                    # relType is returned as :`TYPE`
+                    relTypeProps = {}
+                    for record in self.neoCon.resultSet:
+                        relType = record["relType"][1:].strip("`")
+                        relTypeProps.setdefault(relType, {})
+                        if not record["propertyName"] is None:
+                            relTypeProps[relType][record["propertyName"]] = self.getSchemaDataType(record["propertyTypes"])
+                    sampleSize = self.processSize
+                    for relType in sorted(relTypeProps.keys()):
+                        if self.stopScan == True:
+                            break
+                        # the schema procedures don't say which node patterns a relationship type connects, so get them from a sample of the relationships
+                        cypher = "match (f)-[r:`{}`]->(t) with labels(f) as fromLbls, labels(t) as toLbls limit $sampleSize return fromLbls, toLbls, count(*) as sampleCount".format(relType)
+                        rc1, msg1 = self.neoCon.runCypherAuto(cypher, {"sampleSize": sampleSize}, readOnly=True, useCache=False)
+                        if rc1 == False:
+                            raise Exception("Sample {} Error {}".format(relType, msg1))
+                        samples = [(sorted(record["fromLbls"]), sorted(record["toLbls"]), record["sampleCount"]) for record in self.neoCon.resultSet]
+                        sampleTotal = sum(sample[2] for sample in samples)
+                        rc1, msg1 = self.neoCon.runCypherAuto("match ()-[r:`{}`]->() return count(r) as relCount".format(relType), readOnly=True, useCache=False)
+                        if rc1 == False:
+                            raise Exception("Count {} Error {}".format(relType, msg1))
+                        relCount = self.neoCon.resultSet[0]["relCount"]
+                        for fromLbls, toLbls, sampleCount in samples:
+                            relKey = self.getRelPattern(relType, self.getNodeTemplateName(fromLbls), self.getNodeTemplateName(toLbls))
+                            # split the count store total across the patterns in proportion to the sample
+                            self.relDict[relKey]["count"] = self.relDict[relKey]["count"] + int(round(relCount * sampleCount / sampleTotal))
+                            self.mergeProps(patternData=self.relDict[relKey], propSet=self.relPropIndex[relKey], propNames=list(relTypeProps[relType].keys()))
+                            self.relDict[relKey]["propDataType"] = dict(relTypeProps[relType])
+                        self.displayScanMsg("Relationship Type: {} Count: {} Patterns: {}".format(relType, relCount, len(samples)))
+                    rc = True
+                    msg = "Fast Scan found {} Relationship Patterns. Relationship counts are estimated from a sample of {} per type.".format(len(self.relDict), sampleSize)
+                else:
+                    rc = False
+                    msg = "Fast Scan Relationships Error {}".format(msg1)
+            except BaseException as e:
+                rc = False
+                msg = "{} - Fast Relationship Scan failed.".format(repr(e))
+            finally:
+                self.displayScanMsg(msg)
+
+        return rc, msg
+
+    def getSchemaDataType(self, propertyTypes):
+        '''
+        convert the list of types returned by the schema procedures to a datatype.  properties with mixed types are Unknown
+        '''
+        if propertyTypes is None or len(propertyTypes) != 1:
+            return DataType.UNKNOWN.value
+        return SCHEMATYPES.get(propertyTypes[0], DataType.UNKNOWN.value)
+
+    def getLabelCount(self, label, labelCounts):
+        '''
+        get the number of nodes with a label from the count store
+        '''
+        if not label in labelCounts:
+            rc1, msg1 = self.neoCon.runCypherAuto("match (n:`{}`) return count(n) as labelCount".format(label), readOnly=True, useCache=False)
+            if rc1 == False:
+                raise Exception("Count {} Error {}".format(label, msg1))
+            labelCounts[label] = self.neoCon.resultSet[0]["labelCount"]
+        return labelCounts[label]
+
+    def getNodePattern(self, labels):
+        '''
+        return the nodeDict key for a label combination, adding the pattern if it is new
+        '''
+        labelSet = frozenset(labels)
+        patternName = self.patternIndex.get(labelSet, None)
+        if patternName is None:
+            nextx = len(self.patternList)
+            self.patternList.insert(nextx, labels)
+            patternName = "{0:0>5}".format(nextx)
+            self.nodeDict[patternName]={}
+            self.nodeDict[patternName]["propList"] = []
+            self.nodeDict[patternName]["labelList"] = labels
+            self.nodeDict[patternName]["templateName"] = "Node{}".format(patternName)
+            self.nodeDict[patternName]["templateLblName"] = "{}".format("_".join(labels))
+            self.nodeDict[patternName]["propDataType"] = {}
+            self.nodeDict[patternName]["count"] = 0
+            self.patternIndex[labelSet] = patternName
+            self.nodePropIndex[patternName] = set()
+        return patternName
+
+    def getNodeTemplateName(self, labels):
+        '''
+        return the template name of the node pattern that matches the labels
+        '''
+        patternName = self.patternIndex.get(frozenset(labels), None)
+        if patternName is None or not patternName in self.nodeDict:
+            return "Unknown"
+        return self.nodeDict[patternName]["templateLblName"]
+
+    def getRelPattern(self, relType, fromTemplate, toTemplate):
+        '''
+        return the relDict key for a relationship type between two node templates, adding the pattern if it is new
+        '''
+        relKey = "{}:{}:{}".format(relType, fromTemplate, toTemplate )
+        if not relKey in self.relDict:
+            # count how many times the relType has been used in a rel template
+            countReltypeUsed = self.countRelType(relType)
+            self.relDict[relKey]={}
+            self.relDict[relKey]["propList"] = []
+            self.relDict[relKey]["propDataType"] = {}
+            if countReltypeUsed > 0:
+                self.relDict[relKey]["templateName"] = "{0}{1:0>3}".format(relType, countReltypeUsed)
+            else:
+                self.relDict[relKey]["templateName"] = relType
+            self.relDict[relKey]["relName"] = relType
+            self.relDict[relKey]["fromTemplate"] = fromTemplate
+            self.relDict[relKey]["toTemplate"] = toTemplate
+            self.relDict[relKey]["count"] = 0
+            self.relTypeCount[relType] = countReltypeUsed + 1
+            self.relPropIndex[relKey] = set()
+        return relKey
+
+    def processModelChunk(self, resultSet=None):
+        '''
+        tally a chunk of node records, resultSet defaults to the result of the last scan query.  returns the number of nodes processed
+        '''
+        if resultSet is None:
+            resultSet = self.neoCon.resultSet
+        ctr = 0
+        lookups = []
+        for record in resultSet:
+            # an aggregated chunk has one record per pattern with the number of objects that match it
+            patternCount = record.get("patternCount", 1)
+            ctr = ctr + patternCount
+            propValues = record.get("props", None)
+            propNames = record.get("keys(n)", None)
+            if propNames is None:
+                propNames = list(propValues)
+            patternName = self.getNodePattern(record["labels(n)"])
+            nodeData = self.nodeDict[patternName]
+            nodeData["count"] = nodeData["count"] + patternCount
+            # merge in any newly discovered properties and get their datatypes
+            newProps = self.mergeProps(patternData=nodeData, propSet=self.nodePropIndex[patternName], propNames=propNames)
+            if len(newProps) > 0:
+                if propValues is None:
+                    lookups.extend([(record["nodeID"], propName, nodeData["propDataType"]) for propName in newProps])
+                else:
+                    self.getDataTypes(propValues=propValues, propDataTypeDict=nodeData["propDataType"], propList=newProps )
+        if len(lookups) > 0:
+            self.lookupDataTypes("Node", lookups)
+        return ctr
+
+    def processRelModelChunk(self, resultSet=None):
+        '''
+        tally a chunk of relationship records, resultSet defaults to the result of the last scan query.  returns the number of relationships processed
+        '''
+        if resultSet is None:
+            resultSet = self.neoCon.resultSet
+        ctr = 0
+        lookups = []
+        for record in resultSet:
+            # an aggregated chunk has one record per pattern with the number of objects that match it
+            patternCount = record.get("patternCount", 1)
+            ctr = ctr + patternCount
+            propValues = record.get("props", None)
+            propNames = record.get("keys(r)", None)
+            if propNames is None:
+                propNames = list(propValues)
+            # get from and to node templates
+            fromTemplate = self.getNodeTemplateName(record["labels(f)"])
+            toTemplate = self.getNodeTemplateName(record["labels(t)"])
+            relKey = self.getRelPattern(record["type(r)"], fromTemplate, toTemplate)
+            relData = self.relDict[relKey]
+            relData["count"] = relData["count"] + patternCount
+            # merge in any newly discovered properties and get their datatypes
+            newProps = self.mergeProps(patternData=relData, propSet=self.relPropIndex[relKey], propNames=propNames)
+            if len(newProps) > 0:
+                if propValues is None:
+                    lookups.extend([(record["relID"], propName, relData["propDataType"]) for propName in newProps])
+                else:
+                    self.getDataTypes(propValues=propValues, propDataTypeDict=relData["propDataType"], propList=newProps )
+        if len(lookups) > 0:
+            self.lookupDataTypes("Relationship", lookups)
+        return ctr
+
+    def lookupDataTypes(self, objectType=None, lookups=None):
+        '''
+        get the datatypes of properties the scan only returned the keys of.  lookups is a list of (object id, property name, propDataType dictionary).
+        new property keys are rare after the first few chunks so this is one small query now and then instead of every property value in every record
+        '''
+        if objectType == "Node":
+            cypher = "unwind $lookups as lookup match (n) where id(n) = lookup[0] return lookup[0] as objectID, lookup[1] as propName, n[lookup[1]] as value"
+        else:
+            cypher = "unwind $lookups as lookup match ()-[r]->() where id(r) = lookup[0] return lookup[0] as objectID, lookup[1] as propName, r[lookup[1]] as value"
+        rc1, msg1 = self.neoCon.runCypherAuto(cypher, {"lookups": [[objectID, propName] for objectID, propName, propDataTypeDict in lookups]}, readOnly=True, useCache=False)
+        if rc1 == False:
+            self.displayScanMsg("Get {} property datatypes failed - {}".format(objectType, msg1))
+            return
+        typeDicts = {(objectID, propName): propDataTypeDict for objectID, propName, propDataTypeDict in lookups}
+        for record in self.neoCon.resultSet:
+            self.getDataTypes(propValues={record["propName"]: record["value"]}, propDataTypeDict=typeDicts[(record["objectID"], record["propName"])], propList=[record["propName"]])
+
+    def countRelType(self, relType):
+        return self.relTypeCount.get(relType, 0)
+
+    def benchmark(self, numRecords=100000, numPatterns=1000, numRelTypes=20):
+        '''
+        time the tally of a synthetic stream of node and relationship records without a database.
+        the records cycle through numPatterns label combinations and numPatterns relationship patterns.
+        returns a dictionary with the seconds and microseconds per record for each record type
+        '''
+        self.newScan()
+        labelSets = [["Label{}".format(x), "Group{}".format(x % 10)] for x in range(numPatterns)]
+        nodeRecords = [{"labels(n)": labelSets[x % numPatterns], "props": {"name": "node{}".format(x), "prop{}".format(x % 7): x}} for x in range(numRecords)]
+        relRecords = [{"type(r)": "REL{}".format(x % numRelTypes), "labels(f)": labelSets[x % numPatterns], "labels(t)": labelSets[(x * 7) % numPatterns],
+                            "props": {"weight": x / 10}} for x in range(numRecords)]
+        timings = {}
+        for recordType, processChunk, records in [("Node", self.processModelChunk, nodeRecords), ("Relationship", self.processRelModelChunk, relRecords)]:
+            startTime = time.perf_counter()
+            for chunkStart in range(0, numRecords, self.processSize):
+                processChunk(resultSet=records[chunkStart:chunkStart + self.processSize])
+            elapsed = time.perf_counter() - startTime
+            timings[recordType] = {"seconds": elapsed, "usPerRecord": elapsed * 1000000 / max(numRecords, 1)}
+        timings["nodePatterns"] = len(self.nodeDict)
+        timings["relPatterns"] = len(self.relDict)
+        self.newScan()
+        return timings
+
+class ScanThread(QThread):
+    '''
+    This class runs a ScanEngine on a subthread so the gui stays responsive while the database is scanned.
+    scanMessage and scanProgress are emitted as the scan runs, scanComplete is emitted when it finishes.
+    the ScanEngine should have its own NeoDriver so the gui thread can keep using the model's NeoDriver.
+    '''
+    scanMessage = pyqtSignal(str)
+    scanProgress = pyqtSignal(dict)
+    scanComplete = pyqtSignal(bool, str)
+
+    def __init__(self, scanEngine=None):
+        QThread.__init__(self)
+        self.scanEngine = scanEngine
+        self.scanEngine.msgCallback = self.scanMessage.emit
+        self.scanEngine.progressCallback = self.scanProgress.emit
+
+    def cancel(self, waitTime=5000):
+        '''
+        stop the scan, terminate the query that is running on the server and wait up to waitTime milliseconds for the thread to finish
+        '''
+        rc = True
+        msg = "Scan not running"
+        if self.isRunning():
+            rc, msg = self.scanEngine.cancel()
+            self.wait(waitTime)
+        return rc, msg
+
+    def run(self, ):
+        try:
+            rc, msg = self.scanEngine.run()
+        except BaseException as e:
+            rc = False
+            msg = "{} - Scan failed.".format(repr(e))
+        self.scanComplete.emit(rc, msg)
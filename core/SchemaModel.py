@@ -138,7 +138,7 @@ class SchemaModel():
         Return False, Msg if it doesn't work
         '''
         try:
-            rc, msg = self.modelNeoDriver.runCypherAuto("match (n) return n limit 1")
+            rc, msg = self.modelNeoDriver.runCypherAuto("match (n) return n limit 1", readOnly=True, useCache=False)
         except Exception as e:
             return False, repr(e)
             
@@ -151,7 +151,7 @@ class SchemaModel():
         try:
             cypher = 'call db.indexes()'
             #run the query
-            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher)
+            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 # convert the records to dictionaries so we can add a name property
                 for rec in self.modelNeoDriver.resultSet:
@@ -197,7 +197,7 @@ class SchemaModel():
         try:
             cypher = 'call dbms.security.listUsers()'
             #run the query
-            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher)
+            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 self.schemaData["User"] = self.modelNeoDriver.resultSet
                 # create a common "name" key
@@ -220,7 +220,7 @@ class SchemaModel():
         try:
             cypher = 'call dbms.security.listRoles()'
             #run the query
-            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher)
+            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 self.schemaData["Role"] = self.modelNeoDriver.resultSet
                 # create a common "name" key
@@ -244,7 +244,7 @@ class SchemaModel():
         try:
             cypher = "CALL dbms.security.listUsersForRole('{}')".format(roleName)
             #run the query
-            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher)
+            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 roleUsers = [row["value"] for row in self.modelNeoDriver.resultSet]
                 msg = "Roles retrieved {}".format(str(roleUsers) )        
@@ -266,7 +266,7 @@ class SchemaModel():
         try:
             cypher = "CALL dbms.security.listRolesForUser('{}')".format(userName)
             #run the query
-            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher)
+            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 userRoles = [row["value"] for row in self.modelNeoDriver.resultSet]
                 msg = "Roles retrieved {}".format(str(userRoles) )        
@@ -288,7 +288,7 @@ class SchemaModel():
         try:
             cypher = 'call db.constraints()'
             #run the query
-            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher)
+            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 # convert result records to dictionaries
                 resultDict = []
@@ -445,7 +445,7 @@ class SchemaModel():
         try:
             cypher = 'call db.labels()'
             #run the query
-            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher)
+            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 # convert the records to dictionaries so we can add a name property
                 for rec in self.modelNeoDriver.resultSet:
@@ -471,7 +471,7 @@ class SchemaModel():
         try:
             cypher = 'call db.propertyKeys()'
             #run the query
-            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher)
+            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 # convert the records to dictionaries so we can add a name property
                 for rec in self.modelNeoDriver.resultSet:
@@ -497,7 +497,7 @@ class SchemaModel():
         try:
             cypher = 'call db.relationshipTypes()'
             #run the query
-            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher)
+            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 # convert the records to dictionaries so we can add a name property
                 for rec in self.modelNeoDriver.resultSet:
@@ -644,7 +644,7 @@ class SchemaModel():
             cypherCmd = "CALL dbms.security.listUsers()"
             self.logMessage("Attempting: {}".format(cypherCmd))
             #run the query
-            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypherCmd)
+            rc1, msg1 = self.modelNeoDriver.runCypherAuto(cypherCmd, readOnly=True)
             if rc1:
                 for user in self.modelNeoDriver.resultSet:
                     if user["username"] == userName:
@@ -159,28 +159,29 @@ class Helper():
         node is the node object that represents what the node is in the database
         nodeInstanceDict is the dictionary that represents what the user entered on the UI 
         The  goal is to remove all existing labels and properties and replace them with all the labels and properties from the UI.
+        returns the cypher statement and the parameter dictionary to run it with
         '''
-        p1 = neoID
+        parms = {"nodeID": int(neoID)}
         # remove all labels
         p2 = self.genRemoveLblList("n", node)
         # remove propList from the db
         p3 = self.genRemovePropList("n", node)
         # set prop equal list
-        p4 = self.genSetPropList("n", nodeInstanceDict)
+        p4 = self.genSetPropList("n", nodeInstanceDict, parms)
         # set lbl list
         p5 = self.genSetLabelList("n", nodeInstanceDict)
         cypher = """match (n) 
-                        where id(n) = {}   
+                        where id(n) = $nodeID   
                         {}  
                         {}
                         {}
                         {} 
-                        return n """.format(p1, p2, p3, p4, p5)
+                        return n """.format(p2, p3, p4, p5)
 
 #  this was commented out because return data after a constraint violation will cause the next cypher command to bomb                      
 #                        return n """.format(p1, p2, p3, p4, p5)
         
-        return cypher
+        return cypher, parms
         
     def genCreateRelCypher(self, relInstanceDict = None, rel = None, fromNeoID = None, toNeoID=None):
         '''
@@ -191,24 +192,24 @@ class Helper():
         fromNeoID is the id of the from node used for matching
         toNeoID is the id of the to node used for matching
         The  goal is to match the from and to nodes and add a new relationship between them
+        returns the cypher statement and the parameter dictionary to run it with
         '''
-        p1 = fromNeoID
-        p2 = toNeoID
+        parms = {"fromID": int(fromNeoID), "toID": int(toNeoID)}
         # the relationship name
         p3 = relInstanceDict.get("relName", "")
         # property set list
-        p4 = self.genSetPropList("r", relInstanceDict)
+        p4 = self.genSetPropList("r", relInstanceDict, parms)
         cypher = """match (f) \n 
-                        where id(f) = {}  \n 
+                        where id(f) = $fromID  \n 
                         with f \n
                         match (t) \n
-                        where id(t) = {}  \n 
+                        where id(t) = $toID  \n 
                         with f,t
                         create (f)-[r:{}]->(t)
                         {}
                         return id(r), r
-                                            """.format(p1, p2, p3, p4)
-        return cypher
+                                            """.format(p3, p4)
+        return cypher, parms
         
     def genUpdateRelCypher(self, relInstanceDict=None, relID=None, rel=None):
         '''
@@ -217,20 +218,21 @@ class Helper():
         rel is the relationship object that represents what the relationship is in the db
         relInstanceDict is the dictionary that represents what the user entered on the UI 
         The  goal is to match an existing relationship and update its properties
+        returns the cypher statement and the parameter dictionary to run it with
         '''
-        p1 = str(relID)
+        parms = {"relID": int(relID)}
         p2 = self.genRemovePropList("r", rel)
-        p3 = self.genSetPropList("r", relInstanceDict)
+        p3 = self.genSetPropList("r", relInstanceDict, parms)
         cypher = """match ()-[r]->() \n 
-                        where id(r) = {}  \n 
+                        where id(r) = $relID  \n 
                         {} \n
                         {} \n 
-                        return id(r), r """.format(p1, p2, p3)
+                        return id(r), r """.format(p2, p3)
                         
 # if you return data after a constraint violation it will crash the system on the next cypher call
 #                        return id(r), r """.format(p1, p2, p3)
                          
-        return cypher   
+        return cypher, parms
         
     def genSetLabelList(self, nodeName, nodeInstanceDict):
         '''
@@ -256,13 +258,23 @@ class Helper():
             propList = ",".join(nodeName + "." + prop[0] + " = " + self.genPropEqualTo(dataValue = prop[2], neoType=prop[1]) for prop in nodeInstanceDict["properties"] if prop[2] != "Null")
         return propList
         
-    def genSetPropList(self, nodeName, objectDict):
-        propList = ""
-        if len(objectDict["properties"]) > 0:
-            propList = ",".join(nodeName + "." + prop[0] + " = " + self.genPropEqualTo(dataValue = prop[2], neoType=prop[1]) for prop in objectDict["properties"] if prop[2] != "Null")
-            if propList != "":
-                return "set " + propList
-        return propList
+    def genSetPropList(self, nodeName, objectDict, parms):
+        '''
+        return a set statement for all the properties.  the property values are added to the parms dictionary
+        raises ValueError if a property value doesn't convert to its datatype
+        '''
+        setList = []
+        for prop in objectDict["properties"]:
+            if prop[2] != "Null":
+                parmName = "{}_p{}".format(nodeName, len(setList))
+                try:
+                    setEqualTo, parms[parmName] = self.genPropParm(dataValue = prop[2], neoType=prop[1], parmName=parmName)
+                except ValueError as e:
+                    raise ValueError("Property {} - {}".format(prop[0], str(e)))
+                setList.append(nodeName + "." + prop[0] + " = " + setEqualTo)
+        if len(setList) > 0:
+            return "set " + ",".join(setList)
+        return ""
     
     def genPropList(self, nodeName, nodeInstanceDict):
         '''
@@ -341,6 +353,10 @@ class Helper():
 #            setEqualTo = ""
 #        
 #        return setEqualTo
+
+    def genPropParm(self, dataValue=None, neoType=None, parmName=None):
+        
+        return self.neoTypeFunc.genPropParm(dataValue=dataValue, neoType=neoType, parmName=parmName)
         
     def moveListItemUp(self, listWidget):
         '''
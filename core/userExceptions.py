@@ -68,3 +68,12 @@ class neo4jError(Error):
     """
     def __init__(self, message):
         self.message = message
+
+class queryCancelledError(Error):
+    """
+    Exception raised when a query is cancelled while its records are being fetched.
+    Attributes:  
+        message -- explanation of the error
+    """
+    def __init__(self, message):
+        self.message = message
@@ -99,10 +99,9 @@ class CopyNodeToDiagramDlg(QDialog, Ui_CopyNodeToDiagramDlg):
         '''
         try:
             msg = None
-            p1 = str(nodeID)
-            p2 = str(nodeIDList)
+            parms = {"nodeID": int(nodeID), "nodeIDList": [int(x) for x in nodeIDList]}
             cypher = '''match (f)-[r]->(t)
-                            where ((id(f) = {} and id(t) in {}) or (id(t) = {} and id(f) in {}))
+                            where ((id(f) = $nodeID and id(t) in $nodeIDList) or (id(t) = $nodeID and id(f) in $nodeIDList))
                             return id(f),
                                     f.NZID,
                                     f, 
@@ -113,10 +112,10 @@ class CopyNodeToDiagramDlg(QDialog, Ui_CopyNodeToDiagramDlg):
                                     id(t),
                                     t.NZID,
                                     t
-                            '''.format(p1, p2, p1, p2)
+                            '''
 #            print(cypher)
             #run the query
-            rc1, msg1 = self.syncNeoCon.runCypherAuto(cypher)
+            rc1, msg1 = self.syncNeoCon.runCypherAuto(cypher, parms)
 
         except BaseException as e:
             msg = "{} - Get Relationships failed.".format(repr(e))
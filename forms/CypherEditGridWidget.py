@@ -218,6 +218,9 @@ class CypherEditGridWidget(QWidget, Ui_cypherEditGridWidget):
                 displayName = self.fileName
             if self.helper.saveChangedObject("Cypher File", displayName): 
                 self.save()
+        # give the shared neo4j driver back
+        self.dataGrid.waitPrefetch()
+        self.neoDriver.close()
         return True
 
 ##############################################################
@@ -460,6 +463,8 @@ class CypherEditGridWidget(QWidget, Ui_cypherEditGridWidget):
     def doCommit(self):
         self.logMsg("User request Commit the transaction")
         if not self.neoDriver is None:
+            # the data grid may be prefetching from a cursor in this transaction
+            self.dataGrid.waitPrefetch()
             rc, msg = self.neoDriver.commitTxn()
             self.logMsg("Commit Complete - {}".format(msg))
             
@@ -473,6 +478,8 @@ class CypherEditGridWidget(QWidget, Ui_cypherEditGridWidget):
     def doRollBack(self):
         self.logMsg("User request Rollback the transaction")
         if not self.neoDriver is None:
+            # the data grid may be prefetching from a cursor in this transaction
+            self.dataGrid.waitPrefetch()
             rc, msg = self.neoDriver.rollbackTxn()
             self.logMsg("Rollback Complete - {}".format(msg))
         
@@ -17,6 +17,7 @@ You should have received a copy of the GNU General Public License along with Nod
 """
 
 import datetime
+import time
 import csv
 import logging
 
@@ -30,6 +31,7 @@ from core.helper import Helper
 from core.Enums import DataType
 from core.NeoEditDelegate import NeoEditDelegate
 from core.NeoTypeFunc import NeoTypeFunc
+from core.NeoThread import NeoThread
 from forms.Ui_DataGridWidget import Ui_DataGridWidget
 from forms.GetCursorDlg import GetCursorDlg
 from forms.ExportCSVFile import DlgExportCSV
@@ -39,6 +41,8 @@ from forms.EditRelDlg import EditRelDlg
 DATA, LOG, TRACE = range(3)
 
 TS, DURATION, CYPHER, PLAN,  ERROR,  UPDATES, LBLADD, LBLDEL, PROPSET, NODEADD,  NODEDEL, RELADD,  RELDEL, CONADD, CONDEL, IDXADD, IDXDEL = range(17)
+# per phase timing columns in the log grid
+AVAILAFTER, CONSUMEDAFTER, FIRSTREC, FETCH, MATERIALIZE, ROWS, BYTES = range(17, 24)
 
 LABEL, REQUIRED, NODEKEY = range(3)
 PROPERTY, EXISTS, UNIQUE, PROPNODEKEY = range(4)
@@ -80,6 +84,11 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
         
         # data grid scrolling
         self.topRow = 1
+        # the cypherLogDict and log grid row of the query the grid is paging thru.  the timing columns are updated as chunks are loaded
+        self.cursorLogDict = None
+        self.cursorLogRow = None
+        # thread that prefetches the next chunk of the cursor
+        self.prefetchThread = None
         
         # data grid cell selection variables
         self.saveIndex = None
@@ -109,7 +118,7 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
         self.gridLog.setColumnWidth(PLAN, 100)
         self.gridLog.setColumnWidth(ERROR, 100)
         self.gridLog.setColumnWidth(CYPHER, 500)
-        for x in range(UPDATES, IDXDEL+1):
+        for x in range(UPDATES, BYTES+1):
             self.gridLog.setColumnWidth(x, 150)
             
         self.gridLog.verticalHeader().setDefaultAlignment (Qt.AlignTop)
@@ -156,7 +165,7 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
     def createLogModel(self, ):
 #        TS, DURATION, CYPHER, ERROR, PLAN, UPDATES, LBLADD, LBLREMOVE, PROPSET, NODEADD,  NODEDEL, RELADD,  RELDEL, CONADD, CONDEL, IDXADD, IDXDEL = range(15)
 
-        model = QStandardItemModel(0, 17)
+        model = QStandardItemModel(0, 24)
         model.setHeaderData(TS, Qt.Horizontal, "Start Time")
         model.setHeaderData(DURATION, Qt.Horizontal, "Duration")
         model.setHeaderData(CYPHER, Qt.Horizontal, "Cypher")
@@ -174,6 +183,13 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
         model.setHeaderData(CONDEL, Qt.Horizontal, "Constraints Deleted")
         model.setHeaderData(IDXADD, Qt.Horizontal, "Indexes Added")
         model.setHeaderData(IDXDEL, Qt.Horizontal, "Indexes Deleted")
+        model.setHeaderData(AVAILAFTER, Qt.Horizontal, "Server Available After (ms)")
+        model.setHeaderData(CONSUMEDAFTER, Qt.Horizontal, "Server Consumed After (ms)")
+        model.setHeaderData(FIRSTREC, Qt.Horizontal, "First Record (s)")
+        model.setHeaderData(FETCH, Qt.Horizontal, "Fetch (s)")
+        model.setHeaderData(MATERIALIZE, Qt.Horizontal, "Materialize (s)")
+        model.setHeaderData(ROWS, Qt.Horizontal, "Rows")
+        model.setHeaderData(BYTES, Qt.Horizontal, "Bytes")
         
         model.rowsInserted.connect(self.autoScroll)
         
@@ -331,12 +347,49 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
             item15.setEditable(False)    
             item15.setData(Qt.AlignTop, Qt.TextAlignmentRole)  
 
-        model.appendRow([item1,item2,item3, itemX, itemE, item4,item5,item6,item7,item8,item9,item10,item11,item12,item13,item14,item15,])
+        model.appendRow([item1,item2,item3, itemX, itemE, item4,item5,item6,item7,item8,item9,item10,item11,item12,item13,item14,item15,] + self.genTimingItems(cypherLogDict))
         
         self.gridLog.resizeRowsToContents() 
         
         QTimer.singleShot(0, self.gridLog.scrollToBottom)
 
+    def genTimingItems(self, cypherLogDict):
+        '''
+        return the log grid items for the per phase timing columns
+        '''
+        itemList = []
+        for key, fmt in [("availableAfter", "{}"), ("consumedAfter", "{}"), ("firstRecord", "{:.3f}"), ("fetch", "{:.3f}"), 
+                                ("materialize", "{:.3f}"), ("rows", "{}"), ("bytes", "{}")]:
+            value = cypherLogDict.get(key, None)
+            if value is None:
+                item = QStandardItem('')
+            else:
+                item = QStandardItem(fmt.format(value))
+            item.setEditable(False)
+            item.setData(Qt.AlignTop | Qt.AlignRight, Qt.TextAlignmentRole)
+            itemList.append(item)
+        return itemList
+        
+    def updateGridRowTiming(self, ):
+        '''
+        refresh the timing columns of the log grid row for the query the grid is paging thru.
+        rows, bytes and timings keep adding up as chunks are pulled and the server timings arrive when the cursor closes.
+        '''
+        if self.cursorLogDict is None or self.cursorLogRow is None:
+            return
+        model = self.gridLog.model()
+        if self.cursorLogRow >= model.rowCount():
+            return
+        for column, item in enumerate(self.genTimingItems(self.cursorLogDict), start=AVAILAFTER):
+            model.setItem(self.cursorLogRow, column, item)
+            
+    def addMaterializeTime(self, seconds):
+        '''
+        add the time spent converting records and building grid items to the timings of the query the grid is paging thru
+        '''
+        if not self.cursorLogDict is None:
+            self.cursorLogDict["materialize"] = self.cursorLogDict.get("materialize", 0.0) + seconds
+        
     def autoScroll(self):
         # position on last row in gird
         lastRow = self.gridLog.model().rowCount()
@@ -346,6 +399,7 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
 
     def clearGridLog(self, ):
         self.gridLog.model().removeRows( 0, self.gridLog.model().rowCount() )
+        self.cursorLogRow = None
         
     @pyqtSlot()
     def on_btnExportLog_clicked(self):
@@ -366,6 +420,8 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
                     # save the file
                     with open(self.fileName, 'w', newline='') as csvfile:
                         csvWriter = csv.writer(csvfile, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+                        # write the column headers
+                        csvWriter.writerow(self.gridLog.model().headerData(col, Qt.Horizontal, Qt.DisplayRole) for col in range(self.gridLog.model().columnCount()))
                         for row in range(self.gridLog.model().rowCount()):
                             rowItems = []
                             for col in range(self.gridLog.model().columnCount()):
@@ -409,6 +465,8 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
             self.txtPosition.setText("")
         
     def clearModel(self):
+        # a prefetch for the old cursor is no longer needed
+        self.waitPrefetch()
         # if we already have a model get rid of it
         if not (self.resultSet is None):
             del self.resultSet        
@@ -417,7 +475,7 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
     def newResultModel(self):
         
 #        headers = self.neoCon.cursor.keys()
-        headers = self.neoCon.result.keys()
+        headers = self.neoCon.resultKeys
         if not (headers is None):
             self.resultModel = QStandardItemModel(0, len(headers))
             for index, header in enumerate(headers):
@@ -434,34 +492,43 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
         
         self.gridCypherData.resizeColumnsToContents()
         
-    def runFileCursor(self, ):
+    def runFileCursor(self, readOnly=False):
         '''
         1. start dialog box to Run a cypher query and return a cursor to the result set
         2. Retrieve the first chunk of data
+        readOnly is True when the query is known not to update the graph so it can run on a read replica
         '''
 #        QApplication.setOverrideCursor(Qt.WaitCursor)
         self.logMsg("User requests retrieve {}".format(self.genCypher.type))
         # clear the grid
         self.clearModel()
+        # the log grid row for this query is added once the first chunk is loaded
+        self.cursorLogRow = None
 
         try:
             rc = False 
             self.logMsg(self.cypher)
-            # the dialog box actually spins up a thread that runs the query
-            d = GetCursorDlg(neoCon=self.neoCon, cypher=self.cypher, mode="cursor", parmData=self.parmData)
+            # the dialog box actually spins up a thread that runs the query.
+            # only a read query is streamed, a query that updates the graph is read in full so its transaction commits right away
+            if readOnly == True:
+                cursorMode = "stream"
+            else:
+                cursorMode = "cursor"
+            d = GetCursorDlg(neoCon=self.neoCon, cypher=self.cypher, mode=cursorMode, parmData=self.parmData, readOnly=readOnly)
             if d.exec_():
                 rc1 = d.rc
                 msg1 = d.msg
 
+            # the timings for this query keep adding up as the grid pages thru it
+            self.cursorLogDict = self.neoCon.cypherLogDict
             if rc1:
                 self.logMsg("run cypher {}".format(msg1))
                 if not self.neoCon.stats is None:
                     self.logMsg("stats {}".format(self.neoCon.stats))
                 self.newResultModel()
-                #get the first chunk
-                x, msg2  = self.neoCon.forwardCursor()
+                #get the first chunk and start prefetching the next one
+                x, msg2  = self.forwardChunk()
                 self.logMsg("rows fetched: {} - {}".format(str(x), msg2))                
-                self.loadModelChunk()
                 self.tabWidget.setCurrentIndex(DATA)
                 self.displayDataRetrievedMsg()
                 # force a repaint of the grid.  this is needed as a workaround for MAC OS
@@ -478,6 +545,7 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
             self.logWatch()
             # add the row to the log grid
             self.addGridRow()
+            self.cursorLogRow = self.gridLog.model().rowCount() - 1
             # set tab focus depending on results
             QApplication.restoreOverrideCursor()
             if rc == False:
@@ -491,98 +559,47 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
             self.logMsg(msg)   
             
     # - append the table model with the current cursor chunk
-    def loadModelChunk(self,):
+    def loadModelChunk(self, convertedChunk=None):
+        '''
+        add the current cursor chunk to the grid.
+        convertedChunk is the output of convertChunk if it was already done on the prefetch thread
+        '''
+        startTime = time.perf_counter()
+        if convertedChunk is None:
+            convertedChunk = self.convertChunk(self.neoCon.cursorChunk)
+            
         self.gridCypherData.setSortingEnabled(False) 
         
-        for record in self.neoCon.cursorChunk:
+        for row in convertedChunk:
             itemList = []
-            # generate the qstandarditem for each column in the result set based on the editParmDict dictionary
-            # value has the correct python object for each cell in the result set
-            # need to store both the original value and the string representation
-            for index, value in enumerate(record.values()):
+            for index, (value, columnType, editable, dataType, displayText) in enumerate(row):
                 item = QStandardItem()
 #PROP, REQLBL, OPTLBL, NODEID, RELID, NODE, RELATIONSHIP, RELNAME     
-                if not self.editParmDict is None:
-                    columnType = self.editParmDict[index][0]
-                    editable  = self.editParmDict[index][1]
-                else:
-                    columnType = UNKNOWN
-                    editable = False
-                    
-                # get the data type of the retrieved data if not null
-                if not value is None:
-                    dataType = self.neoTypeFunc.getNeo4jDataType(value)
-                else:
-                    # get the property name from the header
-                    propName = self.gridCypherData.model().headerData(index,Qt.Horizontal, Qt.DisplayRole)
-                    if not self.editParmDict is None:
-                        dataTypeLookup = ""
-                        dataType = None
-                        # get the datatype defined for the property name in the node or rel template
-                        if "properties" in self.templateDict:
-                            dataTypeLookup = [prop[1] for prop in self.templateDict["properties"] if prop[0] == propName ]
-                        if len(dataTypeLookup) > 0:
-                            dataType = dataTypeLookup[0] 
-                        else:
-                            # see if you can infer the datatype from the column type
-                            if columnType == NODE:
-                                dataType = "Node"
-                            if columnType == RELATIONSHIP:
-                                dataType = "Relationship"   
-                            
-
-                        if dataType is None:
-                            dataType = DataType.UNKNOWN.value  
-                    else:
-                        dataType = DataType.UNKNOWN.value  
-                
                 # UNKNOWN DATA TYPES FROM DYNAMIC CYPHER
                 if columnType == UNKNOWN:
-                    if dataType == "Node":
-                        nodeText = ("({} {})".format(str(value.labels), str(dict(value))))
-                        item.setText(nodeText)
-                    else:
-                        if value is None:
-                            item.setText("Null")
-                        else:
-                            displayText = self.neoTypeFunc.convertTypeToString(value)
-                            item.setText(displayText)
+                    item.setText(displayText)
                     item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
                 # these are never editable so just display them
                 elif columnType in (NODEID, RELID, RELNAME):
                     item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                    item.setText(str(value))
+                    item.setText(displayText)
 
                 elif columnType == NODE:
 #                    if str(editable) != "True":
                     # if not editable then set the flags, otherwise the default flags are ok
                     if not editable:
                         item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                    if value is None:
-                        item.setText("Null")
-                    else:
-                        nodeText = ("({} {})".format(str(value.labels), str(dict(value))))
-                        item.setText(nodeText)    
+                    item.setText(displayText)    
                 
                 elif columnType == RELATIONSHIP:
-                    if str(editable) == "True":
-                        item.setText(str(value))
-                    else:
+                    if not str(editable) == "True":
                         item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                    
-                    if value is None:
-                        item.setText("Null")
-                    else:
-                        item.setText(str(value))                  
+                    item.setText(displayText)                  
                 
                 elif columnType == PROP:
                     if not editable:
                         item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                    if value is None:
-                        item.setText("Null")
-                    else:
-                        displayText = self.neoTypeFunc.convertTypeToString(value)
-                        item.setText(displayText)
+                    item.setText(displayText)
                         
                 elif columnType in (OPTLBL, REQLBL):
                     item.setFlags(Qt.NoItemFlags)
@@ -614,19 +631,148 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
             self.gridCypherData.model().appendRow(itemList)
         # set 
         self.gridCypherData.resizeColumnsToContents()
+        self.addMaterializeTime(time.perf_counter() - startTime)
     
+    def convertChunk(self, records):
+        '''
+        convert a chunk of records into grid rows.  each row is a list of tuples, one per column:
+        (value, columnType, editable, dataType, displayText)
+        this does not touch any widgets so it can run on the prefetch thread.
+        '''
+        convertedChunk = []
+        for record in records:
+            row = []
+            # generate the display values for each column in the result set based on the editParmDict dictionary
+            # value has the correct python object for each cell in the result set
+            # need to store both the original value and the string representation
+            for index, (propName, value) in enumerate(record.items()):
+#PROP, REQLBL, OPTLBL, NODEID, RELID, NODE, RELATIONSHIP, RELNAME     
+                if not self.editParmDict is None:
+                    columnType = self.editParmDict[index][0]
+                    editable  = self.editParmDict[index][1]
+                else:
+                    columnType = UNKNOWN
+                    editable = False
+                    
+                # get the data type of the retrieved data if not null
+                if not value is None:
+                    dataType = self.neoTypeFunc.getNeo4jDataType(value)
+                else:
+                    # the property name is the column name
+                    if not self.editParmDict is None:
+                        dataTypeLookup = ""
+                        dataType = None
+                        # get the datatype defined for the property name in the node or rel template
+                        if "properties" in self.templateDict:
+                            dataTypeLookup = [prop[1] for prop in self.templateDict["properties"] if prop[0] == propName ]
+                        if len(dataTypeLookup) > 0:
+                            dataType = dataTypeLookup[0] 
+                        else:
+                            # see if you can infer the datatype from the column type
+                            if columnType == NODE:
+                                dataType = "Node"
+                            if columnType == RELATIONSHIP:
+                                dataType = "Relationship"   
+                            
+
+                        if dataType is None:
+                            dataType = DataType.UNKNOWN.value  
+                    else:
+                        dataType = DataType.UNKNOWN.value  
+                
+                # generate the text displayed in the grid cell
+                displayText = ""
+                if columnType == UNKNOWN:
+                    if dataType == "Node":
+                        displayText = ("({} {})".format(str(value.labels), str(dict(value))))
+                    elif value is None:
+                        displayText = "Null"
+                    else:
+                        displayText = self.neoTypeFunc.convertTypeToString(value)
+                elif columnType in (NODEID, RELID, RELNAME):
+                    displayText = str(value)
+                elif columnType == NODE:
+                    if value is None:
+                        displayText = "Null"
+                    else:
+                        displayText = ("({} {})".format(str(value.labels), str(dict(value))))
+                elif columnType == RELATIONSHIP:
+                    if value is None:
+                        displayText = "Null"
+                    else:
+                        displayText = str(value)
+                elif columnType == PROP:
+                    if value is None:
+                        displayText = "Null"
+                    else:
+                        displayText = self.neoTypeFunc.convertTypeToString(value)
+                        
+                row.append((value, columnType, editable, dataType, displayText))
+            convertedChunk.append(row)
+            
+        return convertedChunk
+        
+    def startPrefetch(self, ):
+        '''
+        while the user looks at the current chunk, pull and convert the next chunk on a NeoThread
+        '''
+        if self.neoCon.streaming == True and self.neoCon.endReached == False and self.prefetchThread is None:
+            self.prefetchThread = NeoThread(neoCon=self.neoCon, mode="prefetch", chunkConverter=self.timedConvertChunk)
+            self.prefetchThread.start()
+            
+    def timedConvertChunk(self, records):
+        '''
+        convertChunk for the prefetch thread.  the conversion time is added to the materialize timing
+        '''
+        startTime = time.perf_counter()
+        convertedChunk = self.convertChunk(records)
+        self.addMaterializeTime(time.perf_counter() - startTime)
+        return convertedChunk
+            
+    def waitPrefetch(self, ):
+        '''
+        wait for the prefetch thread to finish.  this must be called before anything else uses the neoCon.
+        returns the converted rows and the records they were converted from
+        '''
+        convertedChunk = None
+        chunk = None
+        if not self.prefetchThread is None:
+            self.prefetchThread.wait()
+            convertedChunk = self.prefetchThread.convertedChunk
+            chunk = self.prefetchThread.chunk
+            self.prefetchThread = None
+        return convertedChunk, chunk
+        
+    def forwardChunk(self, ):
+        '''
+        move the cursor forward one chunk, load it into the grid, and start prefetching the next one.
+        '''
+        convertedChunk, chunk = self.waitPrefetch()
+        ctr, msg = self.neoCon.forwardCursor()
+        # only use the converted rows if forwardCursor handed out the prefetched chunk
+        if not (chunk is self.neoCon.cursorChunk):
+            convertedChunk = None
+        self.loadModelChunk(convertedChunk=convertedChunk)
+        self.updateGridRowTiming()
+        self.startPrefetch()
+        return ctr, msg
         
-    def runCypher(self, requestType, cypher):
+    def runCypher(self, requestType, cypher, parms=None):
         '''
         Run a Cypher query and return the entire result set
+        parms is the parameter dictionary for the $parameters in the cypher
         '''
         QApplication.setOverrideCursor(Qt.WaitCursor)
         self.logMsg("User requests {}".format(requestType))
+        # don't run a query while the prefetch thread is using the neoCon
+        self.waitPrefetch()
         try:
             rc = False 
             self.logMsg(cypher)
+            if parms:
+                self.logMsg("parameters {}".format(parms))
             #run the query
-            rc1, msg1 = self.neoCon.runCypherAuto(cypher)
+            rc1, msg1 = self.neoCon.runCypherAuto(cypher, parms)
             if rc1:
                 self.logMsg("{} Node {}".format(requestType, msg1))
                 self.logMsg("stats {}".format(self.neoCon.stats))
@@ -678,7 +824,7 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
                                                             )
                         if dlg.writeHeader:
 #                            csvwriter.writerow(self.neoCon.cursor.keys())
-                            csvwriter.writerow(self.neoCon.result.keys())
+                            csvwriter.writerow(self.neoCon.resultKeys)
                         for record in self.neoCon.resultSet:
                             csvwriter.writerow(record.values())        
                         self.helper.displayErrMsg("Export Query","Data Export Complete!")   
@@ -743,12 +889,11 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
         # if we are positioned inside the most recently retrieved chunk then get another chunk
         if self.topRow + 1 >= self.neoCon.chunkStart:
 #            print("begin chunkstart:{} chunkend:{} topRow:{}".format(self.neoCon.chunkStart, self.neoCon.chunkEnd, self.topRow))
-            ctr, msg = self.neoCon.forwardCursor()
+            ctr, msg = self.forwardChunk()
             # update trace tab
             self.logWatch()
             self.logMsg("Retrieved {} records. Message:{}".format(ctr, msg))
-            self.loadModelChunk()
-            self.topRow = self.topRow + self.neoCon.chunkSize + 1
+            self.topRow = self.topRow + ctr + 1
             # see if past end of tableview
             if self.topRow > self.gridCypherData.model().rowCount():
                 self.topRow = self.gridCypherData.model().rowCount()
@@ -778,9 +923,8 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
         """
         QApplication.setOverrideCursor(Qt.WaitCursor)
         self.logMsg("User requests scroll to end")
-        while self.neoCon.forwardCursor()[0] > 0:
+        while self.forwardChunk()[0] > 0:
             self.logMsg("Advanced to record {}".format(self.neoCon.chunkEnd))
-            self.loadModelChunk()
         index = self.gridCypherData.model().index(self.neoCon.chunkEnd-1, 0, parent = QModelIndex())
         self.gridCypherData.scrollTo(index, hint = QAbstractItemView.PositionAtTop)
         self.gridCypherData.selectRow(index.row())
@@ -790,8 +934,8 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
 
     def createBlankNode(self, ):
         self.neoID = None
-        self.cypher = self.genCypher.genNewNode()
-        self.runCypher("New Node", self.cypher) 
+        self.cypher, parms = self.genCypher.genNewNode()
+        self.runCypher("New Node", self.cypher, parms) 
         if self.neoCon.resultSet:
             self.neoID = self.neoCon.resultSet[0]["nodeID"]  
         return self.neoID
@@ -820,7 +964,8 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
             self.editParmDict = None
         
         if not self.cypher is None:
-            self.runFileCursor()
+            # a generated match is read only, a generic grid runs whatever cypher it was given
+            self.runFileCursor(readOnly=not self.genCypher.isGeneric())
         else:
             self.clearModel()
 
@@ -872,9 +1017,9 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
 #                print("delete rows {}-{}".format(startIndex.row()+1, endIndex.row()+1))
                 for row in range(startIndex.row(), endIndex.row()+1):
                     # delete the node in neo4j
-                    self.deleteDetachCypher = self.genCypher.genDeleteDetach(row=row, dataGrid=self.gridCypherData)
+                    self.deleteDetachCypher, parms = self.genCypher.genDeleteDetach(row=row, dataGrid=self.gridCypherData)
                     # do the update
-                    self.runCypher("Delete/Detach Node", self.deleteDetachCypher)
+                    self.runCypher("Delete/Detach Node", self.deleteDetachCypher, parms)
                 # refresh the grid to make deleted rows go away
                 self.on_btnRefresh_clicked()
             else:
@@ -988,16 +1133,16 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
             # force selection of this cell
             self.gridCypherData.setCurrentIndex(item.index())
             # update the node in neo4j
-            self.updateCypher = self.genCypher.genUpdateLabel(updateIndex=item.index(), dataGrid=self.gridCypherData)
+            self.updateCypher, parms = self.genCypher.genUpdateLabel(updateIndex=item.index(), dataGrid=self.gridCypherData)
             # do the update
-            self.runCypher("Update Label", self.updateCypher)     
+            self.runCypher("Update Label", self.updateCypher, parms)     
         if columnType == PROP:
             # generate a cypher match/set statement aka update
-            rc, self.updateCypher = self.genCypher.genUpdateProp(updateIndex=item.index(), dataGrid=self.gridCypherData)
+            rc, self.updateCypher, parms = self.genCypher.genUpdateProp(updateIndex=item.index(), dataGrid=self.gridCypherData)
 #            print("data changed from {} to {} cypher {}".format(self.saveData, item.index().data(role = Qt.DisplayRole), self.updateCypher))
             # do the update
             if rc == True:
-                self.runCypher("Update Property", self.updateCypher)
+                self.runCypher("Update Property", self.updateCypher, parms)
             else:
                 self.helper.displayErrMsg("Update Property", self.updateCypher)
     
@@ -1017,10 +1162,10 @@ class DataGridWidget(QWidget, Ui_DataGridWidget):
             if columnType == PROP:
 #                print("set item null {} at row:{} col:{}".format(selectedIndex.data(role = Qt.DisplayRole), selectedIndex.row(), selectedIndex.column()))
                 # generate a cypher match/set statement aka update
-                self.removeCypher = self.genCypher.genRemoveProp(updateIndex=selectedIndex, dataGrid=self.gridCypherData)
+                self.removeCypher, parms = self.genCypher.genRemoveProp(updateIndex=selectedIndex, dataGrid=self.gridCypherData)
                 # do the update
                 if self.removeCypher !=None:
-                    self.runCypher("Remove Property", self.removeCypher)   
+                    self.runCypher("Remove Property", self.removeCypher, parms)   
                     self.refreshGrid()
             else:
                 self.helper.displayErrMsg("Set Value Null", "You must select a property value.")
@@ -79,9 +79,9 @@ class EditNodeDlg(QDialog, Ui_EditNodeDlg):
                 rc, msg = self.createBlankNode()
                 if rc is True:
                     # now update the node in the neo4j instance
-                    updateCypher = self.helper.genUpdateCypher(neoID = self.neoID, nodeInstanceDict = self.getObjectDict(),  node = self.node)
+                    updateCypher, updateParms = self.helper.genUpdateCypher(neoID = self.neoID, nodeInstanceDict = self.getObjectDict(),  node = self.node)
 #                    print(updateCypher)
-                    rc, msg = self.neoCon.runCypherAuto(updateCypher)
+                    rc, msg = self.neoCon.runCypherAuto(updateCypher, updateParms)
                     QApplication.restoreOverrideCursor() 
                     if not rc == True:
                         self.helper.displayErrMsg("Create New Node", msg)
@@ -80,8 +80,8 @@ class EditRelDlg(QDialog, Ui_EditRelDlg):
                 selectedToNode = self.editRel.cmbToNode.currentText()
                 endIndex = selectedToNode.find("]")
                 toNeoID = selectedToNode[1:endIndex]
-                createCypher =  self.helper.genCreateRelCypher(relInstanceDict = self.getObjectDict(), fromNeoID = fromNeoID, toNeoID=toNeoID)
-                rc, msg = self.neoCon.runCypherExplicit(createCypher)
+                createCypher, createParms =  self.helper.genCreateRelCypher(relInstanceDict = self.getObjectDict(), fromNeoID = fromNeoID, toNeoID=toNeoID)
+                rc, msg = self.neoCon.runCypherExplicit(createCypher, parmData=createParms)
                 QApplication.restoreOverrideCursor() 
                 if not rc == True:
                     self.helper.displayErrMsg("Create New Relationship", msg)
@@ -27,7 +27,7 @@ class GetCursorDlg(QDialog, Ui_GetCursorDlg):
     """
     Class documentation goes here.
     """
-    def __init__(self, parent=None, neoCon=None, cypher=None, mode=None, parmData=None):
+    def __init__(self, parent=None, neoCon=None, cypher=None, mode=None, parmData=None, readOnly=False):
         """
         Constructor
         
@@ -44,7 +44,7 @@ class GetCursorDlg(QDialog, Ui_GetCursorDlg):
         self.timer = QTimer(self)
         self.timer.setInterval(1000)         
         self.timer.timeout.connect(self.timeRefresh)
-        self.neoThread = NeoThread(neoCon=self.neoCon, cypher=self.cypher, mode=mode, parmData=self.parmData)
+        self.neoThread = NeoThread(neoCon=self.neoCon, cypher=self.cypher, mode=mode, parmData=self.parmData, readOnly=readOnly)
         self.neoThread.neoCallComplete.connect(self.getReturnData)
         self.neoThread.finished.connect(self.getDataFinished)
         self.neoThread.start()
@@ -77,7 +77,8 @@ class GetCursorDlg(QDialog, Ui_GetCursorDlg):
         User clicks on Cancel button so close the dialog
         """
 #        print("btnCancel_clicked")
-        self.neoThread.exit(0)
+        # terminate the query on the server so the thread is done with the neoCon before the dialog closes
+        self.neoThread.cancel()
         self.timer.stop()
         self.rc = False
         self.msg = "User Cancelled Query"
@@ -669,7 +669,7 @@ class GraphicsScene(QGraphicsScene):
         # add it to the diagramEditor's list of node/rels
         self.parent.itemDict[nodeTemplateItem.NZID] = nodeTemplateItem
         # save it to the diagram list of item dictionaries in the project model
-        self.parent.diagramDict["items"].append(nodeTemplateItem.getObjectDict())        
+        self.parent.addDiagramItem(nodeTemplateItem.getObjectDict())        
         self.model.setModelDirty()        
         # reset the editor mode to "point"
         self.parent.checkModeButton(self.parent.btnPoint)
@@ -690,7 +690,7 @@ class GraphicsScene(QGraphicsScene):
             # add it to the diagramEditor's list of node/rels
             self.parent.itemDict[nodeTemplateItem.NZID] = nodeTemplateItem
             # save it to the diagram list of item dictionaries in the project model
-            self.parent.diagramDict["items"].append(nodeTemplateItem.getObjectDict())
+            self.parent.addDiagramItem(nodeTemplateItem.getObjectDict())
             self.model.setModelDirty()
             self.model.updateTV()   
         # set the edit mode back to pointer
@@ -753,7 +753,7 @@ class GraphicsScene(QGraphicsScene):
                     # add it to the diagramEditor's list of node/rels
                     self.parent.itemDict[nodeInstance.NZID] = nodeItem
                     # save it to the diagram list of item dictionaries in the project model
-                    self.parent.diagramDict["items"].append(nodeItem.getObjectDict())  
+                    self.parent.addDiagramItem(nodeItem.getObjectDict())  
                     self.model.updateTV()         
                     self.model.setModelDirty()       
         # reset the editor mode to "point"
@@ -775,7 +775,7 @@ class GraphicsScene(QGraphicsScene):
         # add it to the diagramEditor's list of node/rels
         self.parent.itemDict[nodeInstance.NZID] = nodeItem
         # save it to the diagram list of item dictionaries in the project model
-        self.parent.diagramDict["items"].append(nodeItem.getObjectDict())       
+        self.parent.addDiagramItem(nodeItem.getObjectDict())       
        
         # save or update the node instance item
         # sync to db - not sure why this is needed
@@ -848,7 +848,7 @@ class GraphicsScene(QGraphicsScene):
                     # remove the item from the diagram dictionary as well
                     index = self.parent.model.diagramItemIndex(diagramType="Instance Diagram", diagramName=self.parent.diagramName, itemType="Instance Node", NZID = i.itemInstance.NZID)
                     if not index is None:
-                        del self.parent.diagramDict["items"][index]
+                        self.parent.removeDiagramItem(index)
 #                    print("del node - {},{}".format(rc, msg))
                     # remove all the relationships for this node
                     keyList = []
@@ -876,7 +876,7 @@ class GraphicsScene(QGraphicsScene):
                         del self.parent.itemDict[key]
                         index = self.parent.model.diagramItemIndex(diagramType="Instance Diagram", diagramName=self.parent.diagramName, itemType="Instance Relationship", NZID = key)
                         if not index is None:
-                            del self.parent.diagramDict["items"][index]                        
+                            self.parent.removeDiagramItem(index)                        
                 return
             else:
                 if item.data(ITEMTYPE) in [NODETEMPLATE]:
@@ -889,7 +889,7 @@ class GraphicsScene(QGraphicsScene):
                         # remove the item from the diagram dictionary as well
                         index = self.parent.model.diagramItemIndex(diagramType="Template Diagram", diagramName=self.parent.diagramName, itemType="Node Template", NZID = i.NZID)
                         if not index is None:
-                            del self.parent.diagramDict["items"][index]
+                            self.parent.removeDiagramItem(index)
                         # remove any connected rel templates from the diagram item dictionary
                         keyList = []
                         for key,diagramInstance in self.parent.itemDict.items():
@@ -899,12 +899,12 @@ class GraphicsScene(QGraphicsScene):
                                     keyList.append(key)
                                     index = self.parent.model.diagramItemIndex(diagramType="Template Diagram", diagramName=self.parent.diagramName, itemType="Relationship Template", NZID = diagramInstance.NZID)
                                     if not index is None:
-                                        del self.parent.diagramDict["items"][index]
+                                        self.parent.removeDiagramItem(index)
                         for key in keyList:
                             del self.parent.itemDict[key]
                             index = self.parent.model.diagramItemIndex(diagramType="Template Diagram", diagramName=self.parent.diagramName, itemType="Relationship Template", NZID = key)
                             if not index is None:
-                                del self.parent.diagramDict["items"][index]
+                                self.parent.removeDiagramItem(index)
                     return
                 
     def editSelectedNodeInstance(self, ):
@@ -943,10 +943,10 @@ class GraphicsScene(QGraphicsScene):
         '''
         Run a query that retrieves all relationships between one node and all other nodes in the db
         '''
+        parms = {"nodeID": int(nodeID)}
         if direction == "Inbound":
-            p1 = str(nodeID)
             cypher = '''match (f)-[r]->(t)
-                            where (id(t) = {} )
+                            where (id(t) = $nodeID )
                             return id(f),
                                     f, 
                                     id(r), 
@@ -954,11 +954,10 @@ class GraphicsScene(QGraphicsScene):
                                     r,
                                     id(t),
                                     t
-                            '''.format(p1)
+                            '''
         if direction == "Outbound":
-            p1 = str(nodeID)
             cypher = '''match (f)-[r]->(t)
-                            where (id(f) = {} )
+                            where (id(f) = $nodeID )
                             return id(f),
                                     f, 
                                     id(r), 
@@ -966,9 +965,9 @@ class GraphicsScene(QGraphicsScene):
                                     r,
                                     id(t),
                                     t
-                            '''.format(p1)
+                            '''
         #run the query
-        rc1, msg1 = self.parent.model.modelNeoCon.runCypherAuto(cypher)
+        rc1, msg1 = self.parent.model.modelNeoCon.runCypherAuto(cypher, parms)
         if rc1 is True:
             # return list of rels and instance nodes
             return self.parent.model.modelNeoCon.resultSet
@@ -1029,7 +1028,7 @@ class GraphicsScene(QGraphicsScene):
             # add the relation item object to the diagram item dictionary
             self.parent.itemDict[relationTemplateItem.NZID] = relationTemplateItem    
             # save it to the diagram list of item dictionaries in the project model           
-            self.parent.diagramDict["items"].append(relationTemplateItem.getObjectDict())
+            self.parent.addDiagramItem(relationTemplateItem.getObjectDict())
             # tell the relationship to set it's loation and draw itself
             relationTemplateItem.drawIt2()
             self.model.setModelDirty()
@@ -1147,7 +1146,7 @@ class GraphicsScene(QGraphicsScene):
                         # add the relation item object to the diagram item dictionary
                         self.parent.itemDict[relationTemplateItem.NZID] = relationTemplateItem   
                         # save it to the diagram list of item dictionaries in the project model           
-                        self.parent.diagramDict["items"].append(relationTemplateItem.getObjectDict())
+                        self.parent.addDiagramItem(relationTemplateItem.getObjectDict())
                         # tell the relationship to set it's loation and draw itself
                         relationTemplateItem.drawIt2()
                 
@@ -1343,7 +1342,7 @@ class GraphicsScene(QGraphicsScene):
             # this counts how many relationships exist between two nodes
             self.parent.addRelationship(relInstance)
             # save it to the diagram list of item dictionaries in the project model           
-            self.parent.diagramDict["items"].append(relItem.getObjectDict())
+            self.parent.addDiagramItem(relItem.getObjectDict())
             
         # set the edit mode back to pointer
         self.parent.checkModeButton(self.parent.btnPoint)        
@@ -1401,7 +1400,7 @@ class GraphicsScene(QGraphicsScene):
             self.editRelInstance(relItem)
         if mode == "Drop":
     #        # save it to the diagram list of item dictionaries in the project model           
-            self.parent.diagramDict["items"].append(relItem.getObjectDict())
+            self.parent.addDiagramItem(relItem.getObjectDict())
             # sync to db
             relInstance.syncToDB() 
             
@@ -1425,7 +1424,7 @@ class GraphicsScene(QGraphicsScene):
                     # remove the item from the diagram dictionary as well
                     index = self.parent.model.diagramItemIndex(diagramType="Instance Diagram", diagramName=self.parent.diagramName, itemType="Instance Relationship", NZID = i.relationInstance.NZID)
                     if not index is None:
-                        del self.parent.diagramDict["items"][index]
+                        self.parent.removeDiagramItem(index)
 
 #                    # remove qgraphic items from the scene
 #                    self.removeItem(i.IRel)
@@ -1443,7 +1442,7 @@ class GraphicsScene(QGraphicsScene):
                     # remove rel template item from the diagram dictionary list of items
                     index = self.parent.model.diagramItemIndex(diagramType="Template Diagram", diagramName=self.parent.diagramName, itemType="Relationship Template", NZID = i.NZID)
                     if not index is None:
-                        del self.parent.diagramDict["items"][index]
+                        self.parent.removeDiagramItem(index)
                 return
                     
                     
@@ -1916,8 +1915,24 @@ class InstanceDiagramTab(QWidget, Ui_InstanceDiagramTab):
                 objectDict = value.getObjectDict()
                 itemList.append(objectDict)
         self.diagramDict["items"] = itemList
+        self.model.indexDiagramItems(self.tabType, self.diagramDict)
         self.model.setModelDirty()  
 
+    def addDiagramItem(self, itemDict):
+        '''
+        add an item dictionary to the diagram's list of items in the project model
+        '''
+        self.diagramDict["items"].append(itemDict)
+        self.model.addDiagramItem(self.tabType, self.diagramName, itemDict)
+
+    def removeDiagramItem(self, index):
+        '''
+        remove an item dictionary from the diagram's list of items in the project model
+        '''
+        itemDict = self.diagramDict["items"][index]
+        del self.diagramDict["items"][index]
+        self.model.removeDiagramItem(self.tabType, self.diagramName, itemDict)
+
     def updateMsgBar(self, msg):
         self.lblMessage.setText(msg)
 
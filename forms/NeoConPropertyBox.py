@@ -59,6 +59,9 @@ class NeoConPropertyBox(QDialog, Ui_NeoConPropertyBox):
             self.chkPromptForPW.setCheckState(Qt.Unchecked)      
             
         self.conType = self.objectDict.get("conType", "bolt")
+        # bolt+routing is the 3.x name for the neo4j routing scheme
+        if self.conType == "bolt+routing":
+            self.conType = "neo4j"
         index = self.cboScheme.findText(self.conType)
         if index >= 0:
             self.cboScheme.setCurrentIndex(index)
@@ -21,14 +21,18 @@ from PyQt5.QtWidgets import QDialog, QAbstractButton
 from PyQt5.QtWidgets import QApplication, QHeaderView
 from .Ui_ReverseEngineerDlg import Ui_dlgReverseEngineer
 
+import os
+import re
 from datetime import datetime
 from core.helper import Helper
 from core.NeoTypeFunc import NeoTypeFunc
+from core.NeoDriver import NeoDriver
+from core.ScanEngine import ScanEngine, ScanThread
 
 # results columns for node templates
 GENERATE, TEMPLATENAME, LABELPATTERN, PROPERTYPATTERN, NODECOUNT = range(5)
 # results columns for rel templates
-GENERATE, RELTEMPLATENAME, RELATIONSHIPNAME, FROMTEMPLATE, TOTEMPLATE, RELPROPERTYPATTERN, RELCOUNT, RELKEY = range(8)
+GENERATE, RELTEMPLATENAME, RELATIONSHIPNAME, FROMTEMPLATE, TOTEMPLATE, RELPROPERTYPATTERN, RELCOUNT, RELKEY, RELCARDINALITY = range(9)
 # constraint and index
 CONTYPE, CONLBL, CONPROP, CONPROPLIST = range(4)
 AUTOINDEX, IDXLBL, IDXPROPLIST = range(3)
@@ -69,6 +73,7 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         self.clearResults()
         # buttons
         self.stopScan = False
+        self.scanThread = None
         self.btnStop.setEnabled(False)
         self.btnStart.setEnabled(True)
 
@@ -82,7 +87,7 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
                         return "ID Allocations" as type,row,attributes[row]["value"]
                      '''
             #run the query
-            rc1, msg1 = self.myNeoCon.runCypherAuto(cypher)
+            rc1, msg1 = self.myNeoCon.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 self.maxRelId = 0
                 self.maxNodeId = 0
@@ -105,7 +110,7 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         try:
             cypher = "MATCH (n) RETURN count(*)"
             #run the query
-            rc1, msg1 = self.myNeoCon.runCypherAuto(cypher)
+            rc1, msg1 = self.myNeoCon.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 msg = "Counted {} Nodes.".format(str(self.myNeoCon.resultSet))
                 self.editNumNodes.setText(str(self.myNeoCon.resultSet[0]["count(*)"]))
@@ -121,7 +126,7 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         try:
             cypher = "MATCH ()-[r]->() RETURN count(*)"
             #run the query
-            rc1, msg1 = self.myNeoCon.runCypherAuto(cypher)
+            rc1, msg1 = self.myNeoCon.runCypherAuto(cypher, readOnly=True)
             if rc1:
                 msg = "Counted {} Relationships.".format(str(self.myNeoCon.resultSet))
                 self.editNumRels.setText(str(self.myNeoCon.resultSet[0]["count(*)"]))
@@ -163,6 +168,7 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         self.gridTemplates_Rel.setColumnWidth(RELPROPERTYPATTERN, 300)
         self.gridTemplates_Rel.setColumnWidth(RELCOUNT, 100)
         self.gridTemplates_Rel.setColumnWidth(RELKEY, 100)
+        self.gridTemplates_Rel.setColumnWidth(RELCARDINALITY, 300)
 
         header = self.gridTemplates_Rel.horizontalHeader()
         header.setSectionResizeMode(GENERATE, QHeaderView.Fixed)  
@@ -173,10 +179,11 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         header.setSectionResizeMode(RELPROPERTYPATTERN, QHeaderView.Interactive)      
         header.setSectionResizeMode(RELCOUNT, QHeaderView.Fixed)      
         header.setSectionResizeMode(RELKEY, QHeaderView.Fixed) 
+        header.setSectionResizeMode(RELCARDINALITY, QHeaderView.Interactive) 
         
     def createRelResultsModel(self):
 #       GENERATE, TEMPLATENAME, RELATIONSHIPNAME, FROMTEMPLATE, TOTEMPLATE, PROPERTYPATTERN = range(6)
-        model = QStandardItemModel(0, 8)
+        model = QStandardItemModel(0, 9)
         model.setHeaderData(GENERATE, Qt.Horizontal, "")
         model.setHeaderData(RELTEMPLATENAME, Qt.Horizontal, "Template Name")
         model.setHeaderData(RELATIONSHIPNAME, Qt.Horizontal, "Relationship Name")
@@ -185,6 +192,7 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         model.setHeaderData(RELPROPERTYPATTERN, Qt.Horizontal, "Property Pattern")
         model.setHeaderData(RELCOUNT, Qt.Horizontal, "# Scanned")
         model.setHeaderData(RELKEY, Qt.Horizontal, "Unique Key")
+        model.setHeaderData(RELCARDINALITY, Qt.Horizontal, "Cardinality")
         model.dataChanged.connect(self.templateRelGridChanged)
         return model  
 
@@ -218,7 +226,7 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         
         model.appendRow([item1,item2, item3, item4, item5])          
         
-    def addRelResultRow(self, model, c1, c2, c3, c4, c5, c6, c7, c8):
+    def addRelResultRow(self, model, c1, c2, c3, c4, c5, c6, c7, c8, c9=""):
 #       GENERATE, RELTEMPLATENAME, RELATIONSHIPNAME, FROMTEMPLATE, TOTEMPLATE, PROPERTYPATTERN, COUNT
         item1 = QStandardItem(c1)
         item1.setEditable(True)
@@ -238,13 +246,15 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         item7.setEditable(False)       
         item8 = QStandardItem(c8)
         item8.setEditable(False)            
+        item9 = QStandardItem(c9)
+        item9.setEditable(False)            
         if c1 in [0, 1, 2]:
             item1.setCheckState(c1)  
         else:
             item1.setCheckState(Qt.Unchecked)  
         
 #        print(c1, c2, c3, c4, c5, c6, c7, c8)
-        model.appendRow([item1,item2, item3, item4, item5, item6, item7, item8])      
+        model.appendRow([item1,item2, item3, item4, item5, item6, item7, item8, item9])      
         
     def newScan(self, ):
         self.clearResults()
@@ -259,7 +269,6 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         if self.echo:
             # display on UI
             self.editProgress.appendPlainText("{}: {}".format(str(datetime.now()), text))
-            QApplication.processEvents()
         # add real logging here
 #        logging.info(text)    
     
@@ -336,213 +345,60 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         self.btnStop.setEnabled(True)
         self.btnStart.setEnabled(False)
         
-        # do the scan
-        self.scanAll()
-
+        # do the scan on a subthread with its own NeoDriver so the dialog stays responsive
+        scanNeoCon = NeoDriver(name=self.myNeoCon.name, promptPW=self.myNeoCon.neoDict["password"])
+        scanEngine = ScanEngine(neoCon=scanNeoCon, processSize=self.spinProcessSize.value(), skipAmt=self.spinSkipAmt.value(), 
+                                            scanNodes=self.cbScanNodes.isChecked(), scanRels=self.cbScanRels.isChecked(), fastScan=self.cbFastScan.isChecked(), 
+                                            scanWorkers=self.spinScanWorkers.value(), aggregate=self.cbAggregate.isChecked(), 
+                                            sampleSize=self.spinSampleSize.value(), checkpointFile=self.checkpointFile(), resume=self.cbResume.isChecked(), 
+                                            inferCardinality=self.cbCardinality.isChecked(), supernodeDegree=int(self.settings.value("Default/SupernodeDegree", "10000")))
+        self.scanThread = ScanThread(scanEngine=scanEngine)
+        self.scanThread.scanMessage.connect(self.displayScanMsg)
+        self.scanThread.scanProgress.connect(self.displayScanProgress)
+        self.scanThread.scanComplete.connect(self.scanComplete)
+        self.scanThread.start()
+        
+    def checkpointFile(self, ):
+        '''
+        the scan checkpoint for the connection is kept in the logging directory
+        '''
+        checkpointDir = self.settings.value("Default/LoggingPath", os.getcwd())
+        slotName = re.sub(r"[^\w]", "_", str(self.myNeoCon.name))
+        return os.path.join(checkpointDir, "ReverseEngineer_{}.checkpoint.json".format(slotName))
+        
+    def scanComplete(self, rc, msg):
+        '''
+        the scan thread is done, show the patterns it found
+        '''
+        scanEngine = self.scanThread.scanEngine
+        self.patternList = scanEngine.patternList
+        self.nodeDict = scanEngine.nodeDict
+        self.relDict = scanEngine.relDict
+        scanEngine.neoCon.close()
+        self.displayScanMsg(msg)
+        # add scanned templates to the grid
+        if self.stopScan == False:
+            self.genNodeResult()
+            self.genRelResult()
+        
         # reset the buttons
         self.btnStop.setEnabled(False)
         self.btnStart.setEnabled(True)
         
         # switch to the results tab
-        self.tabWidget.setCurrentIndex(1)
-        
-
-    def getDataTypes(self, nodeID=None, relID = None,  propDataTypeDict=None, propList=None):            
-            if not nodeID is None:
-                returnPropList = self.genReturnPropList("n", propList)
-                if len(returnPropList) > 0:
-                    cypher = "match (n) where id(n) = {} return {}".format(str(nodeID), returnPropList )
-                else:
-                    return
-            if not relID is None:
-                returnPropList = self.genReturnPropList("r", propList)
-                if len(returnPropList) > 0:
-                    cypher = "match ()-[r]->() where id(r) = {} return {}".format(str(relID), returnPropList )
-                else:
-                    return
-                    
-            #run the query
-            rc1, msg1 = self.myNeoCon.runCypherAuto(cypher)
-            if rc1:
-                record = self.myNeoCon.resultSet[0]
-                # get the datatype for each property
-                # value has the correct python object for each cell in the result set
-                for index, value in record.items():
-                    if not value is None:
-                        dataType = self.neoTypeFunc.getNeo4jDataType(value)
-                        propDataTypeDict[index] = dataType
-                
-                
-    def genReturnPropList(self, nodeName, propList):
-        'return all properties in the template'
-        genPropList = ""
-        genPropList = ",".join(nodeName + "." + x + " as " + x for x in propList ) 
-        return genPropList        
-
-
-    def scanAll(self, ):
-        msg = "Scan finished"
-        if self.cbScanNodes.isChecked() == True:
-            # scan the nodes
-            self.displayScanMsg("Start Scanning Nodes.")
-            limitAmt = self.spinProcessSize.value()
-            skipIncrement = self.spinSkipAmt.value()
-            skipAmt = 0
-            totAmt = 0
-            self.moreData = True
-            try:
-                while (self.moreData and self.stopScan == False):
-                    rc = False
-                    cypher = "match (n) return id(n) as nodeID, labels(n), keys(n) skip {} limit {}".format(str(skipAmt), str(limitAmt))
-                    #run the query
-                    rc1, msg1 = self.myNeoCon.runCypherAuto(cypher)
-                    if rc1 == True:                    
-                        x = self.processModelChunk()
-                        if x > 0:
-                            totAmt = totAmt + x 
-                            self.displayScanMsg("Skip to: {} Processed: {} Total Processed {} Nodes.".format(str(skipAmt), str(limitAmt),totAmt))
-                            skipAmt = skipAmt + limitAmt + skipIncrement
-                        else:
-                            self.moreData = False
-                            rc = True
-                            msg = "Scan Nodes complete"                                  
-                    else:
-                        msg = "Scan Nodes Error {}".format(msg1)
-                        self.moreData = False                    
-
-
-            except BaseException as e:
-                msg = "{} - Node Scan failed.".format(repr(e))
-            finally: 
-                self.displayScanMsg(msg)
-            # add scanned node templates to the grid
-            if self.stopScan == False:
-                self.genNodeResult()
-
-        if self.cbScanRels.isChecked() == True:        
-            # scan the relationships
-            self.displayScanMsg("Start Scanning Relationships.")
-            limitAmt = self.spinProcessSize.value()
-            skipIncrement = self.spinSkipAmt.value()
-            skipAmt = 0
-            totAmt = 0
-            self.moreData = True
-            try:
-                while (self.moreData and self.stopScan == False):     
-                    rc = False
-                    cypher = "match (f)-[r]->(t) return id(r), keys(r), type(r), labels(f), labels(t) skip {} limit {}".format(str(skipAmt), str(limitAmt))
-                    #run the query
-                    rc1, msg1 = self.myNeoCon.runCypherAuto(cypher)
-                    if rc1:
-                        x = self.processRelModelChunk()
-                        if x > 0:
-                            totAmt = totAmt + x 
-                            self.displayScanMsg("Skip to: {} Processed: {} Total Processed {} Relationships.".format(str(skipAmt), str(x),totAmt))
-                            skipAmt = skipAmt + limitAmt + skipIncrement
-                        else:
-                            self.moreData = False
-                            rc = True
-                            msg = "Scan Relationships complete"                                  
-                    else:
-                        msg = "Scan Relationships Error {}".format(msg1)
-                        self.moreData = False
-                            
-            except BaseException as e:
-                msg = "{} - Relationships Scan failed.".format(repr(e))
-            finally: 
-                self.displayScanMsg(msg) 
-                
-            if self.stopScan == False:
-                self.genRelResult()   
-           
-            return rc, msg
-        
-    def processModelChunk(self, ):
-        ctr = 0
-        for record in self.myNeoCon.resultSet:
-            ctr = ctr + 1
-            labels = record["labels(n)"]
-            props = record["keys(n)"] 
-            nodeID = record["nodeID"]
-            try:
-                x = self.patternList.index(labels)
-                patternName = "{0:0>5}".format(x)
-            except ValueError:
-                nextx = len(self.patternList)
-                self.patternList.insert(nextx, labels)
-                patternName = "{0:0>5}".format(nextx)
-                self.nodeDict[patternName]={}
-                self.nodeDict[patternName]["propList"] = []
-                self.nodeDict[patternName]["labelList"] = labels
-                self.nodeDict[patternName]["templateName"] = "Node{}".format(patternName)
-                self.nodeDict[patternName]["templateLblName"] = "{}".format("_".join(labels))
-                self.nodeDict[patternName]["propDataType"] = {}
-                self.nodeDict[patternName]["count"] = 0
-            finally:
-                count = self.nodeDict[patternName]["count"] + 1
-                self.nodeDict[patternName]["count"] = count
-                # get datatypes for newly discovered properties
-                newProps = list(set(props) - set(self.nodeDict[patternName].get("propList", [])))
-                if len(newProps) > 0:
-                    self.getDataTypes(nodeID=nodeID, propDataTypeDict=self.nodeDict[patternName]["propDataType"], propList=newProps )
-                # merge in any newly discovered properties
-                self.nodeDict[patternName]["propList"] = list(set(self.nodeDict[patternName].get("propList", [])+props))
-        return ctr
-    
-    def processRelModelChunk(self, ):
-        ctr = 0
-        for record in self.myNeoCon.resultSet:
-            ctr = ctr + 1
-            relProps = record["keys(r)"]
-            relType = record["type(r)"]
-            fromLbls = record["labels(f)"]
-            toLbls = record["labels(t)"]
-            relID = record["id(r)"]
-            # get from and to node templates
-            fromTemplate = "Unknown"
-            toTemplate = "Unknown"
-            for nodepattern, nodedata in self.nodeDict.items():
-                if nodedata["labelList"]==fromLbls:
-                    fromTemplate = nodedata["templateLblName"]
-                if nodedata["labelList"] == toLbls:
-                    toTemplate = nodedata["templateLblName"]
-            try:
-                relKey = "{}:{}:{}".format(relType, fromTemplate, toTemplate )
-                # check to see if the relKey entry in the dictionary already exists, if it doesn't you get a KeyError
-                check = self.relDict[relKey]
-            except KeyError:
-                # count how many times the relType has been used in a rel template
-                countReltypeUsed = self.countRelType(relType)
-                # the relkey doesn't exist so add it to the dictionary
-                self.relDict[relKey]={}
-                self.relDict[relKey]["propList"] = []
-                self.relDict[relKey]["propDataType"] = {}
-                if countReltypeUsed > 0:
-                    self.relDict[relKey]["templateName"] = "{0}{1:0>3}".format(relType, countReltypeUsed)
-                else:
-                    self.relDict[relKey]["templateName"] = relType
-                self.relDict[relKey]["relName"] = relType
-                self.relDict[relKey]["fromTemplate"] = fromTemplate
-                self.relDict[relKey]["toTemplate"] = toTemplate                
-                self.relDict[relKey]["count"] = 0
-            finally:
-                count = self.relDict[relKey]["count"] + 1
-                self.relDict[relKey]["count"] = count
-                # get datatypes for newly discovered properties
-                newProps = list(set(relProps) - set(self.relDict[relKey].get("propList", [])))
-                if len(newProps) > 0:
-                    self.getDataTypes(relID = relID, propDataTypeDict=self.relDict[relKey]["propDataType"], propList=newProps )
-                # merge in the properties
-                self.relDict[relKey]["propList"] = list(set(self.relDict[relKey].get("propList", [])+relProps))            
-        
-        return ctr
+        if self.stopScan == False:
+            self.tabWidget.setCurrentIndex(1)
         
-    def countRelType(self, relType):
-        cnt = 0
-        for key in self.relDict.keys() :
-            if self.relDict[key]["relName"]==relType:        
-                cnt = cnt + 1
-        return cnt
+    def displayScanProgress(self, progress):
+        '''
+        show the progress dictionary sent by the scan thread
+        '''
+        if progress["eta"] is None:
+            eta = "unknown"
+        else:
+            eta = "{:.0f} sec".format(progress["eta"])
+        self.lblScanProgress.setText("{} Scanned: {} Rows/Sec: {:.0f} ETA: {} Patterns: {} Chunk: {:.3f} sec".format(progress["phase"], progress["processed"], 
+                                                progress["rowsPerSec"], eta, progress["patterns"], progress["chunkLatency"]))
         
     def testScan(self):
         '''simulate the scan to get total nodes and percent nodes
@@ -625,9 +481,28 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         '''
         for key in sorted(self.nodeDict.keys()):
             value = self.nodeDict[key]
-            self.addResultRow(self.gridTemplates.model(), Qt.Checked, str(value["templateLblName"]), str(value["labelList"]), str(value["propList"]), str(value["count"]) )            
+            self.addResultRow(self.gridTemplates.model(), Qt.Checked, str(value["templateLblName"]), str(value["labelList"]), str(value["propList"]), self.genCountText(value) )            
 #            print("{}-{} {}".format(key, value["labelList"], value["propList"]))    
 
+    def genCountText(self, value):
+        '''
+        the count column shows the number scanned, a sample scan adds the estimated total and its 95% confidence interval
+        '''
+        if "estCount" in value:
+            return "{} (est. {} [{}-{}])".format(value["count"], value["estCount"], value["estLow"], value["estHigh"])
+        return str(value["count"])
+
+    def genCardinalityText(self, value):
+        '''
+        the cardinality column shows the inferred cardinalities, the max degrees and a supernode warning
+        '''
+        if not "fromCardinality" in value:
+            return ""
+        text = "{} - {} (max in {}, max out {})".format(value["fromCardinality"], value["toCardinality"], value["inDegree"]["maxDegree"], value["outDegree"]["maxDegree"])
+        if value.get("supernode", False) == True:
+            text = text + " SUPERNODE"
+        return text
+
     def genNodeTemplates(self, ):
         '''
         Scan the reverse engineered node dictionary and create Node Templates
@@ -767,7 +642,11 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         # look at each constraint in the schemaModel and see if it belongs to the rel template
         self.schemaModel.matchConstraintRelTemplate(conList, [prop[0] for prop in propList], relName=relName)
         
-        relDict = self.model.newRelTemplateDict(name=templateName, relname = relName, propList=propList, fromTemplate=fromTemplate, toTemplate=toTemplate, conList=conList,  desc="Template generated from Reverse Engineering.")
+        # cardinalities are only known if the scan inferred them, otherwise newRelTemplateDict uses the defaults
+        fromCardinality = self.relDict[uniqueKey].get("fromCardinality", None)
+        toCardinality = self.relDict[uniqueKey].get("toCardinality", None)
+        relDict = self.model.newRelTemplateDict(name=templateName, relname = relName, propList=propList, fromTemplate=fromTemplate, toTemplate=toTemplate, conList=conList,  
+                                                                    fromCardinality=fromCardinality, toCardinality=toCardinality, desc="Template generated from Reverse Engineering.")
         self.model.modelData["Relationship Template"].append(relDict)
         return True
     
@@ -778,7 +657,7 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         for key in sorted(self.relDict.keys()):
             value = self.relDict[key]
 #            self.addRelResultRow(self.gridTemplates_Rel.model(), Qt.Checked, "{}".format(key), str(value["relName"]), str(value["fromTemplate"]), str(value["toTemplate"]), str(value["propList"]), str(value["count"]) )
-            self.addRelResultRow(self.gridTemplates_Rel.model(), Qt.Checked, str(value["templateName"]), str(value["relName"]), str(value["fromTemplate"]), str(value["toTemplate"]), str(value["propList"]), str(value["count"]) , key)
+            self.addRelResultRow(self.gridTemplates_Rel.model(), Qt.Checked, str(value["templateName"]), str(value["relName"]), str(value["fromTemplate"]), str(value["toTemplate"]), str(value["propList"]), self.genCountText(value) , key, self.genCardinalityText(value))
 
     @pyqtSlot(QAbstractButton)
     def on_buttonBox_clicked(self, button):
@@ -788,7 +667,30 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         @param button DESCRIPTION
         @type QAbstractButton
         """
+        self.stopScanThread()
         QDialog.accept(self)
+
+    def reject(self, ):
+        '''
+        Esc closes the dialog through reject so stop the scan here too
+        '''
+        self.stopScanThread()
+        QDialog.reject(self)
+
+    def closeEvent(self, event):
+        '''
+        the title bar close button doesn't go through the button box so stop the scan here too
+        '''
+        self.stopScanThread()
+        QDialog.closeEvent(self, event)
+
+    def stopScanThread(self, ):
+        '''
+        don't leave a scan running after the dialog closes.  cancel terminates the query on the server and waits for the thread to finish
+        '''
+        if not self.scanThread is None and self.scanThread.isRunning():
+            self.stopScan = True
+            self.scanThread.cancel()
     
 #    @pyqtSlot()
 #    def on_rbAllNodes_clicked(self):
@@ -917,6 +819,9 @@ class dlgReverseEngineer(QDialog, Ui_dlgReverseEngineer):
         User  clicks the stop button to stop reverse engineering
         """
         self.stopScan = True
+        # stop the scan thread and terminate the query that is running on the server
+        if not self.scanThread is None:
+            self.scanThread.cancel()
         self.displayScanMsg("User Canceled Scan")
     
     @pyqtSlot(int)
@@ -139,7 +139,7 @@ class Ui_NeoConPropertyBox(object):
         NeoConPropertyBox.setWindowTitle(_translate("NeoConPropertyBox", "Neo4j Connection"))
         self.boxConnection.setTitle(_translate("NeoConPropertyBox", "Connection"))
         self.cboScheme.setItemText(0, _translate("NeoConPropertyBox", "bolt"))
-        self.cboScheme.setItemText(1, _translate("NeoConPropertyBox", "bolt+routing"))
+        self.cboScheme.setItemText(1, _translate("NeoConPropertyBox", "neo4j"))
         self.chkSecureCon.setText(_translate("NeoConPropertyBox", "Use Secure Connection"))
         self.labelPort.setText(_translate("NeoConPropertyBox", "Port:"))
         self.label.setText(_translate("NeoConPropertyBox", "Host Name:"))
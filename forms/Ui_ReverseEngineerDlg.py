@@ -130,6 +130,22 @@ class Ui_dlgReverseEngineer(object):
         self.gridLayout_3.addWidget(self.spinSkipAmt, 2, 1, 1, 1)
         spacerItem5 = QtWidgets.QSpacerItem(134, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.gridLayout_3.addItem(spacerItem5, 2, 2, 1, 1)
+        self.label_9 = QtWidgets.QLabel(self.frame)
+        self.label_9.setObjectName("label_9")
+        self.gridLayout_3.addWidget(self.label_9, 3, 0, 1, 1)
+        self.spinScanWorkers = QtWidgets.QSpinBox(self.frame)
+        self.spinScanWorkers.setMinimum(1)
+        self.spinScanWorkers.setMaximum(16)
+        self.spinScanWorkers.setObjectName("spinScanWorkers")
+        self.gridLayout_3.addWidget(self.spinScanWorkers, 3, 1, 1, 1)
+        self.label_10 = QtWidgets.QLabel(self.frame)
+        self.label_10.setObjectName("label_10")
+        self.gridLayout_3.addWidget(self.label_10, 3, 3, 1, 1)
+        self.spinSampleSize = QtWidgets.QSpinBox(self.frame)
+        self.spinSampleSize.setMaximum(100000000)
+        self.spinSampleSize.setSingleStep(10000)
+        self.spinSampleSize.setObjectName("spinSampleSize")
+        self.gridLayout_3.addWidget(self.spinSampleSize, 3, 4, 1, 1)
         self.verticalLayout_2.addWidget(self.frame)
         self.frame_3 = QtWidgets.QFrame(self.frmSettings)
         self.frame_3.setFrameShape(QtWidgets.QFrame.NoFrame)
@@ -153,12 +169,28 @@ class Ui_dlgReverseEngineer(object):
         self.cbScanRels.setMinimumSize(QtCore.QSize(112, 0))
         self.cbScanRels.setObjectName("cbScanRels")
         self.horizontalLayout.addWidget(self.cbScanRels)
+        self.cbFastScan = QtWidgets.QCheckBox(self.frame_3)
+        self.cbFastScan.setObjectName("cbFastScan")
+        self.horizontalLayout.addWidget(self.cbFastScan)
+        self.cbAggregate = QtWidgets.QCheckBox(self.frame_3)
+        self.cbAggregate.setObjectName("cbAggregate")
+        self.horizontalLayout.addWidget(self.cbAggregate)
+        self.cbResume = QtWidgets.QCheckBox(self.frame_3)
+        self.cbResume.setObjectName("cbResume")
+        self.horizontalLayout.addWidget(self.cbResume)
+        self.cbCardinality = QtWidgets.QCheckBox(self.frame_3)
+        self.cbCardinality.setObjectName("cbCardinality")
+        self.horizontalLayout.addWidget(self.cbCardinality)
         self.btnStart = QtWidgets.QPushButton(self.frame_3)
         self.btnStart.setObjectName("btnStart")
         self.horizontalLayout.addWidget(self.btnStart)
         self.btnStop = QtWidgets.QPushButton(self.frame_3)
         self.btnStop.setObjectName("btnStop")
         self.horizontalLayout.addWidget(self.btnStop)
+        self.lblScanProgress = QtWidgets.QLabel(self.frame_3)
+        self.lblScanProgress.setText("")
+        self.lblScanProgress.setObjectName("lblScanProgress")
+        self.horizontalLayout.addWidget(self.lblScanProgress)
         spacerItem6 = QtWidgets.QSpacerItem(398, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout.addItem(spacerItem6)
         self.verticalLayout_2.addWidget(self.frame_3)
@@ -281,6 +313,8 @@ class Ui_dlgReverseEngineer(object):
         self.label_6.setBuddy(self.txtRelScanAmt)
         self.label_8.setBuddy(self.txtRelPercent)
         self.label_4.setBuddy(self.spinSkipAmt)
+        self.label_9.setBuddy(self.spinScanWorkers)
+        self.label_10.setBuddy(self.spinSampleSize)
 
         self.retranslateUi(dlgReverseEngineer)
         self.tabWidget.setCurrentIndex(0)
@@ -291,11 +325,17 @@ class Ui_dlgReverseEngineer(object):
         dlgReverseEngineer.setTabOrder(self.spinProcessSize, self.txtNodeScanAmt)
         dlgReverseEngineer.setTabOrder(self.txtNodeScanAmt, self.txtNodePercent)
         dlgReverseEngineer.setTabOrder(self.txtNodePercent, self.spinSkipAmt)
-        dlgReverseEngineer.setTabOrder(self.spinSkipAmt, self.txtRelScanAmt)
+        dlgReverseEngineer.setTabOrder(self.spinSkipAmt, self.spinScanWorkers)
+        dlgReverseEngineer.setTabOrder(self.spinScanWorkers, self.spinSampleSize)
+        dlgReverseEngineer.setTabOrder(self.spinSampleSize, self.txtRelScanAmt)
         dlgReverseEngineer.setTabOrder(self.txtRelScanAmt, self.txtRelPercent)
         dlgReverseEngineer.setTabOrder(self.txtRelPercent, self.cbScanNodes)
         dlgReverseEngineer.setTabOrder(self.cbScanNodes, self.cbScanRels)
-        dlgReverseEngineer.setTabOrder(self.cbScanRels, self.btnStart)
+        dlgReverseEngineer.setTabOrder(self.cbScanRels, self.cbFastScan)
+        dlgReverseEngineer.setTabOrder(self.cbFastScan, self.cbAggregate)
+        dlgReverseEngineer.setTabOrder(self.cbAggregate, self.cbResume)
+        dlgReverseEngineer.setTabOrder(self.cbResume, self.cbCardinality)
+        dlgReverseEngineer.setTabOrder(self.cbCardinality, self.btnStart)
         dlgReverseEngineer.setTabOrder(self.btnStart, self.btnStop)
         dlgReverseEngineer.setTabOrder(self.btnStop, self.tabWidget)
         dlgReverseEngineer.setTabOrder(self.tabWidget, self.editProgress)
@@ -321,8 +361,21 @@ class Ui_dlgReverseEngineer(object):
         self.label_6.setText(_translate("dlgReverseEngineer", "Number of Relationships Scanned:"))
         self.label_8.setText(_translate("dlgReverseEngineer", "Percent Of Total:"))
         self.label_4.setText(_translate("dlgReverseEngineer", "Skip Amount:"))
+        self.label_9.setText(_translate("dlgReverseEngineer", "Scan Workers:"))
+        self.spinScanWorkers.setToolTip(_translate("dlgReverseEngineer", "Number of id ranges scanned at the same time, each on its own session"))
+        self.label_10.setText(_translate("dlgReverseEngineer", "Sample Size:"))
+        self.spinSampleSize.setToolTip(_translate("dlgReverseEngineer", "Scan a stratified random sample of about this many nodes and relationships and estimate the pattern counts"))
+        self.spinSampleSize.setSpecialValueText(_translate("dlgReverseEngineer", "Off"))
         self.cbScanNodes.setText(_translate("dlgReverseEngineer", "Scan Nodes"))
         self.cbScanRels.setText(_translate("dlgReverseEngineer", "Scan Relationships"))
+        self.cbFastScan.setToolTip(_translate("dlgReverseEngineer", "Build the templates from the database schema procedures and count store instead of scanning every node and relationship"))
+        self.cbFastScan.setText(_translate("dlgReverseEngineer", "Fast Schema Scan"))
+        self.cbAggregate.setToolTip(_translate("dlgReverseEngineer", "Group each chunk into label and property patterns on the server instead of returning every node and relationship"))
+        self.cbAggregate.setText(_translate("dlgReverseEngineer", "Aggregate on Server"))
+        self.cbResume.setToolTip(_translate("dlgReverseEngineer", "Continue a stopped scan from its checkpoint, or scan only the nodes and relationships added since the last finished scan"))
+        self.cbResume.setText(_translate("dlgReverseEngineer", "Resume / Incremental"))
+        self.cbCardinality.setToolTip(_translate("dlgReverseEngineer", "Compute the from and to cardinality of each relationship pattern from node degrees and flag supernodes"))
+        self.cbCardinality.setText(_translate("dlgReverseEngineer", "Infer Cardinality"))
         self.btnStart.setText(_translate("dlgReverseEngineer", "Start"))
         self.btnStop.setText(_translate("dlgReverseEngineer", "Stop"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tabProgress), _translate("dlgReverseEngineer", "Progress"))
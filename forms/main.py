@@ -21,13 +21,14 @@ import logging
 import ntpath
 import requests
 
-from PyQt5.QtCore import pyqtSlot, QSettings, QSize, QPoint, QFileInfo, pyqtSignal
+from PyQt5.QtCore import pyqtSlot, QSettings, QSize, QPoint, QFileInfo, pyqtSignal, QTimer
 from PyQt5.QtWidgets import QMainWindow, QAction, QFileDialog, QApplication
 from PyQt5.QtGui import QIcon, QPixmap
 
 from core.helper import Helper, PageSetup
 from core.pageitem import PageItem
 from core.NeoDriver import NeoDriver
+from core.NeoDriverRegistry import driverRegistry
 
 from forms.Ui_main import Ui_NodeeraMain
 from forms.dlgNeoCon import dlgNeoCons
@@ -108,6 +109,12 @@ class NodeeraMain(QMainWindow, Ui_NodeeraMain):
         # get startup settings
         self.initSettings()     
         
+        # periodically close shared neo4j drivers that nobody is using
+        self.driverReaper = QTimer(self)
+        self.driverReaper.setInterval(60000)
+        self.driverReaper.timeout.connect(driverRegistry.reapIdle)
+        self.driverReaper.start()
+        
         # launch the welcome wagon
         self.welcomeDlg = HelloUserDlg(self)
         self.welcomeDlg.show()
@@ -487,6 +494,7 @@ class NodeeraMain(QMainWindow, Ui_NodeeraMain):
     def closeEvent(self, event):
         # close open connections
         self.closeOpenStuff()
+        driverRegistry.closeAll()
         #save the window state
         self.settings.setValue("MainWindow/Size", self.size())
         self.settings.setValue("MainWindow/Position", self.pos())